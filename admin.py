@@ -0,0 +1,547 @@
+"""
+This file defines the admin interface: the Flask-Admin views and the
+login and password routes. It is only loaded by the full application.
+"""
+
+from __future__ import annotations
+
+import hmac
+import io
+import os
+import threading
+from functools import wraps
+from typing import Any, Callable, Dict, Hashable, List, Optional, Tuple, Union
+
+from flask import (
+    Flask,
+    Response,
+    current_app,
+    flash,
+    jsonify,
+    redirect,
+    render_template,
+    request,
+    url_for,
+)
+from flask_admin import Admin, AdminIndexView, expose
+from flask_admin.contrib.sqla import ModelView
+from flask_bcrypt import Bcrypt
+from flask_login import current_user, login_required, login_user, logout_user
+from flask_sqlalchemy import SQLAlchemy
+from sqlalchemy import false, func, select
+from sqlalchemy.orm import Session
+
+from catalog import get_catalog_version
+from exports import publish_exports
+from importer import BulkResult, bulk_upsert, read_csv, read_ndjson
+from metrics import register_cache_stats
+from metrics import render as render_metrics
+from models import Term, User
+from search import term_search_condition
+from storage import publish_read_snapshot
+
+# Content types of the bulk endpoint payloads
+NDJSON_MIMETYPES = ("application/x-ndjson", "application/ndjson", "application/jsonl", "application/json-lines")
+CSV_MIMETYPES = ("text/csv", "application/csv")
+
+# Unique columns of the term list, paged by key (WHERE column >= first key of the page)
+KEYSET_COLUMNS = ("tid", "english_term", "french_term")
+
+
+class AdminListCache:
+    """
+    Counts and page keys of the admin term list, kept until the catalog version changes.
+
+    The version is read from the primary database on every lookup, so an edit
+    made in any worker is seen by the next admin request of all of them.
+
+    Attributes:
+        version (int): the catalog version the entries were computed at.
+        entries (Dict): the cached values, by key.
+        stats (Dict[str, int]): the hit and miss counters.
+    """
+
+    def __init__(self) -> None:
+        self.version: Optional[int] = None
+        self.entries: Dict[Hashable, Any] = {}
+        self.stats: Dict[str, int] = {"hits": 0, "misses": 0}
+        self._lock = threading.Lock()
+
+    def get(self, session: Session, key: Hashable, build: Callable[[], Any]) -> Any:
+        """
+        Return a cached value, computing it if missing at the current version.
+
+        Input:  session (Session)   | the admin session, used to read the version
+                key (Hashable)      | the key of the value
+                build (Callable)    | computes the value
+        Output: the value
+        """
+        version = get_catalog_version(session)
+        with self._lock:
+            if version != self.version:
+                self.version = version
+                self.entries = {}
+            if key in self.entries:
+                self.stats["hits"] += 1
+                return self.entries[key]
+            self.stats["misses"] += 1
+
+        value = build()
+        with self._lock:
+            if self.version == version:
+                self.entries[key] = value
+        return value
+
+    def stats_snapshot(self) -> Dict[str, int]:
+        """Return a copy of the hit and miss counters."""
+        with self._lock:
+            return dict(self.stats)
+
+
+admin_list_cache = AdminListCache()
+
+
+class CatalogPublisher:
+    """
+    Publishes the read snapshot and the exports in a background thread.
+
+    Writing every export of a large glossary takes seconds, so an admin edit
+    only asks for a publication and returns. Edits made while one is running
+    are covered by a single further run, which publishes the latest version;
+    downloads of a version not yet published are streamed from the database.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._running = False
+        self._pending = False
+
+    def request(self, app: Flask) -> None:
+        """Publish the current catalog version soon, without waiting for it."""
+        with self._lock:
+            if self._running:
+                self._pending = True
+                return
+            self._running = True
+        threading.Thread(target=self.run, args=(app,), name="catalog-publisher", daemon=True).start()
+
+    def run(self, app: Flask) -> None:
+        """Publish until no edit is waiting; a failure must not stop the next publications."""
+        while True:
+            with app.app_context():
+                try:
+                    publish_read_snapshot()
+                    publish_exports()
+                except Exception as e:
+                    app.logger.error(f"Export publishing error: {str(e)}")
+            with self._lock:
+                if not self._pending:
+                    self._running = False
+                    return
+                self._pending = False
+
+
+catalog_publisher = CatalogPublisher()
+
+
+def publish_catalog() -> None:
+    """Publish the read snapshot and the exports of the new catalog version in the background."""
+    catalog_publisher.request(current_app._get_current_object())
+
+
+def admin_required(f: Callable) -> Callable:
+    """Decorator to require admin access for a route."""
+
+    @wraps(f)
+    def decorated_function(*args: Any, **kwargs: Any) -> Any:
+        if not current_user.is_authenticated:
+            return redirect(url_for("login", next=request.url))
+        if not current_user.is_admin():
+            flash("Accès administrateur requis", "error")
+            return redirect(url_for("index"))
+        return f(*args, **kwargs)
+
+    return decorated_function
+
+
+class SecureAdminIndexView(AdminIndexView):
+    """Secure admin index that requires authentication."""
+
+    @expose("/")
+    @admin_required
+    def index(self):
+        """Render the admin index page with user context."""
+        # Get the current user's information
+        user_info = {"username": current_user.username, "email": current_user.email}
+
+        # Get counts for dashboard; the terms are counted once per catalog version
+        users_count = User.query.count()
+        terms_count = admin_list_cache.get(
+            Term.query.session, ("count", "", "[]"), lambda: Term.query.count()
+        )
+
+        return self.render(
+            "admin/index.html",
+            user_info=user_info,
+            users_count=users_count,
+            terms_count=terms_count,
+        )
+
+    @expose("/logout")
+    def logout(self):
+        """Custom logout route for admin panel."""
+        logout_user()
+        return redirect(url_for("index"))
+
+    @expose("/update-password")
+    @login_required
+    def update_password_view(self):
+        """Redirect to password update form."""
+        return redirect(url_for("update_password_form"))
+
+
+class SecureModelView(ModelView):
+    """Base secure model view that requires authentication."""
+
+    def is_accessible(self) -> bool:
+        return current_user.is_authenticated
+
+    def inaccessible_callback(self, name: str, **kwargs: Any) -> Response:
+        return redirect(url_for("login", next=request.url))
+
+
+class UserAdminView(SecureModelView):
+    """Admin interface for User model."""
+
+    column_list = ["id", "username", "email"]
+    column_searchable_list = ["username", "email"]
+    column_filters = ["username", "email"]
+    form_excluded_columns = ["password"]
+    can_create = True
+    can_edit = True
+    can_delete = True
+    page_size = 50
+
+    def on_model_change(self, form: Any, model: User, is_created: bool) -> None:
+        """Hash password when creating/editing users through admin."""
+        if is_created or form.password.data:
+            model.password = (
+                Bcrypt()
+                .generate_password_hash(form.password.data.encode("utf-8"))
+                .decode("utf-8")
+            )
+
+
+class TermAdminView(SecureModelView):
+    """Admin interface for Term model."""
+
+    column_list = [
+        "tid",
+        "english_term",
+        "french_term",
+        "subdomains_en",
+        "subdomains_fr",
+        "is_active",
+    ]
+    # Searched through the folded keys and the full-text index, see _apply_search
+    column_searchable_list = ["english_term", "french_term"]
+    column_filters = [
+        "domain_en",
+        "domain_fr",
+        "semantic_label_en",
+        "semantic_label_fr",
+    ]
+    # Only indexed columns, so that a sorted page never sorts the whole table
+    column_sortable_list = ["english_term", "french_term", "is_active"]
+    column_default_sort = "tid"
+    # Derived from english_term/french_term by models.refresh_term_search_keys
+    form_excluded_columns = ["english_term_norm", "french_term_norm"]
+    can_create = True
+    can_edit = True
+    can_delete = True
+    page_size = 50
+
+    def get_list(
+        self,
+        page: Optional[int],
+        sort_column: Optional[str],
+        sort_desc: bool,
+        search: Optional[str],
+        filters: Optional[List[Tuple[int, str, Any]]],
+        execute: bool = True,
+        page_size: Optional[int] = None,
+    ) -> Tuple[int, Any]:
+        """
+        Return the number of matching terms and the terms of one page of the list.
+
+        Unfiltered pages sorted by a unique column start at the first key of the
+        page instead of skipping the previous rows with OFFSET; the other pages
+        keep OFFSET. Every count is cached until the catalog version changes.
+
+        Input:  page (int)          | the page number, from 0
+                sort_column (str)   | the sorted column (default: column_default_sort)
+                sort_desc (bool)    | True for a descending sort
+                search (str)        | the search box query
+                filters (list)      | the (index, name, value) filters
+                execute (bool)      | False to return the query instead of the terms
+                page_size (int)     | the number of terms per page (0: all)
+        Output: (count, the terms or the query)
+        """
+        page = page or 0
+        page_size = self.page_size if page_size is None else page_size
+        if sort_column is None:
+            sort_column, sort_desc = self.column_default_sort, False
+
+        query = self.get_query()
+        count_query = self.get_count_query()
+        if not search and not filters and page_size and sort_column in KEYSET_COLUMNS:
+            query = self.keyset_page(query, page, sort_column, sort_desc, page_size)
+        else:
+            joins: Dict[Any, Any] = {}
+            count_joins: Dict[Any, Any] = {}
+            if search:
+                query, count_query, joins, count_joins = self._apply_search(
+                    query, count_query, joins, count_joins, search
+                )
+            if filters and self._filters:
+                query, count_query, joins, count_joins = self._apply_filters(
+                    query, count_query, joins, count_joins, filters
+                )
+            query, joins = self._apply_sorting(query, joins, sort_column, sort_desc)
+            # tid is not a sortable column, so _apply_sorting ignores it: it is
+            # added explicitly, as the default order and as the tie-breaker of
+            # the other sorts, so that OFFSET pages neither repeat nor skip rows
+            query = query.order_by(Term.tid.desc() if sort_desc and sort_column == "tid" else Term.tid)
+            query = self._apply_pagination(query, page, page_size)
+
+        count = admin_list_cache.get(
+            self.session, ("count", search or "", repr(filters or [])), count_query.scalar
+        )
+        if execute:
+            query = query.all()
+        return count, query
+
+    def keyset_page(self, query: Any, page: int, sort_column: str, sort_desc: bool, page_size: int) -> Any:
+        """
+        Restrict the query to one page, starting at the first key of that page.
+
+        Input:  query               | the query of the terms
+                page (int)          | the page number, from 0
+                sort_column (str)   | one of KEYSET_COLUMNS
+                sort_desc (bool)    | True for a descending sort
+                page_size (int)     | the number of terms per page
+        Output: the query of the page
+        """
+        keys = admin_list_cache.get(
+            self.session,
+            ("page_keys", sort_column, bool(sort_desc), page_size),
+            lambda: self.page_keys(sort_column, sort_desc, page_size),
+        )
+        if page >= len(keys):
+            return query.filter(false())
+
+        column = getattr(Term, sort_column)
+        if sort_desc:
+            return query.filter(column <= keys[page]).order_by(column.desc()).limit(page_size)
+        return query.filter(column >= keys[page]).order_by(column).limit(page_size)
+
+    def page_keys(self, sort_column: str, sort_desc: bool, page_size: int) -> List[Any]:
+        """
+        Return the first key of every page, from one pass over the index of the column.
+
+        Input:  sort_column (str)   | one of KEYSET_COLUMNS
+                sort_desc (bool)    | True for a descending sort
+                page_size (int)     | the number of terms per page
+        Output: the keys, one per page
+        """
+        column = getattr(Term, sort_column)
+        numbered = select(
+            column.label("key"),
+            func.row_number().over(order_by=column.desc() if sort_desc else column).label("position"),
+        ).subquery()
+        statement = (
+            select(numbered.c.key)
+            .where((numbered.c.position - 1) % page_size == 0)
+            .order_by(numbered.c.position)
+        )
+        return list(self.session.execute(statement).scalars())
+
+    def _apply_search(self, query: Any, count_query: Any, joins: Dict, count_joins: Dict, search: str) -> Tuple:
+        """
+        Search the folded term keys and the full-text index instead of ilike on every column.
+        """
+        condition = term_search_condition(search)
+        return query.filter(condition), count_query.filter(condition), joins, count_joins
+
+    def after_model_change(self, form: Any, model: Term, is_created: bool) -> None:
+        """Publish the exports of the new catalog version."""
+        self.publish()
+
+    def after_model_delete(self, model: Term) -> None:
+        """Publish the exports of the new catalog version."""
+        self.publish()
+
+    def publish(self) -> None:
+        """Publish the read snapshot and the exports of the new catalog version."""
+        publish_catalog()
+
+
+def register_admin(app: Flask, db: SQLAlchemy, bcrypt: Bcrypt) -> None:
+    """Register the admin views and the admin-only routes."""
+
+    # Initialize Flask-Admin with secure index
+    admin = Admin(
+        app,
+        name="GloTechT",
+        template_mode="bootstrap4",
+        index_view=SecureAdminIndexView(name="Tableau de bord"),
+        # index_view=SecureAdminIndexView()
+    )
+
+    # Add secure model views
+    admin.add_view(UserAdminView(User, db.session, name="Administrateurs"))
+    admin.add_view(TermAdminView(Term, db.session, name="Termes"))
+    register_cache_stats(app, "admin_term_list", admin_list_cache.stats_snapshot)
+
+    @app.route("/metrics")
+    def get_metrics() -> Response:
+        """Prometheus metrics, for admins or scrapers sending the METRICS_TOKEN bearer token."""
+        token = app.config.get("METRICS_TOKEN") or os.getenv("METRICS_TOKEN")
+        authorization = request.headers.get("Authorization", "")
+        authorized = (
+            token and hmac.compare_digest(authorization, f"Bearer {token}")
+        ) or (current_user.is_authenticated and current_user.is_admin())
+        if not authorized:
+            return jsonify({"error": "Unauthorized"}), 401
+        return Response(render_metrics(app), content_type="text/plain; version=0.0.4; charset=utf-8")
+
+    @app.route("/api/admin/terms/bulk", methods=["POST"])
+    def bulk_upsert_terms() -> Response:
+        """
+        Insert or update terms from an NDJSON or CSV body shaped like Term.to_dict().
+
+        Rows are validated as they are read and written in chunked transactions;
+        the invalid rows are reported by line number and do not stop the others.
+        """
+        if not current_user.is_authenticated:
+            return jsonify({"error": "Unauthorized"}), 401
+        if not current_user.is_admin():
+            return jsonify({"error": "Admin access required"}), 403
+
+        payload_format = request.args.get("format") or (
+            "ndjson" if request.mimetype in NDJSON_MIMETYPES else "csv" if request.mimetype in CSV_MIMETYPES else None
+        )
+        if payload_format not in ("ndjson", "csv"):
+            return jsonify({"error": "Send NDJSON (application/x-ndjson) or CSV (text/csv)"}), 415
+
+        lines = io.TextIOWrapper(io.BufferedReader(request.stream), encoding="utf-8-sig", newline="")
+        records = read_ndjson(lines) if payload_format == "ndjson" else read_csv(lines)
+        result = BulkResult()
+        try:
+            bulk_upsert(db.engine, records, result)
+        except UnicodeDecodeError:
+            return jsonify({"error": "The payload is not valid UTF-8", **result.to_dict()}), 400
+        except Exception as e:
+            app.logger.error(f"Bulk upsert error: {str(e)}")
+            return jsonify({"error": "An error occurred", **result.to_dict()}), 500
+        finally:
+            if result.chunks:
+                publish_catalog()
+
+        if not result.received:
+            return jsonify({"error": "Empty payload", **result.to_dict()}), 400
+        return jsonify(result.to_dict())
+
+    @app.route("/login", methods=["GET", "POST"])
+    def login() -> Union[str, Response]:
+        """Admin login page."""
+        if current_user.is_authenticated:
+            return redirect(url_for("admin.index"))
+
+        if request.method == "GET":
+            return render_template("login.html")
+
+        email = request.form.get("email")
+        password = request.form.get("password")
+
+        if not email or not password:
+            flash("Email et mot de passe requis", "error")
+            return render_template("login.html"), 400
+
+        try:
+            user = User.query.filter_by(email=email).first()
+            if not user:
+                flash("Email ou mot de passe incorrect", "error")
+                return render_template("login.html"), 401
+
+            password_bytes = password.encode("utf-8")
+            if bcrypt.check_password_hash(user.password, password_bytes):
+                login_user(user)
+                next_page = request.args.get("next")
+                if next_page and not next_page.startswith("/"):
+                    next_page = None
+                return redirect(next_page or url_for("admin.index"))
+
+            flash("Email ou mot de passe incorrect", "error")
+            return render_template("login.html"), 401
+
+        except Exception as e:
+            app.logger.error(f"Login error: {str(e)}")
+            flash("Une erreur s'est produite", "error")
+            return render_template("login.html"), 500
+
+    @app.route("/logout")
+    def logout() -> Response:
+        """Admin logout."""
+        logout_user()
+        return redirect(url_for("index"))
+
+    @app.route("/update_password/<int:user_id>", methods=["POST"])
+    def update_password(user_id: int) -> Response:
+        """Update user password with proper hashing."""
+        try:
+            if current_user.id != user_id:
+                return jsonify({"error": "Unauthorized"}), 403
+
+            old_password = request.form.get("old_password")
+            new_password = request.form.get("new_password")
+
+            if not old_password or not new_password:
+                flash("Les deux mots de passe sont requis", "error")
+                return render_template("update_password.html"), 400
+
+            user = User.query.get(user_id)
+            if not user:
+                flash("Utilisateur non trouvé", "error")
+                return render_template("update_password.html"), 404
+
+            # Verify old password
+            if not bcrypt.check_password_hash(
+                user.password, old_password.encode("utf-8")
+            ):
+                flash("Le mot de passe actuel est incorrect", "error")
+                return render_template("update_password.html"), 401
+
+            password_bytes = new_password.encode("utf-8")
+            hashed_password = bcrypt.generate_password_hash(password_bytes).decode(
+                "utf-8"
+            )
+            user.password = hashed_password
+
+            db.session.commit()
+            flash("Mot de passe mis à jour avec succès", "success")
+            return redirect(url_for("admin.index"))
+
+        except Exception as e:
+            db.session.rollback()
+            app.logger.error(f"Password update error: {str(e)}")
+            flash("Une erreur s'est produite", "error")
+            return render_template("update_password.html"), 500
+
+    @app.route("/update_password_form")
+    def update_password_form() -> str:
+        """Display the password update form."""
+        if not current_user.is_authenticated:
+            flash("Veuillez vous connecter pour modifier votre mot de passe", "error")
+            return redirect(url_for("login"))
+        return render_template("update_password.html")
@@ -0,0 +1,232 @@
+"""
+This file contains the Aho-Corasick automaton used to find every glossary
+term occurring in a document.
+"""
+
+from __future__ import annotations
+
+import re
+import unicodedata
+from collections import deque
+from functools import lru_cache
+from typing import Any, Dict, List, Set, Tuple
+
+from catalog import CatalogSnapshot
+from lookup import GRAMMAR_PATTERN, lookup_keys
+from normalize import LIGATURES
+
+# Term columns searched in documents, with their language
+ANNOTATE_FIELDS: Tuple[Tuple[str, str], ...] = (
+    ("english_term", "en"),
+    ("french_term", "fr"),
+    ("variant_en", "en"),
+    ("variant_fr", "fr"),
+    ("synonym_en", "en"),
+    ("synonym_fr", "fr"),
+)
+
+# Largest document accepted by /api/annotate, in characters
+MAX_ANNOTATE_CHARS = 2_000_000
+
+# Largest request body read by /api/annotate: 4 bytes per character in UTF-8,
+# 6 for a JSON \uXXXX escape, checked before the body is read
+MAX_ANNOTATE_BYTES = MAX_ANNOTATE_CHARS * 6
+
+# Parenthesized or bracketed parts of a label, e.g. "(BLOCKCHAIN) CONSENSUS PROTOCOL"
+OPTIONAL_PART_PATTERN = re.compile(r"\([^)]*\)|\[[^\]]*\]")
+BRACKET_PATTERN = re.compile(r"[()\[\]]")
+SPACE_PATTERN = re.compile(r"\s+")
+
+# Folded characters kept in memory; bounded, since documents come from the public
+FOLDED_CHARS_SIZE = 4096
+
+# Patterns shorter than this are too ambiguous to be reported
+MIN_PATTERN_LENGTH = 3
+
+
+@lru_cache(maxsize=FOLDED_CHARS_SIZE)
+def fold_char(char: str) -> str:
+    """
+    Fold one character like normalize.fold(): no accents, lowercase, ligatures expanded.
+    """
+    decomposed = unicodedata.normalize("NFKD", char.translate(LIGATURES))
+    return "".join(c for c in decomposed if not unicodedata.combining(c)).casefold()
+
+
+def fold_with_offsets(text: str) -> Tuple[str, List[int]]:
+    """
+    Fold a document like normalize.fold() while remembering where each
+    folded character comes from.
+
+    Whitespace runs become a single space; markup is not stripped, since a
+    document is plain text.
+
+    Input:  text (str)  | the document
+    Output: a tuple (folded text, offset in text of each folded character)
+    """
+    chars: List[str] = []
+    offsets: List[int] = []
+    for position, char in enumerate(text):
+        if char.isspace():
+            if chars and chars[-1] != " ":
+                chars.append(" ")
+                offsets.append(position)
+            continue
+        folded = fold_char(char)
+        if len(folded) == 1:
+            chars.append(folded)
+            offsets.append(position)
+        else:
+            chars.extend(folded)
+            offsets.extend([position] * len(folded))
+    return "".join(chars), offsets
+
+
+def pattern_forms(label: str) -> Set[str]:
+    """
+    Return the folded forms of a label searched for in documents: each
+    alternative without its grammatical label, as is, without its
+    parenthesized parts and without the parentheses only
+    ("consensus protocol" and "blockchain consensus protocol" for
+    "(BLOCKCHAIN) CONSENSUS PROTOCOL").
+
+    Input:  label (str) | the value of a term column
+    Output: the folded patterns
+    """
+    forms = set()
+    for key in lookup_keys(label):
+        key = GRAMMAR_PATTERN.sub("", key).strip()
+        without_parts = OPTIONAL_PART_PATTERN.sub(" ", key)
+        without_brackets = BRACKET_PATTERN.sub(" ", key)
+        for form in (key, without_parts, without_brackets):
+            form = SPACE_PATTERN.sub(" ", form).strip()
+            if len(form) >= MIN_PATTERN_LENGTH:
+                forms.add(form)
+    return forms
+
+
+class TermAutomaton:
+    """
+    An Aho-Corasick automaton over the folded glossary labels.
+
+    Attributes:
+        goto (List[Dict[str, int]]): the trie transitions of each state.
+        fail (List[int]): the failure link of each state.
+        outputs (List[List[int]]): the patterns ending at each state, failure chain included.
+        patterns (List[str]): the folded patterns.
+        pattern_terms (List[List[Tuple[int, str]]]): the (tid, lang) of each pattern.
+    """
+
+    def __init__(self, snapshot: CatalogSnapshot) -> None:
+        numbers: Dict[str, int] = {}
+        self.patterns: List[str] = []
+        self.pattern_terms: List[List[Tuple[int, str]]] = []
+        for term in snapshot.terms:
+            for field, lang in ANNOTATE_FIELDS:
+                if not term.get(field):
+                    continue
+                for form in pattern_forms(term[field]):
+                    number = numbers.setdefault(form, len(self.patterns))
+                    if number == len(self.patterns):
+                        self.patterns.append(form)
+                        self.pattern_terms.append([])
+                    if (term["tid"], lang) not in self.pattern_terms[number]:
+                        self.pattern_terms[number].append((term["tid"], lang))
+
+        # Trie of the patterns
+        self.goto: List[Dict[str, int]] = [{}]
+        self.outputs: List[List[int]] = [[]]
+        for number, pattern in enumerate(self.patterns):
+            state = 0
+            for char in pattern:
+                next_state = self.goto[state].get(char)
+                if next_state is None:
+                    next_state = len(self.goto)
+                    self.goto[state][char] = next_state
+                    self.goto.append({})
+                    self.outputs.append([])
+                state = next_state
+            self.outputs[state].append(number)
+
+        # Failure links, breadth first
+        self.fail: List[int] = [0] * len(self.goto)
+        queue = deque(self.goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self.goto[state].items():
+                queue.append(next_state)
+                fallback = self.fail[state]
+                while fallback and char not in self.goto[fallback]:
+                    fallback = self.fail[fallback]
+                target = self.goto[fallback].get(char, 0)
+                self.fail[next_state] = target if target != next_state else 0
+                self.outputs[next_state] = self.outputs[next_state] + self.outputs[self.fail[next_state]]
+
+    def scan(self, folded: str) -> List[Tuple[int, int, int]]:
+        """
+        Find every pattern occurring in a folded text, in a single pass.
+
+        Only the occurrences delimited by word boundaries are kept.
+
+        Input:  folded (str)    | the folded text
+        Output: a list of (start, end, pattern number), end excluded
+        """
+        matches = []
+        state = 0
+        goto, fail, outputs = self.goto, self.fail, self.outputs
+        for position, char in enumerate(folded):
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            for number in outputs[state]:
+                end = position + 1
+                start = end - len(self.patterns[number])
+                if (start == 0 or not folded[start - 1].isalnum()) and (
+                    end == len(folded) or not folded[end].isalnum()
+                ):
+                    matches.append((start, end, number))
+        return matches
+
+    def annotate(self, text: str, snapshot: CatalogSnapshot) -> List[Dict[str, Any]]:
+        """
+        Return the glossary terms occurring in a document.
+
+        Overlapping occurrences are resolved leftmost-longest, so
+        "neural network" is reported rather than "network" inside it.
+
+        Input:  text (str)                  | the document
+                snapshot (CatalogSnapshot)  | the snapshot the automaton was built from
+        Output: the occurrences, with offsets in the original text and the matching terms
+        """
+        folded, offsets = fold_with_offsets(text)
+        matches = sorted(self.scan(folded), key=lambda match: (match[0], match[0] - match[1]))
+
+        annotations = []
+        covered = 0
+        for start, end, number in matches:
+            if start < covered:
+                continue
+            covered = end
+            original_start, original_end = offsets[start], offsets[end - 1] + 1
+            annotations.append({
+                "start": original_start,
+                "end": original_end,
+                "text": text[original_start:original_end],
+                "terms": [
+                    {
+                        "tid": tid,
+                        "lang": lang,
+                        "english_term": snapshot.by_tid[tid]["english_term"],
+                        "french_term": snapshot.by_tid[tid]["french_term"],
+                    }
+                    for tid, lang in self.pattern_terms[number]
+                ],
+            })
+        return annotations
+
+
+def get_automaton(snapshot: CatalogSnapshot) -> TermAutomaton:
+    """
+    Return the automaton of a snapshot, building it once per catalog version.
+    """
+    return snapshot.derived("automaton", TermAutomaton)
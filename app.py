@@ -8,23 +8,36 @@ import os
 
 from dotenv import load_dotenv
 from flask import Flask
-from flask_bcrypt import Bcrypt
 from flask_cors import CORS
-from flask_login import LoginManager
-from flask_migrate import Migrate
 from flask_sqlalchemy import SQLAlchemy
 
+from compression import init_compression
+from metrics import init_metrics, register_cache_stats
+from slow_queries import init_slow_query_log
+from storage import database_path, init_storage
+
 # Define a database object
 db: SQLAlchemy = SQLAlchemy()
 
+# Application profiles:
+#   "full"      | public routes, admin interface, login, CLI commands and migrations
+#   "public"    | public pages and read-only API only, for the high-traffic tier
+PROFILES = ("full", "public")
+
 
-def create_app() -> Flask:
+def create_app(profile: str = "full") -> Flask:
     """
     Create the Flask app and return it as an object.
 
-    Input:  Nothing
+    The "public" profile never imports Flask-Admin, Bcrypt, Flask-Login or
+    Flask-Migrate, which makes its workers start faster and use less memory.
+
+    Input:  profile (str)   | one of PROFILES
     Output: an object representing the Flask application
     """
+    if profile not in PROFILES:
+        raise ValueError(f"Unknown application profile: {profile}")
+
     # Define the Flask application
     app: Flask = Flask(
         __name__,
@@ -33,9 +46,7 @@ def create_app() -> Flask:
     )
 
     # Define a string for the SQLite database
-    app.config["SQLALCHEMY_DATABASE_URI"] = (
-        f"sqlite:///{os.path.abspath(os.path.join(os.path.dirname(__file__), 'instance', 'glossary.db'))}"
-    )
+    app.config["SQLALCHEMY_DATABASE_URI"] = f"sqlite:///{database_path(app)}"
 
     # Suppress warning related to the SQLALCHEMY_TRACK_MODIFICATIONS
     # configuration option in Flask-SQLAlchemy
@@ -49,9 +60,51 @@ def create_app() -> Flask:
     # Initialize CORS
     CORS(app)
 
+    # Latency, size and SQL metrics; registered first so it sees the final response
+    init_metrics(app)
+
+    # Log the SQL statements slower than SLOW_QUERY_MS with their query plan
+    init_slow_query_log(app)
+
+    # Compress API and HTML responses
+    init_compression(app)
+    register_cache_stats(app, "compressed_bodies", app.extensions["compression_cache"].stats)
+
     # Initialize the Flask application
     db.init_app(app)
 
+    # WAL, mmap and cache pragmas, and the read-only engine of the public routes
+    init_storage(app, db)
+
+    app.config["APP_PROFILE"] = profile
+
+    from catalog import snapshot_stats
+
+    register_cache_stats(app, "catalog_snapshot", snapshot_stats)
+
+    # import register_routes here to avoid circular imports
+    from routes import register_routes
+
+    register_routes(app)
+    register_cache_stats(app, "search_results", app.extensions["search_cache"].stats)
+
+    if profile == "full":
+        init_admin(app)
+
+    return app
+
+
+def init_admin(app: Flask) -> None:
+    """
+    Set up the login, the admin interface, the CLI commands and the migrations.
+
+    Input:  app (Flask) | the application
+    Output: Nothing
+    """
+    from flask_bcrypt import Bcrypt
+    from flask_login import LoginManager
+    from flask_migrate import Migrate
+
     login_manager = LoginManager()
     login_manager.init_app(app)
     login_manager.login_view = "login"
@@ -64,11 +117,12 @@ def create_app() -> Flask:
     def load_user(user_id):
         return User.query.get(int(user_id))
 
-    # import register_routes here to avoid circular imports
-    from routes import register_routes
+    from admin import register_admin
+
+    register_admin(app, db, bcrypt)
 
-    register_routes(app, db, bcrypt)
+    from commands import register_commands
 
-    migrate: Migrate = Migrate(app, db)  # noqa: F841
+    register_commands(app)
 
-    return app
\ No newline at end of file
+    migrate: Migrate = Migrate(app, db)  # noqa: F841
\ No newline at end of file
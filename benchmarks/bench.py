@@ -0,0 +1,294 @@
+"""
+This file benchmarks the public endpoints against synthetic glossaries.
+
+Each size runs in its own process, on a temporary SQLite database filled by
+benchmarks/generate.py, and every endpoint is driven through the Flask test
+client. The report gives, per endpoint, the p50/p95/p99 latency, the
+latency of the first (cold) request, the number of SQL statements per
+request and the peak Python memory of one request.
+
+    python -m benchmarks.bench --sizes 1000 10000 100000
+    python -m benchmarks.bench --sizes 1000 --baseline benchmarks/results/previous.json
+
+With --baseline, an endpoint whose p95 grew by more than --threshold is
+reported as a regression and the exit status is 1.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import platform
+import resource
+import sqlite3
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from itertools import islice
+from typing import Any, Dict, List, Optional, Tuple
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+DEFAULT_SIZES = (1000, 10000, 100000)
+DEFAULT_REQUESTS = 50
+
+# Requests per endpoint for the endpoints reading the whole glossary
+HEAVY_REQUESTS = 3
+
+# Largest accepted p95 growth against the baseline
+DEFAULT_THRESHOLD = 1.25
+
+# Number of generated terms used in the bodies of the POST endpoints
+SAMPLE_TERMS = 20
+
+# (name, method, path, JSON body, heavy); the POST bodies are built by sample_bodies()
+ENDPOINTS: Tuple[Tuple[str, str, str, Optional[Any], bool], ...] = (
+    ("search_term", "GET", "/api/terms/search?q=data&type=term", None, False),
+    ("search_term_page", "GET", "/api/terms/search?q=data&type=term&limit=20", None, False),
+    ("search_synonym", "GET", "/api/terms/search?q=ledger&type=synonym", None, False),
+    ("search_fulltext", "GET", "/api/terms/search?q=accuracy&type=fulltext", None, False),
+    ("search_fuzzy", "GET", "/api/terms/search?q=distribted%20legder&type=fuzzy", None, False),
+    ("search_subdomain", "GET", "/api/terms/search?q=blockchain&type=subdomain", None, False),
+    ("search_class", "GET", "/api/terms/search?q=action&type=class", None, False),
+    ("suggest", "GET", "/api/terms/suggest?prefix=dist", None, False),
+    ("facets", "GET", "/api/terms/facets?q=data", None, False),
+    ("batch", "POST", "/api/terms/batch", None, False),
+    ("annotate", "POST", "/api/annotate", None, False),
+    ("term", "GET", "/api/terms/1", None, False),
+    ("terms_page", "GET", "/api/terms?limit=50", None, False),
+    ("terms_list_page", "GET", "/api/terms/list?limit=50&fields=english_term,french_term", None, False),
+    ("semantic_labels", "GET", "/api/terms/semantic-labels", None, False),
+    ("terms", "GET", "/api/terms", None, True),
+    ("terms_list", "GET", "/api/terms/list", None, True),
+    ("terms_ndjson", "GET", "/api/terms?format=ndjson", None, True),
+    ("terms_json", "GET", "/api/terms/json", None, True),
+    ("terms_csv", "GET", "/api/terms/csv", None, True),
+    ("terms_xml", "GET", "/api/terms/xml", None, True),
+)
+
+
+def sample_bodies(size: int, seed: int) -> Dict[str, Any]:
+    """
+    Build the bodies of the POST endpoints from the first generated terms.
+
+    Input:  size (int)  | the number of generated terms
+            seed (int)  | the seed of the generator
+    Output: the JSON bodies, by endpoint name
+    """
+    from benchmarks.generate import generate_terms
+
+    terms = list(islice(generate_terms(size, seed), SAMPLE_TERMS))
+    labels = [term["english_term"].split(",")[0].split("<")[0].lower() for term in terms]
+    text = " ".join(
+        f"The team deployed a {label} and compared it with a {term['french_term'].split(',')[0].split('<')[0].lower()}."
+        for label, term in zip(labels, terms)
+    )
+    return {
+        "batch": {"tids": list(range(1, 101)), "terms": labels},
+        "annotate": {"text": text * 10},
+    }
+
+
+def percentile(quantiles: List[float], rank: int) -> float:
+    """
+    Return the rank-th percentile from the output of statistics.quantiles(n=100).
+    """
+    return round(quantiles[rank - 1], 3)
+
+
+def measure_endpoint(client: Any, method: str, path: str, body: Optional[Any], requests: int) -> Dict[str, Any]:
+    """
+    Measure one endpoint: a cold request, timed requests and a traced request.
+
+    Input:  client              | the Flask test client
+            method (str)        | "GET" or "POST"
+            path (str)          | the path and query string
+            body (Any)          | the JSON body, or None
+            requests (int)      | the number of timed requests
+    Output: the statistics of the endpoint
+    """
+    from benchmarks.counters import query_counter
+
+    def call() -> Tuple[int, int]:
+        response = client.open(path, method=method, json=body)
+        # Consume streamed bodies, as a real client would
+        return response.status_code, len(response.get_data())
+
+    started = time.perf_counter()
+    status, size = call()
+    first_ms = (time.perf_counter() - started) * 1000
+
+    durations = []
+    queries = []
+    for _ in range(requests):
+        query_counter.reset()
+        started = time.perf_counter()
+        call()
+        durations.append((time.perf_counter() - started) * 1000)
+        queries.append(query_counter.count)
+
+    tracemalloc.start()
+    call()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    quantiles = statistics.quantiles(durations, n=100, method="inclusive") if len(durations) > 1 else durations * 99
+    return {
+        "status": status,
+        "bytes": size,
+        "requests": requests,
+        "first_ms": round(first_ms, 3),
+        "mean_ms": round(statistics.fmean(durations), 3),
+        "p50_ms": percentile(quantiles, 50),
+        "p95_ms": percentile(quantiles, 95),
+        "p99_ms": percentile(quantiles, 99),
+        "sql_queries": statistics.median(queries),
+        "peak_kib": round(peak / 1024, 1),
+    }
+
+
+def run_size(size: int, requests: int, seed: int) -> Dict[str, Any]:
+    """
+    Benchmark every endpoint on a fresh database of the given size.
+
+    Must run in its own process: the catalog snapshot and the engines are
+    process-wide, and the database path is read when the app is created.
+
+    Input:  size (int)      | the number of generated terms
+            requests (int)  | the number of timed requests per endpoint
+            seed (int)      | the seed of the generator
+    Output: the results of this size
+    """
+    with tempfile.TemporaryDirectory(prefix="glotecht-bench-") as directory:
+        os.environ["DATABASE_PATH"] = os.path.join(directory, "glossary.db")
+
+        from app import create_app
+        from benchmarks.counters import install_query_counter
+        from benchmarks.generate import populate_database
+
+        started = time.perf_counter()
+        populate_database(create_app(), size, seed)
+        populate_seconds = time.perf_counter() - started
+
+        install_query_counter()
+        app = create_app(profile="public")
+        client = app.test_client()
+        bodies = sample_bodies(size, seed)
+
+        endpoints = {}
+        for name, method, path, body, heavy in ENDPOINTS:
+            endpoints[name] = measure_endpoint(
+                client, method, path, bodies.get(name, body), min(requests, HEAVY_REQUESTS) if heavy else requests
+            )
+            print(
+                f"{size:>7} {name:<18} p50 {endpoints[name]['p50_ms']:>9.2f} ms"
+                f"  p95 {endpoints[name]['p95_ms']:>9.2f} ms  sql {endpoints[name]['sql_queries']}",
+                file=sys.stderr,
+            )
+
+        return {
+            "size": size,
+            "populate_seconds": round(populate_seconds, 3),
+            "database_bytes": os.path.getsize(os.environ["DATABASE_PATH"]),
+            "max_rss_kib": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+            "endpoints": endpoints,
+        }
+
+
+def compare(results: Dict[str, Any], baseline: Dict[str, Any], threshold: float) -> List[str]:
+    """
+    List the endpoints whose p95 grew by more than threshold against the baseline.
+
+    Input:  results (dict)      | the current report
+            baseline (dict)     | a previous report
+            threshold (float)   | the largest accepted ratio
+    Output: a message per regression
+    """
+    previous = {run["size"]: run["endpoints"] for run in baseline.get("runs", [])}
+    regressions = []
+    for run in results["runs"]:
+        for name, stats in run["endpoints"].items():
+            before = previous.get(run["size"], {}).get(name)
+            if before is None or before["p95_ms"] <= 0:
+                continue
+            ratio = stats["p95_ms"] / before["p95_ms"]
+            if ratio > threshold:
+                regressions.append(
+                    f"{name} at {run['size']} terms: p95 {before['p95_ms']} ms -> {stats['p95_ms']} ms (x{ratio:.2f})"
+                )
+    return regressions
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the public endpoints of GloTechT.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(DEFAULT_SIZES))
+    parser.add_argument("--requests", type=int, default=DEFAULT_REQUESTS)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", help="the JSON report (default: benchmarks/results/<timestamp>.json)")
+    parser.add_argument("--baseline", help="a previous JSON report to compare with")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD)
+    parser.add_argument("--worker", type=int, help=argparse.SUPPRESS)
+    parser.add_argument("--worker-output", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker is not None:
+        with open(args.worker_output, "w", encoding="utf-8") as file:
+            json.dump(run_size(args.worker, args.requests, args.seed), file)
+        return 0
+
+    started_at = datetime.now(timezone.utc)
+    runs = []
+    for size in args.sizes:
+        with tempfile.NamedTemporaryFile(suffix=".json", delete=False) as file:
+            worker_output = file.name
+        try:
+            subprocess.run(
+                [
+                    sys.executable, "-m", "benchmarks.bench",
+                    "--worker", str(size),
+                    "--worker-output", worker_output,
+                    "--requests", str(args.requests),
+                    "--seed", str(args.seed),
+                ],
+                cwd=ROOT,
+                check=True,
+            )
+            with open(worker_output, encoding="utf-8") as file:
+                runs.append(json.load(file))
+        finally:
+            os.remove(worker_output)
+
+    results = {
+        "started_at": started_at.isoformat(),
+        "python": platform.python_version(),
+        "sqlite": sqlite3.sqlite_version,
+        "requests": args.requests,
+        "seed": args.seed,
+        "runs": runs,
+    }
+
+    output = args.output or os.path.join(
+        ROOT, "benchmarks", "results", f"{started_at.strftime('%Y%m%dT%H%M%SZ')}.json"
+    )
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w", encoding="utf-8") as file:
+        json.dump(results, file, indent=2)
+    print(f"Results written to {output}")
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as file:
+            regressions = compare(results, json.load(file), args.threshold)
+        for regression in regressions:
+            print(f"REGRESSION {regression}")
+        if regressions:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
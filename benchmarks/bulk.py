@@ -0,0 +1,108 @@
+"""
+This file checks that every chunk of the bulk upsert is one atomic transaction.
+
+A chunk is written on a synthetic glossary while the catalog version bump,
+which runs after the upsert, is made to fail; the check fails if any row of
+that chunk is left in the database. A chunk written normally must then be
+committed along with its version bump.
+
+    python -m benchmarks.bulk --size 1000
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+import tempfile
+from typing import Any, Dict, List, Tuple
+
+from sqlalchemy import text
+
+DEFAULT_SIZE = 1000
+
+# Rows of the chunk, all new terms
+CHUNK_ROWS = 3
+
+
+def new_rows() -> List[Tuple[int, Dict[str, Any]]]:
+    """
+    Return the records of a chunk of new terms, as read by importer.read_ndjson.
+    """
+    return [
+        (line, {
+            "english_term": f"atomicity probe {line}",
+            "french_term": f"sonde d'atomicité {line}",
+            "domain_en": "Technology",
+            "domain_fr": "Technologie",
+        })
+        for line in range(1, CHUNK_ROWS + 1)
+    ]
+
+
+def check_atomicity(size: int, seed: int) -> List[str]:
+    """
+    Write a chunk whose transaction fails after the upsert, then a chunk that succeeds.
+
+    Input:  size (int)  | the number of generated terms
+            seed (int)  | the seed of the generator
+    Output: the failures, empty if the chunks were atomic
+    """
+    with tempfile.TemporaryDirectory(prefix="glotecht-bulk-") as directory:
+        os.environ["DATABASE_PATH"] = os.path.join(directory, "glossary.db")
+        os.environ["SLOW_QUERY_MS"] = "0"
+
+        import importer
+        from app import create_app, db
+        from benchmarks.generate import populate_database
+
+        app = create_app()
+        populate_database(app, size, seed)
+
+        def state() -> Tuple[int, int]:
+            with db.engine.connect() as connection:
+                terms = connection.execute(text("SELECT count(*) FROM terms")).scalar()
+                version = connection.execute(text("SELECT version FROM catalog_version WHERE id = 1")).scalar()
+            return terms, version
+
+        failures = []
+        with app.app_context():
+            terms, version = state()
+
+            def failing_bump(connection: Any) -> None:
+                raise RuntimeError("version bump failed")
+
+            bump = importer.bump_catalog_version
+            importer.bump_catalog_version = failing_bump
+            try:
+                result = importer.bulk_upsert(db.engine, new_rows())
+                failures.append(f"the failing chunk did not raise: {result.to_dict()}")
+            except RuntimeError:
+                pass
+            finally:
+                importer.bump_catalog_version = bump
+
+            if state() != (terms, version):
+                failures.append(f"the failing chunk left rows behind: {state()} instead of {(terms, version)}")
+
+            result = importer.bulk_upsert(db.engine, new_rows())
+            if result.created != CHUNK_ROWS or state() != (terms + CHUNK_ROWS, version + 1):
+                failures.append(f"the chunk was not committed with its version bump: {result.to_dict()}, {state()}")
+        return failures
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Check that the bulk upsert writes atomic chunks.")
+    parser.add_argument("--size", type=int, default=DEFAULT_SIZE)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    failures = check_atomicity(args.size, args.seed)
+    for failure in failures:
+        print(f"FAILED {failure}")
+    print(f"bulk chunk atomicity: {'ok' if not failures else f'{len(failures)} failures'}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,43 @@
+"""
+This file counts the SQL statements executed during the benchmarks.
+"""
+
+from __future__ import annotations
+
+import threading
+from typing import Any
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+
+class QueryCounter:
+    """
+    The number of SQL statements executed since the last reset, on any engine.
+
+    Attributes:
+        count (int): the number of statements.
+    """
+
+    def __init__(self) -> None:
+        self.count = 0
+        self._lock = threading.Lock()
+
+    def reset(self) -> None:
+        with self._lock:
+            self.count = 0
+
+    def increment(self, *args: Any) -> None:
+        with self._lock:
+            self.count += 1
+
+
+query_counter = QueryCounter()
+
+
+def install_query_counter() -> None:
+    """
+    Count the statements of every engine, including the read-only one.
+    """
+    if not event.contains(Engine, "before_cursor_execute", query_counter.increment):
+        event.listen(Engine, "before_cursor_execute", query_counter.increment)
@@ -0,0 +1,242 @@
+"""
+This file generates a synthetic glossary database for the benchmarks.
+
+The terms look like the real ones: bilingual labels with grammatical
+labels and accents, subdomain lists, semantic labels, HTML-tagged
+co-occurrences and lexical relations stored as JSON.
+"""
+
+from __future__ import annotations
+
+import os
+import random
+from itertools import islice
+from typing import Any, Dict, Iterator, List, Tuple
+
+from flask import Flask
+from flask_migrate import upgrade
+from sqlalchemy import insert
+
+# (English, French) words combined into terms: modifier + qualifier + head
+MODIFIERS: Tuple[Tuple[str, str], ...] = (
+    ("distributed", "distribué"), ("federated", "fédéré"), ("generative", "génératif"),
+    ("adversarial", "antagoniste"), ("semantic", "sémantique"), ("predictive", "prédictif"),
+    ("decentralized", "décentralisé"), ("immutable", "immuable"), ("neural", "neuronal"),
+    ("probabilistic", "probabiliste"), ("synthetic", "synthétique"), ("encrypted", "chiffré"),
+    ("private", "privé"), ("public", "public"), ("hybrid", "hybride"), ("recurrent", "récurrent"),
+    ("convolutional", "convolutif"), ("supervised", "supervisé"), ("unsupervised", "non supervisé"),
+    ("real-time", "en temps réel"), ("scalable", "évolutif"), ("autonomous", "autonome"),
+    ("cryptographic", "cryptographique"), ("deep", "profond"), ("sparse", "creux"),
+    ("streaming", "en flux"), ("open", "ouvert"), ("trusted", "de confiance"),
+    ("permissioned", "à permission"), ("latent", "latent"), ("robust", "robuste"),
+    ("explainable", "explicable"), ("massive", "massif"), ("raw", "brut"),
+    ("structured", "structuré"), ("unstructured", "non structuré"), ("smart", "intelligent"),
+    ("digital", "numérique"), ("virtual", "virtuel"), ("quantum", "quantique"),
+)
+QUALIFIERS: Tuple[Tuple[str, str], ...] = (
+    ("data", "de données"), ("network", "de réseau"), ("ledger", "de registre"),
+    ("model", "de modèle"), ("token", "de jeton"), ("consensus", "de consensus"),
+    ("learning", "d'apprentissage"), ("storage", "de stockage"), ("mining", "de minage"),
+    ("inference", "d'inférence"), ("training", "d'entraînement"), ("query", "de requête"),
+    ("graph", "de graphe"), ("hash", "de hachage"), ("block", "de bloc"),
+    ("feature", "de caractéristique"), ("cluster", "de grappe"), ("signal", "de signal"),
+    ("vector", "de vecteur"), ("transaction", "de transaction"), ("wallet", "de portefeuille"),
+    ("oracle", "d'oracle"), ("layer", "de couche"), ("kernel", "de noyau"),
+    ("pipeline", "de pipeline"), ("sensor", "de capteur"), ("language", "de langage"),
+    ("image", "d'image"), ("speech", "de parole"), ("memory", "de mémoire"),
+    ("privacy", "de confidentialité"), ("identity", "d'identité"), ("governance", "de gouvernance"),
+    ("lake", "de lac"), ("warehouse", "d'entrepôt"), ("stream", "de flux"),
+    ("contract", "de contrat"), ("protocol", "de protocole"), ("attention", "d'attention"),
+    ("embedding", "de plongement"),
+)
+HEADS: Tuple[Tuple[str, str, str], ...] = (
+    ("algorithm", "algorithme", "N. masc."), ("architecture", "architecture", "N. fém."),
+    ("node", "nœud", "N. masc."), ("platform", "plateforme", "N. fém."),
+    ("framework", "cadre", "N. masc."), ("engine", "moteur", "N. masc."),
+    ("system", "système", "N. masc."), ("validation", "validation", "N. fém."),
+    ("optimization", "optimisation", "N. fém."), ("analysis", "analyse", "N. fém."),
+    ("encoder", "encodeur", "N. masc."), ("decoder", "décodeur", "N. masc."),
+    ("repository", "dépôt", "N. masc."), ("process", "processus", "N. masc."),
+    ("scheme", "schéma", "N. masc."), ("mechanism", "mécanisme", "N. masc."),
+    ("interface", "interface", "N. fém."), ("service", "service", "N. masc."),
+    ("policy", "politique", "N. fém."), ("metric", "métrique", "N. fém."),
+    ("strategy", "stratégie", "N. fém."), ("function", "fonction", "N. fém."),
+    ("agent", "agent", "N. masc."), ("format", "format", "N. masc."),
+    ("index", "index", "N. masc."), ("certificate", "certificat", "N. masc."),
+    ("audit", "audit", "N. masc."), ("sandbox", "bac à sable", "N. masc."),
+    ("benchmark", "banc d'essai", "N. masc."), ("registry", "registre", "N. masc."),
+    ("compression", "compression", "N. fém."), ("detection", "détection", "N. fém."),
+    ("segmentation", "segmentation", "N. fém."), ("simulation", "simulation", "N. fém."),
+    ("replication", "réplication", "N. fém."), ("partition", "partition", "N. fém."),
+    ("aggregation", "agrégation", "N. fém."), ("verification", "vérification", "N. fém."),
+    ("orchestration", "orchestration", "N. fém."), ("visualization", "visualisation", "N. fém."),
+)
+
+SUBDOMAINS: Tuple[Tuple[str, str], ...] = (
+    ("Artificial Intelligence", "Intelligence Artificielle"),
+    ("Big Data", "Big Data"),
+    ("Blockchain", "Blockchain"),
+)
+
+SEMANTIC_LABELS: Tuple[Tuple[str, str], ...] = (
+    ("‘data’", "‘données’"),
+    ("‘action on data’", "‘action sur les données’"),
+    ("‘technology’", "‘technologie’"),
+    ("‘process’", "‘processus’"),
+    ("‘property of data’", "‘propriété des données’"),
+    ("‘agent’", "‘agent’"),
+    ("‘instrument’", "‘instrument’"),
+    ("‘result’", "‘résultat’"),
+)
+
+# Homonym numbers ("<sub>2</sub>") multiply the number of distinct labels
+HOMONYMS = 4
+
+# Number of rows inserted per statement
+INSERT_BATCH_SIZE = 2000
+
+# Share of the generated terms that are inactive
+INACTIVE_RATIO = 0.03
+
+
+def term_labels(number: int) -> Tuple[str, str, str]:
+    """
+    Return the (English, French, grammatical label) of the term with this number.
+
+    Every number below term_capacity() gives a distinct term, so labels stay
+    unique without any lookup.
+    """
+    homonym, number = divmod(number, len(MODIFIERS) * len(QUALIFIERS) * len(HEADS))
+    number, head = divmod(number, len(HEADS))
+    modifier, qualifier = divmod(number, len(QUALIFIERS))
+    modifier %= len(MODIFIERS)
+    en_head, fr_head, grammar = HEADS[head]
+    english = f"{MODIFIERS[modifier][0]} {QUALIFIERS[qualifier][0]} {en_head}".upper()
+    french = f"{fr_head} {QUALIFIERS[qualifier][1]} {MODIFIERS[modifier][1]}".upper()
+    if homonym:
+        english += f"<sub>{homonym + 1}</sub>"
+        french += f"<sub>{homonym + 1}</sub>"
+    return english, french, grammar
+
+
+def term_capacity() -> int:
+    """
+    Return the number of distinct terms term_labels() can produce.
+    """
+    return len(MODIFIERS) * len(QUALIFIERS) * len(HEADS) * HOMONYMS
+
+
+def generate_terms(count: int, seed: int = 42) -> Iterator[Dict[str, Any]]:
+    """
+    Generate the rows of count synthetic terms, deterministically.
+
+    Input:  count (int) | the number of terms
+            seed (int)  | the seed of the random generator
+    Output: an iterator over the rows, as dictionaries of Term columns
+    """
+    capacity = term_capacity()
+    if count > capacity:
+        raise ValueError(f"At most {capacity} distinct terms can be generated")
+
+    rng = random.Random(seed)
+    for tid, number in enumerate(rng.sample(range(capacity), count), start=1):
+        english, french, grammar = term_labels(number)
+        subdomains = sorted(rng.sample(range(len(SUBDOMAINS)), rng.randint(1, len(SUBDOMAINS))))
+        label_en, label_fr = rng.choice(SEMANTIC_LABELS)
+        base_en, base_fr = english.split("<")[0], french.split("<")[0]
+        head_en, head_fr = base_en.split()[-1].lower(), base_fr.split()[0].lower()
+        related_en = term_labels(rng.randrange(capacity))[0].split("<")[0].lower()
+        related_fr = term_labels(rng.randrange(capacity))[1].split("<")[0].lower()
+
+        yield {
+            "tid": tid,
+            "domain_en": "Disruptive Technologies",
+            "domain_fr": "Technologies transformatrices",
+            "subdomains_en": [SUBDOMAINS[i][0] for i in subdomains],
+            "subdomains_fr": [SUBDOMAINS[i][1] for i in subdomains],
+            "english_term": f"{english}, N.",
+            "french_term": f"{french}, {grammar}",
+            "semantic_label_en": label_en,
+            "semantic_label_fr": label_fr,
+            "variant_en": base_en.replace(" ", "-") if rng.random() < 0.2 else None,
+            "variant_fr": None,
+            "synonym_en": related_en.upper() if rng.random() < 0.3 else None,
+            "synonym_fr": related_fr.upper() if rng.random() < 0.3 else None,
+            "near_synonym_en": None,
+            "near_synonym_fr": None,
+            "definition_en": (
+                f"In {SUBDOMAINS[subdomains[0]][0].lower()}, a {head_en} that processes "
+                f"<data> from a {related_en} to improve the accuracy of the results."
+            ),
+            "definition_fr": (
+                f"En {SUBDOMAINS[subdomains[0]][1].lower()}, {head_fr} qui traite les "
+                f"<données> d'un {related_fr} afin d'améliorer l'exactitude des résultats."
+            ),
+            "syntactic_cooccurrence_en": [
+                f"The <u>engineer</u> <b>[ART <em>N</em>]</b> deployed the {base_en.lower()} <b>[ART <em>N</em>]</b>."
+            ],
+            "syntactic_cooccurrence_fr": [
+                f"<u>L'ingénieur</u> <b>[ART <em>N</em>]</b> a déployé le {base_fr.lower()} <b>[ART <em>N</em>]</b>."
+            ],
+            "lexical_relations_en": [
+                {"Generic Term": head_en},
+                {"Who uses it": "data scientist; engineer; analyst"},
+                {"Related term": related_en},
+            ],
+            "lexical_relations_fr": [
+                {"Terme générique": head_fr},
+                {"Qui l'utilise": "spécialiste des données ; ingénieur ; analyste"},
+                {"Terme associé": related_fr},
+            ],
+            "note_en": None,
+            "note_fr": None,
+            "not_to_be_confused_with_en": {},
+            "not_to_be_confused_with_fr": {},
+            "frequent_expression_en": {},
+            "frequent_expression_fr": {},
+            "phraseology_en": None,
+            "phraseology_fr": None,
+            "context_en": f"The team evaluated a new {base_en.lower()} last year. [Synthetic 2024]",
+            "context_fr": f"L'équipe a évalué un nouveau {base_fr.lower()} l'an dernier. [Synthétique 2024]",
+            "is_active": rng.random() >= INACTIVE_RATIO,
+        }
+
+
+def populate_database(app: Flask, count: int, seed: int = 42) -> None:
+    """
+    Create the schema of an empty database with the migrations and fill it.
+
+    Rows are inserted in batches with executemany, bypassing the ORM, so the
+    folded search keys, the term_subdomains rows and the catalog version are
+    written here, as any raw SQL writer must.
+
+    Input:  app (Flask)     | an application bound to the empty database
+            count (int)     | the number of terms
+            seed (int)      | the seed of the generator
+    Output: Nothing
+    """
+    from app import db
+    from catalog import bump_catalog_version
+    from models import Term, TermSubdomain, term_subdomain_rows
+    from normalize import fold
+
+    with app.app_context():
+        upgrade(directory=os.path.join(app.root_path, "migrations"))
+
+        terms = generate_terms(count, seed)
+        with db.engine.begin() as connection:
+            while True:
+                batch: List[Dict[str, Any]] = list(islice(terms, INSERT_BATCH_SIZE))
+                if not batch:
+                    break
+                subdomain_rows = []
+                for row in batch:
+                    row["english_term_norm"] = fold(row["english_term"])
+                    row["french_term_norm"] = fold(row["french_term"])
+                    subdomain_rows.extend(
+                        term_subdomain_rows(row["tid"], row["subdomains_en"], row["subdomains_fr"])
+                    )
+                connection.execute(insert(Term.__table__), batch)
+                connection.execute(insert(TermSubdomain.__table__), subdomain_rows)
+            bump_catalog_version(connection)
+            connection.exec_driver_sql("ANALYZE")
@@ -0,0 +1,137 @@
+"""
+This file checks the query plans of the statements run by the public endpoints.
+
+Every endpoint of benchmarks/bench.py is called once on a synthetic glossary,
+each SELECT it runs is explained, and the check fails if a plan still reads
+the whole terms table ("SCAN terms") instead of searching an index, or if it
+only narrows the active terms by is_active (true for nearly every row) and
+then filters them with LIKE, which reads every active row all the same.
+
+    python -m benchmarks.plans --size 10000
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import re
+import sqlite3
+import sys
+import tempfile
+from typing import Any, Dict, List, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+# A full scan of the terms table (but not of terms_fts or term_subdomains)
+FULL_SCAN_PATTERN = re.compile(r"\bSCAN terms\b(?!_)")
+
+# An index search of terms constrained on is_active alone
+ACTIVE_ONLY_PATTERN = re.compile(r"\bSEARCH terms USING (?:COVERING )?INDEX \w+ \(is_active=\?\)")
+
+# Statements filtering rows with LIKE
+LIKE_PATTERN = re.compile(r"\bLIKE\b", re.IGNORECASE)
+
+DEFAULT_SIZE = 10000
+
+
+def capture_statements(statements: Dict[str, Tuple[Any, str]]) -> Any:
+    """
+    Return an event listener storing each distinct SELECT with its parameters and endpoint.
+    """
+    from flask import has_request_context, request
+
+    from slow_queries import EXPLAINABLE_PREFIXES
+
+    def capture(connection: Any, cursor: Any, statement: str, parameters: Any, context: Any, executemany: bool) -> None:
+        if executemany or not statement.lstrip().lower().startswith(EXPLAINABLE_PREFIXES):
+            return
+        if statement not in statements:
+            endpoint = request.endpoint if has_request_context() else "none"
+            statements[statement] = (parameters, endpoint)
+
+    return capture
+
+
+def is_full_scan(statement: str, plan: List[str]) -> bool:
+    """
+    Tell whether a plan reads every (active) row of the terms table.
+
+    Input:  statement (str)     | the SQL
+            plan (List[str])    | its EXPLAIN QUERY PLAN lines
+    Output: True for a SCAN of terms, or an is_active-only SEARCH filtered by LIKE
+    """
+    if any(FULL_SCAN_PATTERN.search(line) for line in plan):
+        return True
+    return bool(LIKE_PATTERN.search(statement)) and any(ACTIVE_ONLY_PATTERN.search(line) for line in plan)
+
+
+def check_plans(size: int, seed: int) -> List[Dict[str, Any]]:
+    """
+    Explain every SELECT run by the public endpoints on a glossary of this size.
+
+    Input:  size (int)  | the number of generated terms
+            seed (int)  | the seed of the generator
+    Output: the statements, their endpoint, their plan and whether it scans terms
+    """
+    from benchmarks.bench import ENDPOINTS, sample_bodies
+    from slow_queries import explain_query_plan
+
+    with tempfile.TemporaryDirectory(prefix="glotecht-plans-") as directory:
+        os.environ["DATABASE_PATH"] = os.path.join(directory, "glossary.db")
+        # The bulk inserts of the generator would fill the output
+        os.environ["SLOW_QUERY_MS"] = "0"
+
+        from app import create_app
+        from benchmarks.generate import populate_database
+
+        populate_database(create_app(), size, seed)
+
+        statements: Dict[str, Tuple[Any, str]] = {}
+        listener = capture_statements(statements)
+        event.listen(Engine, "before_cursor_execute", listener)
+        try:
+            app = create_app(profile="public")
+            client = app.test_client()
+            bodies = sample_bodies(size, seed)
+            for name, method, path, body, _ in ENDPOINTS:
+                client.open(path, method=method, json=bodies.get(name, body)).get_data()
+        finally:
+            event.remove(Engine, "before_cursor_execute", listener)
+
+        connection = sqlite3.connect(os.environ["DATABASE_PATH"])
+        try:
+            results = []
+            for statement, (parameters, endpoint) in statements.items():
+                plan = explain_query_plan(connection, statement, parameters)
+                results.append({
+                    "endpoint": endpoint,
+                    "statement": " ".join(statement.split()),
+                    "plan": plan,
+                    "full_scan": is_full_scan(statement, plan),
+                })
+            return results
+        finally:
+            connection.close()
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Check that the public queries do not scan the terms table.")
+    parser.add_argument("--size", type=int, default=DEFAULT_SIZE)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--verbose", action="store_true", help="print every plan, not only the failing ones")
+    args = parser.parse_args()
+
+    results = check_plans(args.size, args.seed)
+    failures = [result for result in results if result["full_scan"]]
+    for result in results:
+        if args.verbose or result["full_scan"]:
+            print(f"{'FULL SCAN' if result['full_scan'] else 'ok'} [{result['endpoint']}] {result['statement']}")
+            for line in result["plan"]:
+                print(f"    {line}")
+    print(f"{len(results)} statements explained, {len(failures)} full scans of terms")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
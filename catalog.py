@@ -0,0 +1,184 @@
+"""
+This file keeps a per-worker, read-only snapshot of the active terms and
+invalidates it when the catalog version stored in the database changes.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from types import MappingProxyType
+from typing import Any, Callable, Dict, Mapping, Optional, Tuple
+
+from flask import current_app
+from sqlalchemy import event, select, text
+from sqlalchemy.orm import Session
+
+from models import Term
+from storage import read_session
+
+# Default number of seconds during which a worker trusts its snapshot
+# without asking the database for the catalog version.
+DEFAULT_CHECK_INTERVAL = 0.5
+
+
+class CatalogSnapshot:
+    """
+    An immutable view of the active terms at a given catalog version.
+
+    Attributes:
+        version (int): The catalog version the snapshot was built from.
+        terms (tuple): The terms as dictionaries, sorted by english_term.
+        by_tid (Mapping): The same dictionaries, indexed by term ID.
+    """
+
+    __slots__ = ("version", "terms", "by_tid", "_derived", "_lock")
+
+    def __init__(self, version: int, terms: Tuple[Dict[str, Any], ...]) -> None:
+        self.version = version
+        self.terms = terms
+        self.by_tid: Mapping[int, Dict[str, Any]] = MappingProxyType(
+            {term["tid"]: term for term in terms}
+        )
+        self._derived: Dict[str, Any] = {}
+        self._lock = threading.Lock()
+
+    def derived(self, name: str, build: Callable[[CatalogSnapshot], Any]) -> Any:
+        """
+        Return a value computed from the snapshot, building it on first use.
+
+        Anything derived from the terms (serialized bodies, search indexes...)
+        is stored here, so it is dropped along with the snapshot when the
+        catalog changes.
+
+        Input:  name (str)          | the key of the derived value
+                build (Callable)    | computes the value from the snapshot
+        Output: the derived value
+        """
+        try:
+            return self._derived[name]
+        except KeyError:
+            pass
+
+        with self._lock:
+            if name not in self._derived:
+                self._derived[name] = build(self)
+            return self._derived[name]
+
+
+_snapshot: Optional[CatalogSnapshot] = None
+_checked_at: float = 0.0
+_rebuild_lock = threading.Lock()
+
+# Requests served by the current snapshot (hits) or after rebuilding it (misses)
+_stats: Dict[str, int] = {"hits": 0, "misses": 0}
+
+
+def get_catalog_version(session: Optional[Session] = None) -> int:
+    """
+    Read the current catalog version from the database.
+
+    Input:  session (Session)   | where to read it (default: the read session)
+    Output: the catalog version (0 if the table has not been initialized)
+    """
+    version = (session or read_session()).execute(
+        text("SELECT version FROM catalog_version WHERE id = 1")
+    ).scalar()
+    return version or 0
+
+
+def get_snapshot() -> CatalogSnapshot:
+    """
+    Return the snapshot of the active terms, rebuilding it if the catalog
+    version changed since it was built.
+
+    The version is read at most once every CATALOG_CHECK_INTERVAL seconds,
+    so edits made in any worker are seen by all of them within that delay.
+
+    Input:  Nothing
+    Output: the current CatalogSnapshot
+    """
+    global _snapshot, _checked_at
+
+    interval = current_app.config.get("CATALOG_CHECK_INTERVAL", DEFAULT_CHECK_INTERVAL)
+    snapshot = _snapshot
+    if snapshot is not None and time.monotonic() - _checked_at < interval:
+        _stats["hits"] += 1
+        return snapshot
+
+    with _rebuild_lock:
+        version = get_catalog_version()
+        _checked_at = time.monotonic()
+        if _snapshot is not None and _snapshot.version == version:
+            _stats["hits"] += 1
+        else:
+            _stats["misses"] += 1
+            # The version is read before the terms, so the snapshot is never
+            # older than the version it is labelled with
+            terms = read_session().execute(
+                select(Term).where(Term.is_active == True).order_by(Term.english_term, Term.tid)
+            ).scalars().all()
+            _snapshot = CatalogSnapshot(version, tuple(term.to_dict() for term in terms))
+            current_app.logger.info(
+                f"Catalog snapshot rebuilt: version {version}, {len(terms)} terms"
+            )
+        return _snapshot
+
+
+def snapshot_stats() -> Dict[str, int]:
+    """
+    Return the hit and miss counters of the snapshot of this process.
+    """
+    return dict(_stats)
+
+
+def bump_catalog_version(connection: Any) -> None:
+    """
+    Increment the catalog version, inside the caller's transaction.
+
+    Writers that bypass the ORM (raw SQL, bulk imports) must call this once
+    per transaction; ORM writes to Term are handled by the session hooks below.
+
+    Input:  connection | a SQLAlchemy Connection or Session
+    Output: Nothing
+    """
+    connection.execute(text("UPDATE catalog_version SET version = version + 1 WHERE id = 1"))
+
+
+def invalidate_snapshot() -> None:
+    """
+    Make the next get_snapshot() call check the catalog version right away.
+    """
+    global _checked_at
+    _checked_at = 0.0
+
+
+@event.listens_for(Session, "after_flush")
+def bump_version_on_term_changes(session: Session, flush_context: Any) -> None:
+    """
+    Bump the catalog version once per transaction that writes a Term.
+    """
+    if session.info.get("catalog_changed"):
+        return
+
+    changed = (*session.new, *session.dirty, *session.deleted)
+    if any(isinstance(instance, Term) for instance in changed):
+        bump_catalog_version(session.connection())
+        session.info["catalog_changed"] = True
+
+
+@event.listens_for(Session, "after_commit")
+def invalidate_after_term_commit(session: Session) -> None:
+    """
+    Let the committing worker see its own change on the next request.
+    """
+    if session.info.pop("catalog_changed", False):
+        invalidate_snapshot()
+
+
+@event.listens_for(Session, "after_rollback")
+def forget_rolled_back_changes(session: Session) -> None:
+    """
+    The version bump is rolled back along with the changes.
+    """
+    session.info.pop("catalog_changed", None)
@@ -0,0 +1,105 @@
+"""
+This file defines the Flask CLI commands of the application.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import time
+from typing import Any, Tuple
+
+import click
+from flask import Flask
+
+from exports import publish_exports
+from storage import publish_read_snapshot
+
+# Characters of a value shown in the import diff
+DIFF_WIDTH = 80
+
+
+def diff_excerpt(old: Any, new: Any) -> Tuple[str, str]:
+    """Return two values as JSON, cut around their first difference, for the import diff."""
+    from importer import comparable
+
+    old_text, new_text = (json.dumps(comparable(value), ensure_ascii=False) for value in (old, new))
+    start = 0
+    while start < min(len(old_text), len(new_text)) and old_text[start] == new_text[start]:
+        start += 1
+    start = max(0, start - DIFF_WIDTH // 4)
+    excerpts = []
+    for text in (old_text, new_text):
+        excerpt = text[start:start + DIFF_WIDTH]
+        excerpts.append(f"{'...' if start else ''}{excerpt}{'...' if start + DIFF_WIDTH < len(text) else ''}")
+    return excerpts[0], excerpts[1]
+
+
+def register_commands(app: Flask) -> None:
+    """Register all CLI commands."""
+
+    @app.cli.command("publish-exports")
+    def publish_exports_command() -> None:
+        """Write the JSON, CSV and XML exports of the current catalog version."""
+        click.echo(f"Exports published in {publish_exports()}")
+
+    @app.cli.command("publish-snapshot")
+    def publish_snapshot_command() -> None:
+        """Publish a read snapshot of the database (SQLITE_READ_MODE=immutable)."""
+        path = publish_read_snapshot()
+        if path is None:
+            click.echo("Read snapshots are only used when SQLITE_READ_MODE=immutable")
+        else:
+            click.echo(f"Read snapshot published in {path}")
+
+    @app.cli.command("import-fiches")
+    @click.argument("source", default=None, required=False)
+    @click.option("--dry-run", is_flag=True, help="Report the changes without writing them.")
+    @click.option("--workers", type=int, default=None, help="Parsing processes (default: one per CPU).")
+    @click.option("--quiet", is_flag=True, help="Only print the summary.")
+    def import_fiches_command(source: str, dry_run: bool, workers: int, quiet: bool) -> None:
+        """Import the .docx fiches of SOURCE (default: lesclassesdetermes/) into the terms."""
+        from app import db
+        from importer import DEFAULT_SOURCE, find_documents, parse_documents, plan_import, upsert_terms
+
+        started = time.perf_counter()
+        paths = find_documents(source or os.path.join(app.root_path, DEFAULT_SOURCE))
+        if not paths:
+            raise click.ClickException(f"No .docx file found in {source or DEFAULT_SOURCE}")
+        fiches = parse_documents(paths, workers)
+        parsed = time.perf_counter()
+
+        with db.engine.begin() as connection:
+            plan = plan_import(connection, fiches)
+            if not dry_run:
+                upsert_terms(connection, plan.rows)
+
+        if not quiet:
+            for source_name, term in plan.created:
+                click.echo(f"+ {term} [{source_name}]")
+            for source_name, term, changes in plan.changed:
+                click.echo(f"~ {term} [{source_name}]")
+                for column, (old, new) in changes.items():
+                    old_excerpt, new_excerpt = diff_excerpt(old, new)
+                    click.echo(f"    {column}: {old_excerpt}")
+                    click.echo(f"    {' ' * len(column)}  {new_excerpt}")
+            for conflict in plan.conflicts:
+                click.echo(f"! conflict, skipped: {conflict}")
+            for duplicate in plan.duplicates:
+                click.echo(f"! duplicate, skipped: {duplicate}")
+            for term in plan.missing:
+                click.echo(f"? not in any fiche, left as is: {term}")
+
+        click.echo(
+            f"{len(fiches)} fiches in {len(paths)} files parsed in {parsed - started:.2f}s: "
+            f"{len(plan.created)} new, {len(plan.changed)} changed, {plan.unchanged} unchanged, "
+            f"{len(plan.conflicts)} conflicts, {len(plan.duplicates)} duplicates, "
+            f"{len(plan.missing)} terms without a fiche"
+        )
+        if dry_run:
+            click.echo("Dry run: nothing was written")
+            return
+        if plan.rows:
+            publish_read_snapshot()
+            publish_exports()
+        click.echo(f"{len(plan.rows)} terms written in {time.perf_counter() - started:.2f}s")
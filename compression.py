@@ -0,0 +1,134 @@
+"""
+This file contains the gzip/deflate compression of the API and HTML responses.
+"""
+
+from __future__ import annotations
+
+import gzip
+import threading
+import zlib
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+
+from flask import Flask, Response, request
+
+# Responses smaller than this many bytes are sent uncompressed
+DEFAULT_MIN_SIZE = 1024
+
+# Number of compressed bodies kept in memory
+DEFAULT_CACHE_SIZE = 32
+
+COMPRESSIBLE_MIMETYPES = {
+    "application/json",
+    "application/x-ndjson",
+    "application/xml",
+    "application/javascript",
+    "text/html",
+    "text/css",
+    "text/csv",
+    "text/plain",
+    "text/javascript",
+}
+
+
+class CompressedBodyCache:
+    """
+    A bounded LRU cache of compressed bodies, keyed by (strong ETag, encoding).
+
+    A strong ETag identifies the exact bytes of a body, so an entry can never
+    be stale: a new catalog version simply produces new keys.
+    """
+
+    def __init__(self, size: int) -> None:
+        self.size = size
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[Tuple[str, str], bytes] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Tuple[str, str]) -> Optional[bytes]:
+        """Return the cached body, or None."""
+        with self._lock:
+            body = self._entries.get(key)
+            if body is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return body
+
+    def put(self, key: Tuple[str, str], body: bytes) -> None:
+        """Store a body, evicting the least recently used ones."""
+        with self._lock:
+            self._entries[key] = body
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.size:
+                self._entries.popitem(last=False)
+
+    def stats(self) -> Dict[str, int]:
+        """Return the hit and miss counters and the number of entries."""
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "entries": len(self._entries)}
+
+
+def compress(data: bytes, encoding: str) -> bytes:
+    """
+    Compress a body with the given content coding.
+
+    gzip bodies are written with a zero timestamp, so the same input always
+    gives the same bytes.
+
+    Input:  data (bytes)    | the body
+            encoding (str)  | "gzip" or "deflate"
+    Output: the compressed body
+    """
+    if encoding == "gzip":
+        return gzip.compress(data, compresslevel=6, mtime=0)
+    return zlib.compress(data, 6)
+
+
+def init_compression(app: Flask) -> None:
+    """
+    Compress the responses of the application according to Accept-Encoding.
+
+    Configuration:
+        COMPRESS_MIN_SIZE (int): smallest body worth compressing.
+        COMPRESS_CACHE_SIZE (int): number of compressed bodies cached.
+    """
+    min_size = app.config.get("COMPRESS_MIN_SIZE", DEFAULT_MIN_SIZE)
+    cache = CompressedBodyCache(app.config.get("COMPRESS_CACHE_SIZE", DEFAULT_CACHE_SIZE))
+    app.extensions["compression_cache"] = cache
+
+    @app.after_request
+    def compress_response(response: Response) -> Response:
+        # Streamed bodies, files sent with send_file and bodies that are
+        # already encoded (precompressed exports) are left alone
+        if (
+            response.status_code != 200
+            or response.direct_passthrough
+            or response.is_streamed
+            or response.content_encoding
+            or response.mimetype not in COMPRESSIBLE_MIMETYPES
+        ):
+            return response
+
+        response.vary.add("Accept-Encoding")
+        encoding = request.accept_encodings.best_match(["gzip", "deflate"])
+        if encoding is None or (response.content_length or 0) < min_size:
+            return response
+
+        etag, weak = response.get_etag()
+        cacheable = etag is not None and not weak
+        body = cache.get((etag, encoding)) if cacheable else None
+        if body is None:
+            body = compress(response.get_data(), encoding)
+            if cacheable:
+                cache.put((etag, encoding), body)
+
+        response.set_data(body)
+        response.content_encoding = encoding
+        if cacheable:
+            # Each representation of the resource has its own strong ETag
+            response.set_etag(f"{etag}-{encoding}")
+            response.make_conditional(request)
+        return response
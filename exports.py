@@ -0,0 +1,307 @@
+"""
+This file contains the streaming serializers used to dump the whole glossary.
+"""
+
+from __future__ import annotations
+
+import csv
+import gzip
+import json
+import os
+import shutil
+import tempfile
+from io import StringIO
+from typing import Any, Callable, Dict, Iterator, Optional
+from xml.sax.saxutils import XMLGenerator
+
+from flask import Response, current_app, request, send_file
+from sqlalchemy import select
+
+from catalog import get_catalog_version
+from models import Term
+from paging import PUBLIC_FIELDS
+from storage import read_session
+
+# Number of rows fetched from the database at a time
+STREAM_BATCH_SIZE = 200
+
+# Name of the published files, by format
+EXPORT_FILENAMES: Dict[str, str] = {
+    "json": "glotecht_terms.json",
+    "csv": "glotecht_terms.csv",
+    "xml": "glotecht_terms.xml",
+}
+
+EXPORT_MIMETYPES: Dict[str, str] = {
+    "json": "application/json",
+    "csv": "text/csv",
+    "xml": "application/xml",
+}
+
+# Number of published versions kept in instance/exports
+EXPORTS_KEPT = 3
+
+# Level of the precompressed exports; 9 takes several times longer for a few percent
+EXPORT_GZIP_LEVEL = 6
+
+
+def iter_active_terms(batch_size: int = STREAM_BATCH_SIZE) -> Iterator[Dict[str, Any]]:
+    """
+    Read the active terms ordered by english_term, one batch at a time.
+
+    Rows are fetched with yield_per and serialized one by one, so memory use
+    does not depend on the size of the glossary.
+
+    Input:  batch_size (int)    | the number of rows fetched at a time
+    Output: an iterator over the terms as dictionaries
+    """
+    statement = (
+        select(Term)
+        .where(Term.is_active == True)
+        .order_by(Term.english_term, Term.tid)
+        .execution_options(yield_per=batch_size)
+    )
+    session = read_session()
+    for term in session.execute(statement).scalars():
+        yield term.to_dict()
+        # Drop the instance so the identity map does not keep every row alive
+        session.expunge(term)
+
+
+def ndjson_lines(terms: Iterator[Dict[str, Any]]) -> Iterator[str]:
+    """
+    Serialize terms as newline-delimited JSON, one term per line.
+
+    Input:  terms (Iterator[Dict])  | the terms as dictionaries
+    Output: an iterator over the lines
+    """
+    for term in terms:
+        yield f"{current_app.json.dumps(term)}\n"
+
+
+def json_array_chunks(terms: Iterator[Dict[str, Any]]) -> Iterator[str]:
+    """
+    Serialize terms as a single JSON array, written one element at a time.
+
+    Input:  terms (Iterator[Dict])  | the terms as dictionaries
+    Output: an iterator over the chunks of the array
+    """
+    separator = "["
+    for term in terms:
+        yield f"{separator}{current_app.json.dumps(term)}"
+        separator = ","
+    yield "[]\n" if separator == "[" else "]\n"
+
+
+def csv_cell(value: Any) -> Any:
+    """
+    Convert a term value into a CSV cell.
+
+    Lists and dictionaries (subdomains, lexical relations...) are written as
+    JSON so they can be parsed back; None becomes an empty cell.
+
+    Input:  value (Any) | the value of a Term column
+    Output: the value of the cell
+    """
+    if value is None:
+        return ""
+    if isinstance(value, (list, dict)):
+        return json.dumps(value, ensure_ascii=False)
+    return value
+
+
+def csv_lines(terms: Iterator[Dict[str, Any]]) -> Iterator[str]:
+    """
+    Serialize terms as CSV, one line at a time, with a header line first.
+
+    Input:  terms (Iterator[Dict])  | the terms as dictionaries
+    Output: an iterator over the lines
+    """
+    buffer = StringIO()
+    writer = csv.writer(buffer)
+
+    def flush() -> str:
+        line = buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+        return line
+
+    writer.writerow(PUBLIC_FIELDS)
+    yield flush()
+    for term in terms:
+        writer.writerow([csv_cell(term.get(field)) for field in PUBLIC_FIELDS])
+        yield flush()
+
+
+def write_xml_value(generator: XMLGenerator, name: str, value: Any, attributes: Dict[str, str]) -> None:
+    """
+    Write a value as an XML element, escaping its text.
+
+    Lists become one <item> per element and dictionaries one
+    <entry key="..."> per key, recursively; booleans are "true"/"false".
+
+    Input:  generator (XMLGenerator)    | the writer
+            name (str)                  | the element name
+            value (Any)                 | the value to write
+            attributes (Dict[str, str]) | the attributes of the element
+    Output: Nothing
+    """
+    generator.startElement(name, attributes)
+    if isinstance(value, list):
+        for item in value:
+            write_xml_value(generator, "item", item, {})
+    elif isinstance(value, dict):
+        for key, item in value.items():
+            write_xml_value(generator, "entry", item, {"key": str(key)})
+    elif isinstance(value, bool):
+        generator.characters("true" if value else "false")
+    elif value is not None:
+        generator.characters(str(value))
+    generator.endElement(name)
+
+
+def xml_chunks(terms: Iterator[Dict[str, Any]]) -> Iterator[str]:
+    """
+    Serialize terms as an XML document, one <term> element at a time.
+
+    Empty values (None, "", [] and {}) are left out of the <term> element.
+
+    Input:  terms (Iterator[Dict])  | the terms as dictionaries
+    Output: an iterator over the chunks of the document
+    """
+    buffer = StringIO()
+    generator = XMLGenerator(buffer, encoding="utf-8", short_empty_elements=True)
+
+    def flush() -> str:
+        chunk = buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+        return chunk
+
+    generator.startDocument()
+    generator.startElement("terms", {})
+    generator.ignorableWhitespace("\n")
+    yield flush()
+    for term in terms:
+        generator.startElement("term", {})
+        for key, value in term.items():
+            if value is None or value == "" or value == [] or value == {}:
+                continue
+            write_xml_value(generator, key, value, {})
+        generator.endElement("term")
+        generator.ignorableWhitespace("\n")
+        yield flush()
+    generator.endElement("terms")
+    generator.endDocument()
+    yield flush() + "\n"
+
+
+# Serializer of each published format
+EXPORT_SERIALIZERS: Dict[str, Callable[[Iterator[Dict[str, Any]]], Iterator[str]]] = {
+    "json": json_array_chunks,
+    "csv": csv_lines,
+    "xml": xml_chunks,
+}
+
+
+def exports_root() -> str:
+    """
+    Return the directory holding the published exports (instance/exports).
+    """
+    return os.path.join(current_app.instance_path, "exports")
+
+
+def published_export(version: int, export_format: str) -> Optional[str]:
+    """
+    Return the path of a published export, if it exists.
+
+    Input:  version (int)       | the catalog version
+            export_format (str) | one of the keys of EXPORT_FILENAMES
+    Output: the path of the uncompressed file, or None if not published
+    """
+    path = os.path.join(exports_root(), str(version), EXPORT_FILENAMES[export_format])
+    return path if os.path.isfile(path) else None
+
+
+def write_export(path: str, chunks: Iterator[str]) -> None:
+    """
+    Write an export and its gzip variant in a single pass over the terms.
+
+    Input:  path (str)              | the path of the uncompressed file
+            chunks (Iterator[str])  | the serialized document
+    Output: Nothing
+    """
+    with open(path, "wb") as plain, gzip.open(f"{path}.gz", "wb", compresslevel=EXPORT_GZIP_LEVEL) as compressed:
+        for chunk in chunks:
+            data = chunk.encode("utf-8")
+            plain.write(data)
+            compressed.write(data)
+
+
+def publish_exports() -> str:
+    """
+    Write every export format for the current catalog version into
+    instance/exports/<version>/, and drop the oldest published versions.
+
+    The files are written in a temporary directory which is then renamed,
+    so the export routes never see a partially written version.
+
+    Input:  Nothing
+    Output: the directory of the published version
+    """
+    version = get_catalog_version()
+    root = exports_root()
+    target = os.path.join(root, str(version))
+    if os.path.isdir(target):
+        return target
+
+    os.makedirs(root, exist_ok=True)
+    staging = tempfile.mkdtemp(prefix=f".{version}-", dir=root)
+    os.chmod(staging, 0o755)
+    try:
+        for export_format, filename in EXPORT_FILENAMES.items():
+            serialize = EXPORT_SERIALIZERS[export_format]
+            write_export(os.path.join(staging, filename), serialize(iter_active_terms()))
+        os.rename(staging, target)
+    except BaseException:
+        shutil.rmtree(staging, ignore_errors=True)
+        # Another process may have published the same version first
+        if not os.path.isdir(target):
+            raise
+
+    versions = sorted(int(name) for name in os.listdir(root) if name.isdigit())
+    for old in versions[:-EXPORTS_KEPT]:
+        shutil.rmtree(os.path.join(root, str(old)), ignore_errors=True)
+
+    return target
+
+
+def send_published_export(version: int, export_format: str) -> Optional[Response]:
+    """
+    Serve a published export as an attachment, without touching the database.
+
+    Clients accepting gzip get the precompressed file with
+    Content-Encoding: gzip. send_file() handles conditional and Range
+    requests and lets the WSGI server use sendfile.
+
+    Input:  version (int)       | the catalog version
+            export_format (str) | one of the keys of EXPORT_FILENAMES
+    Output: the response, or None if this version has not been published
+    """
+    path = published_export(version, export_format)
+    if path is None:
+        return None
+
+    options = {
+        "mimetype": EXPORT_MIMETYPES[export_format],
+        "as_attachment": True,
+        "download_name": EXPORT_FILENAMES[export_format],
+    }
+    if request.accept_encodings["gzip"] and os.path.isfile(f"{path}.gz"):
+        response = send_file(f"{path}.gz", **options)
+        response.content_encoding = "gzip"
+    else:
+        response = send_file(path, **options)
+
+    response.vary.add("Accept-Encoding")
+    return response
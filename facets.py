@@ -0,0 +1,98 @@
+"""
+This file contains the facet index used to count terms per subdomain, domain
+and semantic label.
+"""
+
+from __future__ import annotations
+
+from collections import Counter
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from catalog import CatalogSnapshot
+
+# Term columns counted by /api/terms/facets; the subdomain columns are lists
+FACET_FIELDS: Tuple[str, ...] = (
+    "subdomains_en",
+    "subdomains_fr",
+    "domain_en",
+    "domain_fr",
+    "semantic_label_en",
+    "semantic_label_fr",
+)
+
+
+class FacetIndex:
+    """
+    The facet values of every active term, and their counts over the whole catalog.
+
+    Attributes:
+        values (Dict[int, Dict[str, Tuple[str, ...]]]): facet values by term ID.
+        totals (Dict[str, Counter]): counts over every active term, by facet.
+    """
+
+    def __init__(self, snapshot: CatalogSnapshot) -> None:
+        self.values: Dict[int, Dict[str, Tuple[str, ...]]] = {}
+        self.totals: Dict[str, Counter] = {field: Counter() for field in FACET_FIELDS}
+
+        for term in snapshot.terms:
+            term_values = {field: facet_values(term.get(field)) for field in FACET_FIELDS}
+            self.values[term["tid"]] = term_values
+            for field, values in term_values.items():
+                self.totals[field].update(values)
+
+    def count(self, tids: Optional[Iterable[int]] = None) -> Dict[str, Counter]:
+        """
+        Count the facet values of the given terms.
+
+        Input:  tids (Iterable[int])    | the matching term IDs, or None for every term
+        Output: the counts, by facet
+        """
+        if tids is None:
+            return self.totals
+
+        counts: Dict[str, Counter] = {field: Counter() for field in FACET_FIELDS}
+        for tid in tids:
+            term_values = self.values.get(tid)
+            if term_values is None:
+                continue
+            for field, values in term_values.items():
+                counts[field].update(values)
+        return counts
+
+
+def facet_values(value: Any) -> Tuple[str, ...]:
+    """
+    Return the distinct, non-empty facet values of a column value.
+
+    Input:  value (Any) | a string, a list of strings or None
+    Output: the values, each counted once per term
+    """
+    if isinstance(value, list):
+        return tuple(dict.fromkeys(item.strip() for item in value if isinstance(item, str) and item.strip()))
+    if isinstance(value, str) and value.strip():
+        return (value.strip(),)
+    return ()
+
+
+def get_facet_index(snapshot: CatalogSnapshot) -> FacetIndex:
+    """
+    Return the facet index of a snapshot, building it once per catalog version.
+    """
+    return snapshot.derived("facets", FacetIndex)
+
+
+def facets_payload(counts: Dict[str, Counter], total: int) -> Dict[str, Any]:
+    """
+    Format facet counts for the API, most frequent values first.
+
+    Input:  counts (Dict[str, Counter]) | the counts, by facet
+            total (int)                 | the number of matching terms
+    Output: the JSON-serializable payload
+    """
+    facets: Dict[str, List[Dict[str, Any]]] = {}
+    for field, counter in counts.items():
+        facets[field] = [
+            {"value": value, "count": count}
+            for value, count in sorted(counter.items(), key=lambda item: (-item[1], item[0]))
+        ]
+    return {"total": total, "facets": facets}
@@ -0,0 +1,149 @@
+"""
+This file contains the character-trigram index behind typo-tolerant searches.
+"""
+
+from __future__ import annotations
+
+from collections import defaultdict
+from typing import Dict, List, Set, Tuple
+
+from catalog import CatalogSnapshot
+from normalize import fold
+
+# Term columns covered by the fuzzy search
+FUZZY_FIELDS: Tuple[str, ...] = (
+    "english_term",
+    "french_term",
+    "variant_en",
+    "variant_fr",
+    "synonym_en",
+    "synonym_fr",
+)
+
+# Smallest Dice similarity between the query and a candidate word
+DEFAULT_THRESHOLD = 0.45
+
+# Number of terms returned by a fuzzy search
+DEFAULT_FUZZY_LIMIT = 20
+
+
+def trigrams(word: str) -> Set[str]:
+    """
+    Return the character trigrams of a word, padded so that its start and end count.
+
+    "chain" -> {"  c", " ch", "cha", "hai", "ain", "in "}
+
+    Input:  word (str)  | a folded word
+    Output: the set of trigrams
+    """
+    padded = f"  {word} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class TrigramIndex:
+    """
+    An inverted index from trigram to the words containing it, and from word to terms.
+
+    Words rather than whole labels are indexed, so "blokchain" can be matched
+    against "blockchain" inside "token-based blockchain".
+
+    Attributes:
+        postings (Dict[str, List[int]]): word numbers by trigram.
+        words (List[str]): the distinct folded words.
+        word_trigram_counts (List[int]): the number of trigrams of each word.
+        word_terms (List[Set[int]]): the term IDs containing each word.
+    """
+
+    def __init__(self, snapshot: CatalogSnapshot) -> None:
+        numbers: Dict[str, int] = {}
+        self.words: List[str] = []
+        self.word_terms: List[Set[int]] = []
+        self.word_trigram_counts: List[int] = []
+        postings: Dict[str, List[int]] = defaultdict(list)
+
+        for term in snapshot.terms:
+            for field in FUZZY_FIELDS:
+                for word in split_words(term.get(field)):
+                    number = numbers.get(word)
+                    if number is None:
+                        number = numbers[word] = len(self.words)
+                        self.words.append(word)
+                        self.word_terms.append(set())
+                        grams = trigrams(word)
+                        self.word_trigram_counts.append(len(grams))
+                        for gram in grams:
+                            postings[gram].append(number)
+                    self.word_terms[number].add(term["tid"])
+
+        self.postings = dict(postings)
+
+    def similar_words(self, word: str, threshold: float = DEFAULT_THRESHOLD) -> Dict[int, float]:
+        """
+        Find the indexed words similar to a word.
+
+        Only the words sharing at least one trigram with it are looked at,
+        through the postings lists; the score is the Dice coefficient
+        2 * shared / (trigrams of word + trigrams of candidate).
+
+        Input:  word (str)          | a folded query word
+                threshold (float)   | the smallest score kept
+        Output: the scores, by word number
+        """
+        grams = trigrams(word)
+        shared: Dict[int, int] = defaultdict(int)
+        for gram in grams:
+            for number in self.postings.get(gram, ()):
+                shared[number] += 1
+
+        scores = {}
+        for number, count in shared.items():
+            score = 2 * count / (len(grams) + self.word_trigram_counts[number])
+            if score >= threshold:
+                scores[number] = score
+        return scores
+
+    def search(self, query: str, limit: int = DEFAULT_FUZZY_LIMIT, threshold: float = DEFAULT_THRESHOLD) -> List[int]:
+        """
+        Return the terms whose words best match the words of the query.
+
+        Every query word adds the score of its best match in a term, so terms
+        matching all the words of a multi-word query rank first.
+
+        Input:  query (str)         | the raw user query
+                limit (int)         | the maximum number of term IDs
+                threshold (float)   | the smallest word similarity kept
+        Output: the term IDs, best match first
+        """
+        term_scores: Dict[int, float] = defaultdict(float)
+        for word in split_words(query):
+            best: Dict[int, float] = {}
+            for number, score in self.similar_words(word, threshold).items():
+                for tid in self.word_terms[number]:
+                    if score > best.get(tid, 0.0):
+                        best[tid] = score
+            for tid, score in best.items():
+                term_scores[tid] += score
+
+        ranked = sorted(term_scores.items(), key=lambda item: (-item[1], item[0]))
+        return [tid for tid, _ in ranked[:limit]]
+
+
+def split_words(value: str) -> List[str]:
+    """
+    Fold a value and split it into words of at least three characters.
+
+    Input:  value (str) | the text, or None
+    Output: the folded words
+    """
+    folded = fold(value) if value else None
+    if not folded:
+        return []
+    words = "".join(char if char.isalnum() else " " for char in folded).split()
+    return [word for word in words if len(word) >= 3]
+
+
+def get_trigram_index(snapshot: CatalogSnapshot) -> TrigramIndex:
+    """
+    Return the trigram index of a snapshot, building it once per catalog version.
+    """
+    return snapshot.derived("trigrams", TrigramIndex)
@@ -1,16 +1,47 @@
+"""
+This file configures gunicorn.
+
+Two profiles are supported, selected with GUNICORN_PROFILE:
+    sync    | one request at a time per worker, cpu_count * 2 + 1 workers (default)
+    gthread | GUNICORN_THREADS threads per worker, cpu_count + 1 workers; the
+              database sessions are scoped to the request's app context and the
+              catalog caches are guarded by locks, so they are thread-safe
+
+The read tier can run the public application only, without the admin
+interface: gunicorn -c gunicorn_config.py run_public:flask_app
+
+Set METRICS_DIR to a directory shared by the workers so that /metrics
+aggregates all of them; it is emptied when gunicorn starts.
+
+The application is preloaded (GUNICORN_PRELOAD=0 to disable): it is imported
+and warmed up once in the master, then shared copy-on-write by the workers.
+"""
+
+import gc
 import multiprocessing
+import os
+
+profile = os.getenv("GUNICORN_PROFILE", "sync")
 
 # Server socket
 bind = "0.0.0.0:10000"
 backlog = 2048
 
 # Worker processes
-workers = multiprocessing.cpu_count() * 2 + 1
-worker_class = 'sync'
+if profile == "gthread":
+    workers = multiprocessing.cpu_count() + 1
+    worker_class = 'gthread'
+    threads = int(os.getenv("GUNICORN_THREADS", "4"))
+else:
+    workers = multiprocessing.cpu_count() * 2 + 1
+    worker_class = 'sync'
 worker_connections = 1000
 timeout = 30
 keepalive = 2
 
+# Load the application once in the master
+preload_app = os.getenv("GUNICORN_PRELOAD", "1") == "1"
+
 # Logging
 accesslog = '-'
 errorlog = '-'
@@ -21,4 +52,40 @@ proc_name = 'glotecht'
 
 # SSL
 keyfile = None
-certfile = None 
\ No newline at end of file
+certfile = None
+
+
+def on_starting(server):
+    """Drop the metrics files of a previous run."""
+    directory = os.getenv("METRICS_DIR")
+    if directory and os.path.isdir(directory):
+        for name in os.listdir(directory):
+            if name.startswith("metrics-"):
+                os.remove(os.path.join(directory, name))
+
+
+def when_ready(server):
+    """Warm the caches up in the master, before any worker is forked."""
+    if preload_app:
+        from warmup import warm_up
+
+        warm_up(server.app.wsgi())
+        # Keep the warm objects out of the collector, so that collections
+        # in the workers do not touch (and copy) their memory pages
+        gc.freeze()
+
+
+def post_fork(server, worker):
+    """Give each worker its own database connections."""
+    if preload_app:
+        from warmup import reset_connections
+
+        reset_connections(worker.app.wsgi())
+
+
+def post_worker_init(worker):
+    """Warm the caches up in each worker when the application is not preloaded."""
+    if not preload_app:
+        from warmup import warm_up
+
+        warm_up(worker.app.wsgi())
@@ -0,0 +1,897 @@
+"""
+This file imports the terminology fiches of lesclassesdetermes/ into the terms table.
+
+Each .docx file is read directly as a zip archive of WordprocessingML: a
+fiche is a two-column table (English, French) whose first row holds the
+term and its semantic label, followed by section rows ("Definition",
+"Context", "Lexical Relations"...) and their content. The files are parsed
+in parallel, the fiches are matched with the existing terms by their folded
+English (then French) term, and the changes are written by upsert_terms()
+in batched executemany transactions.
+
+The same writer serves the admin bulk endpoint: NDJSON or CSV rows shaped
+like Term.to_dict() are validated as they are read and upserted in chunks
+by bulk_upsert().
+"""
+
+from __future__ import annotations
+
+import csv
+import glob
+import html
+import json
+import os
+import re
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+from xml.etree import ElementTree
+
+from sqlalchemy import JSON, func, select
+from sqlalchemy.dialects.sqlite import insert
+from sqlalchemy.exc import IntegrityError
+
+from catalog import bump_catalog_version
+from models import Term, TermSubdomain, term_subdomain_rows
+from normalize import TAG_PATTERN, fold
+
+W = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+
+DEFAULT_SOURCE = "lesclassesdetermes"
+
+# Rows written per executemany statement
+UPSERT_BATCH_SIZE = 500
+
+DOMAIN = ("Disruptive Technologies", "Technologies transformatrices")
+
+# Folded subdomain of a file name ("[IA & Big data]"): (English, French)
+SUBDOMAINS: Dict[str, Tuple[str, str]] = {
+    "ia": ("Artificial Intelligence", "Intelligence Artificielle"),
+    "big data": ("Big Data", "Big Data"),
+    "blockchain": ("Blockchain", "Blockchain"),
+}
+
+# Folded English section label: (column prefix, kind)
+SECTIONS: Dict[str, Tuple[str, str]] = {
+    "variant": ("variant", "text"),
+    "synonym": ("synonym", "text"),
+    "near synonym": ("near_synonym", "text"),
+    "quasi-synonym": ("near_synonym", "text"),
+    "definition": ("definition", "text"),
+    "syntactic cooccurrence": ("syntactic_cooccurrence", "list"),
+    "lexical relations": ("lexical_relations", "relations"),
+    "lexical cooccurrence": ("lexical_relations", "relations"),
+    "note": ("note", "text"),
+    "not to be confused with": ("not_to_be_confused_with", "list"),
+    "frequent expressions": ("frequent_expression", "list"),
+    "frequent expression": ("frequent_expression", "list"),
+    "frequent terms": ("frequent_expression", "list"),
+    "phraseology": ("phraseology", "text"),
+    "context": ("context", "text"),
+}
+
+# Abbreviated lexical relation labels, spelled as in the existing terms
+RELATION_LABELS: Dict[str, Tuple[str, str]] = {
+    "gen": ("Generic Term", "Terme Générique"),
+    "gener": ("Generic Term", "Terme Générique"),
+    "generic term": ("Generic Term", "Terme Générique"),
+    "generic noun": ("Generic Term", "Terme Générique"),
+}
+
+# Largest font size (half-points) of a homonym number typed after a term instead of a subscript
+HOMONYM_FONT_SIZE = 18
+
+# Run properties rendered as inline markup, outermost first
+MARKUP_TAGS = ("b", "em", "u", "sub", "sup")
+
+EMPTY_TAG_PATTERN = re.compile(r"<(\w+)>(\s*)</\1>")
+CLOSING_SPACE_PATTERN = re.compile(r"(\s+)(</\w+>)")
+OPENING_SPACE_PATTERN = re.compile(r"(<\w+>)(\s+)")
+SUBDOMAIN_PATTERN = re.compile(r"\[([^\]]+)\]")
+# The quoted semantic label, without what follows it ("‘action on data’ [AI]")
+LABEL_PATTERN = re.compile(r"[‘'].*[’']|[‘'].*$", re.S)
+
+# Values the admin editor stores for an empty field
+EMPTY_VALUES = (None, "", "<br />", "<br>", [], {})
+
+
+class Fiche:
+    """
+    A term parsed from a fiche table.
+
+    Attributes:
+        source (str): The file name and table number, for the reports.
+        values (dict): The Term columns filled by the fiche.
+    """
+
+    def __init__(self, source: str) -> None:
+        self.source = source
+        self.values: Dict[str, Any] = {}
+
+
+class ImportPlan:
+    """
+    The changes an import would make, computed without writing anything.
+
+    Attributes:
+        rows (list): The full rows to upsert, new and changed terms.
+        created (list): (source, english_term) of the new terms.
+        changed (list): (source, english_term, {column: (old, new)}) of the changed terms.
+        unchanged (int): The number of fiches identical to their term.
+        conflicts (list): Fiches matching two different terms, which are skipped.
+        duplicates (list): Fiches of a term already seen in an earlier file, which are skipped.
+        missing (list): Active terms found in no fiche (left untouched).
+    """
+
+    def __init__(self) -> None:
+        self.rows: List[Dict[str, Any]] = []
+        self.created: List[Tuple[str, str]] = []
+        self.changed: List[Tuple[str, str, Dict[str, Tuple[Any, Any]]]] = []
+        self.unchanged = 0
+        self.conflicts: List[str] = []
+        self.duplicates: List[str] = []
+        self.missing: List[str] = []
+
+
+def run_size(run: ElementTree.Element) -> Optional[int]:
+    """
+    Return the font size of a run, in half-points, if set on the run.
+    """
+    size = run.find(f"{W}rPr/{W}sz")
+    return int(size.get(f"{W}val")) if size is not None and (size.get(f"{W}val") or "").isdigit() else None
+
+
+def run_markup(run: ElementTree.Element) -> Tuple[str, ...]:
+    """
+    Return the inline markup of a run (bold, italic, underline, subscript...).
+    """
+    properties = run.find(f"{W}rPr")
+    if properties is None:
+        return ()
+    tags = []
+    for name, tag in (("b", "b"), ("i", "em"), ("u", "u")):
+        element = properties.find(f"{W}{name}")
+        if element is not None and element.get(f"{W}val", "true") not in ("0", "false", "none"):
+            tags.append(tag)
+    alignment = properties.find(f"{W}vertAlign")
+    if alignment is not None:
+        tags.append({"subscript": "sub", "superscript": "sup"}.get(alignment.get(f"{W}val"), ""))
+    return tuple(tag for tag in MARKUP_TAGS if tag in tags)
+
+
+def paragraph_html(paragraph: ElementTree.Element, allowed: Tuple[str, ...] = MARKUP_TAGS) -> str:
+    """
+    Render a paragraph as escaped text with the allowed inline markup, properly nested.
+
+    Input:  paragraph (Element)     | a w:p element
+            allowed (tuple)         | the tags to keep
+    Output: the HTML of the paragraph, stripped
+    """
+    parts: List[str] = []
+    opened: List[str] = []
+    for run in paragraph.iter(f"{W}r"):
+        text = "".join(
+            "\n" if node.tag == f"{W}br" else "\t" if node.tag == f"{W}tab" else node.text or ""
+            for node in run
+            if node.tag in (f"{W}t", f"{W}br", f"{W}tab")
+        )
+        if not text:
+            continue
+        markup = run_markup(run)
+        size = run_size(run)
+        # Homonym numbers are often typed in a small font instead of as subscripts ("MINE1")
+        if (
+            text.strip().isdigit() and size is not None and size <= HOMONYM_FONT_SIZE
+            and parts and parts[-1][-1:].isalpha() and "sup" not in markup
+        ):
+            markup = tuple(tag for tag in MARKUP_TAGS if tag in (*markup, "sub"))
+        if "sub" in markup and text != text.rstrip():
+            # Keep the space after a homonym number out of the subscript
+            text, tail = text.rstrip(), text[len(text.rstrip()):]
+        else:
+            tail = ""
+        if text.strip():
+            tags = [tag for tag in markup if tag in allowed]
+        else:
+            # Spaces take the markup around them, but never a subscript
+            tags = [tag for tag in opened if tag not in ("sub", "sup")]
+        # Close the tags this run does not have, and every tag opened after them
+        keep = 0
+        while keep < len(opened) and opened[keep] in tags:
+            keep += 1
+        for tag in reversed(opened[keep:]):
+            parts.append(f"</{tag}>")
+        del opened[keep:]
+        for tag in tags:
+            if tag not in opened:
+                parts.append(f"<{tag}>")
+                opened.append(tag)
+        parts.append(html.escape(text, quote=False))
+        if tail:
+            for tag in reversed(opened):
+                parts.append(f"</{tag}>")
+            opened.clear()
+            parts.append(tail)
+    for tag in reversed(opened):
+        parts.append(f"</{tag}>")
+    result = EMPTY_TAG_PATTERN.sub(r"\2", "".join(parts))
+    # "<u>expert </u>" -> "<u>expert</u> "
+    while True:
+        moved = OPENING_SPACE_PATTERN.sub(r"\2\1", CLOSING_SPACE_PATTERN.sub(r"\2\1", result))
+        if moved == result:
+            return result.strip()
+        result = moved
+
+
+def cell_paragraphs(cell: ElementTree.Element, allowed: Tuple[str, ...] = MARKUP_TAGS) -> List[str]:
+    """
+    Return the non-empty paragraphs of a table cell, as HTML.
+    """
+    paragraphs = (paragraph_html(paragraph, allowed) for paragraph in cell.findall(f"{W}p"))
+    return [paragraph for paragraph in paragraphs if paragraph]
+
+
+def cell_blocks(cell: ElementTree.Element) -> List[List[str]]:
+    """
+    Return the paragraphs of a table cell grouped by the empty paragraphs between them.
+    """
+    blocks: List[List[str]] = [[]]
+    for paragraph in cell.findall(f"{W}p"):
+        html_paragraph = paragraph_html(paragraph)
+        if html_paragraph:
+            blocks[-1].append(html_paragraph)
+        elif blocks[-1]:
+            blocks.append([])
+    return [block for block in blocks if block]
+
+
+def cell_text(cell: ElementTree.Element) -> str:
+    """
+    Return the plain text of a table cell.
+    """
+    return " ".join("".join(node.text or "" for node in cell.iter(f"{W}t")).split())
+
+
+def section_key(label: str) -> str:
+    """
+    Fold a section label: "Lexical Relations  :" -> "lexical relations".
+    """
+    return (fold(label) or "").rstrip(" :")
+
+
+def parse_header(cell: ElementTree.Element) -> Tuple[Optional[str], Optional[str]]:
+    """
+    Split the first cell of a fiche into the term and its semantic label.
+
+    Input:  cell (Element)  | "GAS, N. sg. tant." then "‘unit of measurement’"
+    Output: the term (with its subscripts) and the quoted label, or None
+    """
+    paragraphs = cell_paragraphs(cell, allowed=("sub", "sup"))
+    header = " ".join(paragraphs)
+    match = LABEL_PATTERN.search(header)
+    if match is not None:
+        term, label = header[:match.start()], match.group(0)
+    elif len(paragraphs) > 1:
+        # A label missing its opening quote is still on its own paragraph
+        term, label = paragraphs[0], " ".join(paragraphs[1:])
+    else:
+        term, label = header, ""
+    return term.strip() or None, " ".join(label.split()) or None
+
+
+def parse_relations(rows: Iterable[List[ElementTree.Element]]) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+    """
+    Parse the four-cell rows of a lexical relations section.
+
+    A cell may hold several labels ("X by whom", "X against what"), paired
+    in order with the blocks of the value cell (paragraphs separated by an
+    empty one), or else with its paragraphs.
+
+    Input:  rows (list) | the rows, as [label_en, value_en, label_fr, value_fr] cells
+    Output: the English and French relations, as [{label: value or [values]}]
+    """
+    relations: Tuple[List[Dict[str, Any]], List[Dict[str, Any]]] = ([], [])
+    for cells in rows:
+        for language, (label_cell, value_cell) in enumerate(((cells[0], cells[1]), (cells[2], cells[3]))):
+            labels = cell_paragraphs(label_cell, allowed=("sub", "sup"))
+            blocks = cell_blocks(value_cell)
+            values = [value for block in blocks for value in block]
+            if not labels or not values:
+                continue
+            if len(labels) > 1 and len(labels) == len(blocks):
+                pairs = list(zip(labels, blocks))
+            elif len(labels) > 1 and len(labels) == len(values):
+                pairs = [(label, [value]) for label, value in zip(labels, values)]
+            else:
+                pairs = [(" ".join(labels), values)]
+            for label, value in pairs:
+                alias = RELATION_LABELS.get(section_key(label))
+                relations[language].append({alias[language] if alias else label: value[0] if len(value) == 1 else value})
+    return relations
+
+
+def parse_fiche(rows: List[List[ElementTree.Element]], source: str) -> Optional[Fiche]:
+    """
+    Parse the rows of a fiche table.
+
+    Input:  rows (list)     | the rows of the table, as lists of w:tc elements
+            source (str)    | the file name and table number
+    Output: the fiche, or None if the table is not a fiche
+    """
+    if len(rows) < 2 or len(rows[0]) != 2 or section_key(cell_text(rows[1][0])) not in SECTIONS:
+        return None
+
+    fiche = Fiche(source=source)
+    english_term, label_en = parse_header(rows[0][0])
+    french_term, label_fr = parse_header(rows[0][1])
+    if not english_term or not french_term:
+        return None
+    fiche.values.update(
+        english_term=english_term,
+        french_term=french_term,
+        semantic_label_en=label_en,
+        semantic_label_fr=label_fr,
+    )
+
+    section: Optional[Tuple[str, str]] = None
+    contents: Dict[Tuple[str, str], List[List[ElementTree.Element]]] = {}
+    for cells in rows[1:]:
+        if len(cells) == 2 and section_key(cell_text(cells[0])) in SECTIONS:
+            section = SECTIONS[section_key(cell_text(cells[0]))]
+            contents.setdefault(section, [])
+        elif section is not None:
+            contents[section].append(cells)
+
+    for (column, kind), section_rows in contents.items():
+        if kind == "relations":
+            english, french = parse_relations(cells for cells in section_rows if len(cells) == 4)
+        else:
+            english, french = [], []
+            for cells in section_rows:
+                if len(cells) == 2:
+                    english.extend(cell_paragraphs(cells[0]))
+                    french.extend(cell_paragraphs(cells[1]))
+            if kind == "text":
+                english, french = "<br />".join(english), "<br />".join(french)
+        fiche.values[f"{column}_en"] = english or None
+        fiche.values[f"{column}_fr"] = french or None
+    return fiche
+
+
+def file_subdomains(path: str) -> Optional[Tuple[List[str], List[str]]]:
+    """
+    Return the subdomains given in a file name, e.g. "... [IA & Big data] (4 fiches).docx".
+    """
+    match = SUBDOMAIN_PATTERN.search(os.path.basename(path))
+    if match is None:
+        return None
+    subdomains = [SUBDOMAINS[key] for key in (fold(part) for part in match.group(1).split("&")) if key in SUBDOMAINS]
+    if not subdomains:
+        return None
+    return [english for english, _ in subdomains], [french for _, french in subdomains]
+
+
+def parse_document(path: str) -> List[Fiche]:
+    """
+    Parse the fiches of a .docx file.
+
+    Runs in the worker processes: it must only read the file.
+
+    Input:  path (str)  | the .docx file
+    Output: its fiches, in document order
+    """
+    with zipfile.ZipFile(path) as archive:
+        root = ElementTree.fromstring(archive.read("word/document.xml"))
+    body = root.find(f"{W}body")
+    if body is None:
+        return []
+
+    name = os.path.basename(path)
+    subdomains = file_subdomains(path)
+    fiches = []
+    for number, table in enumerate(body.iter(f"{W}tbl"), start=1):
+        rows = [row.findall(f"{W}tc") for row in table.findall(f"{W}tr")]
+        fiche = parse_fiche(rows, f"{name}#{number}")
+        if fiche is None:
+            continue
+        if subdomains is not None:
+            fiche.values["subdomains_en"], fiche.values["subdomains_fr"] = subdomains
+        fiches.append(fiche)
+    return fiches
+
+
+def parse_documents(paths: List[str], workers: Optional[int] = None) -> List[Fiche]:
+    """
+    Parse .docx files in a process pool, one file per task.
+
+    Input:  paths (list)    | the .docx files
+            workers (int)   | the number of processes (default: one per CPU, 1 parses inline)
+    Output: the fiches of every file, in the order of the paths
+    """
+    workers = min(workers or os.cpu_count() or 1, len(paths))
+    if workers <= 1:
+        return [fiche for path in paths for fiche in parse_document(path)]
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        return [fiche for fiches in executor.map(parse_document, paths) for fiche in fiches]
+
+
+def find_documents(source: str) -> List[str]:
+    """
+    Return the .docx files of a directory (or the file itself), sorted by name.
+    """
+    if os.path.isfile(source):
+        return [source]
+    return sorted(
+        path for path in glob.glob(os.path.join(source, "*.docx"))
+        if not os.path.basename(path).startswith("~$")
+    )
+
+
+def is_empty(value: Any) -> bool:
+    """
+    Tell whether a column value is empty, whatever the way it was stored.
+    """
+    return value in EMPTY_VALUES
+
+
+def comparable(value: Any) -> Any:
+    """
+    Return a value with the spaces of its strings collapsed, for comparisons.
+    """
+    if isinstance(value, str):
+        return " ".join(value.split())
+    if isinstance(value, list):
+        return [comparable(item) for item in value]
+    if isinstance(value, dict):
+        return {comparable(key): comparable(item) for key, item in value.items()}
+    return value
+
+
+def same_value(current: Any, value: Any) -> bool:
+    """
+    Compare a stored value with a parsed one, ignoring the kind of spaces and empty values.
+    """
+    if is_empty(current) or is_empty(value):
+        return is_empty(current) and is_empty(value)
+    current, value = comparable(current), comparable(value)
+    if current == value:
+        return True
+    # A fiche without any markup does not erase the markup added in the admin ("HARD FORK<sub>1</sub>")
+    current_text = json.dumps(current, ensure_ascii=False)
+    value_text = json.dumps(value, ensure_ascii=False)
+    return not TAG_PATTERN.search(value_text) and TAG_PATTERN.sub("", current_text) == value_text
+
+
+def plan_import(connection: Any, fiches: List[Fiche]) -> ImportPlan:
+    """
+    Match the fiches with the existing terms and compute the rows to write.
+
+    Only the columns a fiche fills are compared and written: the others
+    (is_active, sections missing from the fiche) keep their current value.
+
+    Input:  connection      | a SQLAlchemy Connection
+            fiches (list)   | the parsed fiches
+    Output: the import plan
+    """
+    table = Term.__table__
+    existing = {row["tid"]: dict(row) for row in connection.execute(select(table)).mappings()}
+    by_english = {row["english_term_norm"]: tid for tid, row in existing.items()}
+    by_french = {row["french_term_norm"]: tid for tid, row in existing.items()}
+    next_tid = max(existing, default=0) + 1
+
+    plan = ImportPlan()
+    seen: Dict[str, str] = {}
+    matched = set()
+    for fiche in fiches:
+        english_norm = fold(fiche.values["english_term"])
+        french_norm = fold(fiche.values["french_term"])
+        if english_norm in seen or french_norm in seen:
+            plan.duplicates.append(
+                f"{fiche.source}: {fiche.values['english_term']} (already in {seen.get(english_norm) or seen[french_norm]})"
+            )
+            continue
+        seen[english_norm] = seen[french_norm] = fiche.source
+
+        english_tid, french_tid = by_english.get(english_norm), by_french.get(french_norm)
+        if english_tid is not None and french_tid is not None and english_tid != french_tid:
+            plan.conflicts.append(
+                f"{fiche.source}: {fiche.values['english_term']} matches term {english_tid} (English)"
+                f" and term {french_tid} (French)"
+            )
+            continue
+
+        tid = english_tid if english_tid is not None else french_tid
+        if tid is None:
+            row = {column.name: None for column in table.columns}
+            row.update(
+                tid=next_tid,
+                domain_en=DOMAIN[0],
+                domain_fr=DOMAIN[1],
+                is_active=True,
+            )
+            row.update(fiche.values)
+            next_tid += 1
+            plan.rows.append(row)
+            plan.created.append((fiche.source, fiche.values["english_term"]))
+            continue
+
+        matched.add(tid)
+        current = existing[tid]
+        changes = {
+            column: (current[column], value)
+            for column, value in fiche.values.items()
+            if not same_value(current[column], value)
+        }
+        if not changes:
+            plan.unchanged += 1
+            continue
+        row = dict(current)
+        row.update({column: new for column, (_, new) in changes.items()})
+        plan.rows.append(row)
+        plan.changed.append((fiche.source, fiche.values["english_term"], changes))
+
+    plan.missing = sorted(
+        row["english_term"] for tid, row in existing.items() if tid not in matched and row["is_active"]
+    )
+    return plan
+
+
+def upsert_terms(
+    connection: Any,
+    rows: List[Dict[str, Any]],
+    batch_size: int = UPSERT_BATCH_SIZE,
+    bump_version: bool = True,
+) -> None:
+    """
+    Insert or update terms by ID in batched executemany statements.
+
+    Writes what the ORM hooks would: the folded search keys, the
+    term_subdomains rows and a single catalog version bump. Every row must
+    have the same columns, "tid" and both terms included; the columns left
+    out keep their current value on update.
+
+    Input:  connection          | a SQLAlchemy Connection, inside a transaction
+            rows (list)         | the rows, as {column: value}
+            batch_size (int)    | the number of rows per statement
+            bump_version (bool) | False when the caller bumps the version itself
+    Output: Nothing
+    """
+    if not rows:
+        return
+    table = Term.__table__
+    subdomain_table = TermSubdomain.__table__
+    columns = [column for column in rows[0] if column != "tid"] + ["english_term_norm", "french_term_norm"]
+    statement = insert(table)
+    statement = statement.on_conflict_do_update(
+        index_elements=[table.c.tid],
+        set_={column: statement.excluded[column] for column in dict.fromkeys(columns)},
+    )
+
+    for start in range(0, len(rows), batch_size):
+        batch = [dict(row) for row in rows[start:start + batch_size]]
+        for row in batch:
+            row["english_term_norm"] = fold(row["english_term"])
+            row["french_term_norm"] = fold(row["french_term"])
+        connection.execute(statement, batch)
+
+        synced = [row for row in batch if "subdomains_en" in row or "subdomains_fr" in row]
+        if synced:
+            connection.execute(subdomain_table.delete().where(subdomain_table.c.tid.in_([row["tid"] for row in synced])))
+            subdomain_rows = [
+                subdomain
+                for row in synced
+                for subdomain in term_subdomain_rows(row["tid"], row.get("subdomains_en"), row.get("subdomains_fr"))
+            ]
+            if subdomain_rows:
+                connection.execute(subdomain_table.insert(), subdomain_rows)
+    if bump_version:
+        bump_catalog_version(connection)
+
+
+class BulkRowError(ValueError):
+    """Raised when a row of a bulk payload is invalid."""
+
+
+# Rows written per transaction by bulk_upsert
+BULK_CHUNK_SIZE = 1000
+
+# Per-row errors returned by the bulk endpoint, at most
+MAX_REPORTED_ERRORS = 500
+
+# Columns of Term.to_dict() holding lists or dictionaries (JSON cells in CSV)
+JSON_COLUMNS = frozenset(
+    column.name for column in Term.__table__.columns if isinstance(column.type, JSON)
+)
+
+# Columns a bulk row may set (the folded search keys are derived)
+BULK_COLUMNS = tuple(column.name for column in Term.__table__.columns if not column.name.endswith("_norm"))
+
+# Columns a row creating a term must set
+REQUIRED_COLUMNS = ("english_term", "french_term", "domain_en", "domain_fr")
+
+TRUE_VALUES = ("1", "true", "yes", "y", "t")
+FALSE_VALUES = ("0", "false", "no", "n", "f")
+
+
+def read_ndjson(lines: Iterable[str]) -> Iterator[Tuple[int, Any]]:
+    """
+    Read an NDJSON payload, one object per non-empty line.
+
+    Input:  lines (Iterable[str])   | the lines of the payload
+    Output: (line number, object, or the BulkRowError of an unparsable line)
+    """
+    for number, line in enumerate(lines, start=1):
+        if not line.strip():
+            continue
+        try:
+            yield number, json.loads(line)
+        except ValueError as e:
+            yield number, BulkRowError(f"Invalid JSON: {str(e)}")
+
+
+def read_csv(lines: Iterable[str]) -> Iterator[Tuple[int, Any]]:
+    """
+    Read a CSV payload whose header names Term columns, as written by /api/terms/csv.
+
+    Input:  lines (Iterable[str])   | the lines of the payload
+    Output: (line number, row, or the BulkRowError of an invalid row)
+    """
+    reader = csv.DictReader(lines)
+    for row in reader:
+        number = reader.line_num
+        if None in row:
+            yield number, BulkRowError("More cells than columns in the header")
+            continue
+        try:
+            yield number, {
+                column: csv_value(column, value)
+                for column, value in row.items()
+                # An empty is_active cell leaves the flag as it is
+                if not (column == "is_active" and not value)
+            }
+        except BulkRowError as e:
+            yield number, e
+
+
+def csv_value(column: str, value: Optional[str]) -> Any:
+    """
+    Convert a CSV cell back into a Term value: JSON for lists, None for empty cells.
+    """
+    if value is None or value == "":
+        return None
+    if column in JSON_COLUMNS:
+        try:
+            return json.loads(value)
+        except ValueError:
+            raise BulkRowError(f"{column}: expected a JSON list or object")
+    return value
+
+
+def validate_term_row(raw: Any) -> Dict[str, Any]:
+    """
+    Check a bulk row shaped like Term.to_dict() and convert its values.
+
+    Input:  raw (Any)   | the decoded row
+    Output: the row, with only the columns it sets
+    """
+    if not isinstance(raw, dict):
+        raise BulkRowError("Expected an object")
+    unknown = sorted(set(raw) - set(BULK_COLUMNS))
+    if unknown:
+        raise BulkRowError(f"Unknown columns: {', '.join(unknown)}")
+
+    row: Dict[str, Any] = {}
+    for name, value in raw.items():
+        column = Term.__table__.c[name]
+        if name == "tid":
+            if value is None:
+                continue
+            if isinstance(value, str) and value.isdigit():
+                value = int(value)
+            if not isinstance(value, int) or isinstance(value, bool) or value < 1:
+                raise BulkRowError("tid: expected a positive integer")
+        elif name == "is_active":
+            if isinstance(value, str) and value.strip().lower() in TRUE_VALUES + FALSE_VALUES:
+                value = value.strip().lower() in TRUE_VALUES
+            if not isinstance(value, bool):
+                raise BulkRowError("is_active: expected a boolean")
+        elif name in JSON_COLUMNS:
+            if value is not None and not isinstance(value, (list, dict)):
+                raise BulkRowError(f"{name}: expected a list, an object or null")
+        elif value is not None:
+            if not isinstance(value, str):
+                raise BulkRowError(f"{name}: expected a string or null")
+            value = value.strip()
+            length = getattr(column.type, "length", None)
+            if length and len(value) > length:
+                raise BulkRowError(f"{name}: longer than {length} characters")
+        if name in REQUIRED_COLUMNS and not value:
+            raise BulkRowError(f"{name}: must not be empty")
+        row[name] = value
+    if "tid" not in row and not ("english_term" in row or "french_term" in row):
+        raise BulkRowError("Expected a tid, an english_term or a french_term to identify the term")
+    return row
+
+
+class BulkResult:
+    """
+    The outcome of a bulk upsert.
+
+    Attributes:
+        received (int): The rows read from the payload.
+        created (int): The terms inserted.
+        updated (int): The terms updated.
+        errors (list): {"line", "error"} of the rejected rows, at most MAX_REPORTED_ERRORS.
+        failed (int): The number of rejected rows.
+        chunks (int): The transactions committed (one catalog version bump each).
+    """
+
+    def __init__(self) -> None:
+        self.received = 0
+        self.created = 0
+        self.updated = 0
+        self.errors: List[Dict[str, Any]] = []
+        self.failed = 0
+        self.chunks = 0
+
+    def reject(self, line: int, error: str) -> None:
+        """Record a rejected row."""
+        self.failed += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append({"line": line, "error": error})
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Return the result as the body of the bulk endpoint."""
+        return {
+            "received": self.received,
+            "created": self.created,
+            "updated": self.updated,
+            "failed": self.failed,
+            "chunks": self.chunks,
+            "errors": sorted(self.errors, key=lambda error: error["line"]),
+            "errors_truncated": self.failed > len(self.errors),
+        }
+
+
+def resolve_chunk(connection: Any, chunk: List[Tuple[int, Dict[str, Any]]], result: BulkResult) -> List[Tuple[int, Dict[str, Any], bool]]:
+    """
+    Find the term each row of a chunk writes and merge the row into it.
+
+    A row updates the term with its tid, or else the term with its English
+    or French term; a row matching two different terms is rejected. Rows
+    of the same chunk writing the same term are merged in order.
+
+    Input:  connection      | a SQLAlchemy Connection, inside the chunk transaction
+            chunk (list)    | (line number, validated row)
+            result (BulkResult) | collects the rejected rows
+    Output: (line number, full row, created) for each accepted row
+    """
+    table = Term.__table__
+    tids = {row["tid"] for _, row in chunk if "tid" in row}
+    english = {row["english_term"] for _, row in chunk if row.get("english_term")}
+    french = {row["french_term"] for _, row in chunk if row.get("french_term")}
+    existing = {
+        current["tid"]: dict(current)
+        for current in connection.execute(
+            select(table).where(
+                table.c.tid.in_(tids) | table.c.english_term.in_(english) | table.c.french_term.in_(french)
+            )
+        ).mappings()
+    }
+    by_english = {current["english_term"]: tid for tid, current in existing.items()}
+    by_french = {current["french_term"]: tid for tid, current in existing.items()}
+    next_tid = (connection.execute(select(func.max(table.c.tid))).scalar() or 0) + 1
+
+    pending: Dict[int, Tuple[int, Dict[str, Any], bool]] = {}
+    for line, row in chunk:
+        candidates = {
+            tid for tid in (row.get("tid"), by_english.get(row.get("english_term")), by_french.get(row.get("french_term")))
+            if tid is not None
+        }
+        if len(candidates) > 1:
+            result.reject(line, f"Matches several terms: {', '.join(str(tid) for tid in sorted(candidates))}")
+            continue
+
+        tid = candidates.pop() if candidates else None
+        if tid in existing:
+            _, current, created = pending.get(tid, (line, existing[tid], False))
+            merged = dict(current)
+        else:
+            missing = [column for column in REQUIRED_COLUMNS if not row.get(column)]
+            if missing:
+                result.reject(line, f"No term matches this row, and a new term needs {', '.join(missing)}")
+                continue
+            tid = tid or next_tid
+            next_tid = max(next_tid, tid + 1)
+            merged = {column: None for column in BULK_COLUMNS}
+            merged["is_active"] = True
+            created = True
+        merged.update(row)
+        merged["tid"] = tid
+
+        # Keep the lookups current for the next rows of the chunk
+        for column, index in (("english_term", by_english), ("french_term", by_french)):
+            previous = existing.get(tid, {}).get(column)
+            if index.get(previous) == tid:
+                del index[previous]
+            index[merged[column]] = tid
+        existing[tid] = merged
+        pending[tid] = (line, merged, created)
+    return list(pending.values())
+
+
+def write_chunk(engine: Any, chunk: List[Tuple[int, Dict[str, Any]]], result: BulkResult) -> None:
+    """
+    Write a chunk of validated rows in one transaction, with one catalog version bump.
+
+    When the chunk violates a constraint, it is written again row by row in
+    savepoints, so that only the offending rows are rejected.
+
+    Input:  engine              | the SQLAlchemy Engine
+            chunk (list)        | (line number, validated row)
+            result (BulkResult) | the counters to update
+    Output: Nothing
+    """
+    with engine.begin() as connection:
+        # pysqlite only opens a transaction before a DML statement, so without
+        # an explicit BEGIN the first SAVEPOINT would be the outermost
+        # transaction and its RELEASE would commit the chunk on its own
+        connection.exec_driver_sql("BEGIN IMMEDIATE")
+        rows = resolve_chunk(connection, chunk, result)
+        if not rows:
+            return
+        try:
+            with connection.begin_nested():
+                upsert_terms(connection, [row for _, row, _ in rows], bump_version=False)
+            written = rows
+        except IntegrityError:
+            written = []
+            for line, row, created in rows:
+                try:
+                    with connection.begin_nested():
+                        upsert_terms(connection, [row], bump_version=False)
+                    written.append((line, row, created))
+                except IntegrityError as e:
+                    result.reject(line, f"Constraint violated: {str(e.orig)}")
+        if written:
+            bump_catalog_version(connection)
+            result.chunks += 1
+    result.created += sum(1 for _, _, created in written if created)
+    result.updated += sum(1 for _, _, created in written if not created)
+
+
+def bulk_upsert(
+    engine: Any,
+    records: Iterable[Tuple[int, Any]],
+    result: Optional[BulkResult] = None,
+    chunk_size: int = BULK_CHUNK_SIZE,
+) -> BulkResult:
+    """
+    Validate rows as they are read and upsert them in chunked transactions.
+
+    A payload that cannot be read to its end (e.g. invalid UTF-8) raises,
+    but the chunks written before stay committed and counted in result.
+
+    Input:  engine              | the SQLAlchemy Engine
+            records (Iterable)  | (line number, decoded row or BulkRowError), from read_ndjson/read_csv
+            result (BulkResult) | the result to fill, or None for a new one
+            chunk_size (int)    | the rows per transaction
+    Output: the result, with the per-row errors
+    """
+    result = result if result is not None else BulkResult()
+    chunk: List[Tuple[int, Dict[str, Any]]] = []
+    for line, raw in records:
+        result.received += 1
+        try:
+            if isinstance(raw, BulkRowError):
+                raise raw
+            chunk.append((line, validate_term_row(raw)))
+        except BulkRowError as e:
+            result.reject(line, str(e))
+            continue
+        if len(chunk) >= chunk_size:
+            write_chunk(engine, chunk, result)
+            chunk = []
+    if chunk:
+        write_chunk(engine, chunk, result)
+    return result
@@ -0,0 +1,91 @@
+"""
+This file contains the exact-match hash index behind /api/terms/batch.
+"""
+
+from __future__ import annotations
+
+import re
+from collections import defaultdict
+from typing import Dict, List, Set, Tuple
+
+from catalog import CatalogSnapshot
+from normalize import fold
+
+# Term columns a batch lookup can match, in either language
+LOOKUP_FIELDS: Tuple[str, ...] = (
+    "english_term",
+    "french_term",
+    "variant_en",
+    "variant_fr",
+    "synonym_en",
+    "synonym_fr",
+)
+
+# Homonym numbers, e.g. "BLOCKCHAIN<sub>1</sub>"
+SUBSCRIPT_PATTERN = re.compile(r"<sub>.*?</sub>", re.IGNORECASE)
+
+# Grammatical labels closing an entry, e.g. ", N. fém." or ", tr. v."
+GRAMMAR_PATTERN = re.compile(r",[^,]*$")
+
+MAX_BATCH_ITEMS = 1000
+
+
+def lookup_keys(label: str) -> Set[str]:
+    """
+    Return the keys under which a glossary label can be looked up.
+
+    A label such as "BLOCKCHAIN<sub>1</sub>, N. ; BLOCK CHAIN" gives the
+    folded forms of each alternative ("blockchain", "block chain"), with
+    and without the grammatical label.
+
+    Input:  label (str) | the value of a term column
+    Output: the folded keys
+    """
+    keys = set()
+    for part in SUBSCRIPT_PATTERN.sub("", label).split(";"):
+        key = fold(part)
+        if key:
+            keys.add(key)
+            stripped = GRAMMAR_PATTERN.sub("", key).strip()
+            if stripped:
+                keys.add(stripped)
+    return keys
+
+
+class ExactIndex:
+    """
+    A hash index from folded label to the IDs of the terms carrying it.
+
+    Attributes:
+        tids (Dict[str, List[int]]): term IDs by folded key, in english_term order.
+    """
+
+    def __init__(self, snapshot: CatalogSnapshot) -> None:
+        tids: Dict[str, List[int]] = defaultdict(list)
+        for term in snapshot.terms:
+            keys: Set[str] = set()
+            for field in LOOKUP_FIELDS:
+                if term.get(field):
+                    keys |= lookup_keys(term[field])
+            for key in keys:
+                tids[key].append(term["tid"])
+        self.tids = dict(tids)
+
+    def find(self, value: str) -> List[int]:
+        """
+        Return the IDs of the terms matching a string exactly (accents and case ignored).
+
+        Input:  value (str) | a term, variant or synonym, in English or French
+        Output: the matching term IDs
+        """
+        key = fold(value)
+        if not key:
+            return []
+        return self.tids.get(key) or self.tids.get(GRAMMAR_PATTERN.sub("", key).strip(), [])
+
+
+def get_exact_index(snapshot: CatalogSnapshot) -> ExactIndex:
+    """
+    Return the exact-match index of a snapshot, building it once per catalog version.
+    """
+    return snapshot.derived("exact", ExactIndex)
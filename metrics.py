@@ -0,0 +1,326 @@
+"""
+This file contains the request and SQL instrumentation of the application
+and renders it in the Prometheus text exposition format.
+
+Each process keeps its own counters and histograms. When METRICS_DIR is
+set (one directory shared by the gunicorn workers), every process writes
+its values there at most once per METRICS_FLUSH_INTERVAL seconds, and
+/metrics sums the files of all the processes, dead ones included, so
+counters never go backwards when a worker is restarted.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import threading
+import time
+from bisect import bisect_left
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from flask import Flask, Response, g, has_request_context, request
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+# Upper bounds of the histogram buckets (+Inf is implicit)
+LATENCY_BUCKETS: Tuple[float, ...] = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+SIZE_BUCKETS: Tuple[float, ...] = (1e3, 1e4, 1e5, 1e6, 1e7, 1e8)
+SQL_BUCKETS: Tuple[float, ...] = (0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0)
+
+# Name: (type, help, buckets)
+METRICS: Dict[str, Tuple[str, str, Optional[Tuple[float, ...]]]] = {
+    "glotecht_http_requests_total": ("counter", "HTTP requests served.", None),
+    "glotecht_http_request_duration_seconds": ("histogram", "Time spent serving HTTP requests.", LATENCY_BUCKETS),
+    "glotecht_http_response_size_bytes": ("histogram", "Size of the HTTP response bodies, when known.", SIZE_BUCKETS),
+    "glotecht_sql_statements_total": ("counter", "SQL statements executed.", None),
+    "glotecht_sql_duration_seconds": ("histogram", "Time spent executing SQL statements.", SQL_BUCKETS),
+    "glotecht_cache_hits_total": ("counter", "Lookups answered by an in-memory cache.", None),
+    "glotecht_cache_misses_total": ("counter", "Lookups an in-memory cache could not answer.", None),
+}
+
+DEFAULT_FLUSH_INTERVAL = 1.0
+
+Labels = Tuple[Tuple[str, str], ...]
+
+
+class MetricsRegistry:
+    """
+    The counters and histograms of one process.
+
+    Attributes:
+        counters (Dict[Tuple[str, Labels], float]): counter values.
+        histograms (Dict[Tuple[str, Labels], List[float]]): per-bucket counts, then the sum.
+        pid (int): the process the values belong to.
+        cache_baselines (Dict[str, Dict[str, int]]): cache counters inherited from the parent process.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        """Forget every value, e.g. in a worker forked from a preloaded master."""
+        with self._lock:
+            self.counters: Dict[Tuple[str, Labels], float] = {}
+            self.histograms: Dict[Tuple[str, Labels], List[float]] = {}
+            self.cache_baselines: Dict[str, Dict[str, int]] = {}
+            self.pid = os.getpid()
+
+    def inc(self, name: str, labels: Labels, value: float = 1.0) -> None:
+        """Add a value to a counter."""
+        with self._lock:
+            key = (name, labels)
+            self.counters[key] = self.counters.get(key, 0.0) + value
+
+    def observe(self, name: str, labels: Labels, value: float) -> None:
+        """Record an observation in a histogram."""
+        buckets = METRICS[name][2]
+        with self._lock:
+            key = (name, labels)
+            counts = self.histograms.get(key)
+            if counts is None:
+                # One count per bucket, one for +Inf, then the sum
+                counts = self.histograms[key] = [0.0] * (len(buckets) + 2)
+            counts[bisect_left(buckets, value)] += 1
+            counts[-1] += value
+
+    def dump(self) -> Dict[str, Any]:
+        """Return the values as a JSON-serializable dictionary."""
+        with self._lock:
+            return {
+                "counters": [[name, list(labels), value] for (name, labels), value in self.counters.items()],
+                "histograms": [[name, list(labels), counts] for (name, labels), counts in self.histograms.items()],
+            }
+
+
+registry = MetricsRegistry()
+
+_flushed_at = 0.0
+_flush_lock = threading.Lock()
+_flush_timer: Optional[threading.Timer] = None
+
+
+def process_file(directory: str) -> str:
+    """
+    Return the file holding the values of the current process.
+    """
+    return os.path.join(directory, f"metrics-{registry.pid}.json")
+
+
+def flush(app: Flask, force: bool = False) -> None:
+    """
+    Write the values of this process to METRICS_DIR, at most once per interval.
+
+    Values recorded within the interval are written by a timer at its end,
+    so an idle worker does not keep unpublished values.
+
+    Input:  app (Flask)     | the application
+            force (bool)    | True to write even if the interval has not elapsed
+    Output: Nothing
+    """
+    global _flushed_at, _flush_timer
+
+    directory = app.config.get("METRICS_DIR")
+    if not directory:
+        return
+    now = time.monotonic()
+    interval = app.config.get("METRICS_FLUSH_INTERVAL", DEFAULT_FLUSH_INTERVAL)
+    if not force and now - _flushed_at < interval:
+        if _flush_timer is None:
+            _flush_timer = threading.Timer(interval - (now - _flushed_at), flush, (app, True))
+            _flush_timer.daemon = True
+            _flush_timer.start()
+        return
+    if not _flush_lock.acquire(blocking=force):
+        return
+    try:
+        _flushed_at = now
+        _flush_timer = None
+        collect_cache_stats(app)
+        path = process_file(directory)
+        with open(f"{path}.tmp", "w", encoding="utf-8") as file:
+            json.dump(registry.dump(), file)
+        os.replace(f"{path}.tmp", path)
+    finally:
+        _flush_lock.release()
+
+
+def register_cache_stats(app: Flask, name: str, stats: Callable[[], Dict[str, int]]) -> None:
+    """
+    Expose the hit and miss counters of a cache in /metrics.
+
+    Input:  app (Flask)         | the application
+            name (str)          | the value of the "cache" label
+            stats (Callable)    | returns a dictionary with "hits" and "misses"
+    Output: Nothing
+    """
+    app.extensions.setdefault("metrics_caches", {})[name] = stats
+
+
+def collect_cache_stats(app: Flask) -> None:
+    """
+    Copy the cumulative cache counters of this process into the registry.
+    """
+    for name, stats in app.extensions.get("metrics_caches", {}).items():
+        values = stats()
+        baseline = registry.cache_baselines.get(name, {})
+        labels = (("cache", name),)
+        with registry._lock:
+            for counter, key in (("glotecht_cache_hits_total", "hits"), ("glotecht_cache_misses_total", "misses")):
+                registry.counters[(counter, labels)] = float(values.get(key, 0) - baseline.get(key, 0))
+
+
+def read_values(app: Flask) -> Iterable[Dict[str, Any]]:
+    """
+    Return the values of every process sharing METRICS_DIR, or of this process only.
+    """
+    directory = app.config.get("METRICS_DIR")
+    if not directory:
+        collect_cache_stats(app)
+        return [registry.dump()]
+
+    flush(app, force=True)
+    values = []
+    for entry in os.scandir(directory):
+        if entry.name.startswith("metrics-") and entry.name.endswith(".json"):
+            try:
+                with open(entry.path, encoding="utf-8") as file:
+                    values.append(json.load(file))
+            except (OSError, ValueError):
+                # A file being replaced is read on the next scrape
+                continue
+    return values
+
+
+def format_labels(labels: Iterable[Tuple[str, str]]) -> str:
+    """
+    Format labels as {name="value",...}, escaped for the text format.
+    """
+    parts = []
+    for name, value in labels:
+        escaped = str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+        parts.append(f'{name}="{escaped}"')
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def format_value(value: float) -> str:
+    """
+    Format a sample value, integers without a decimal part.
+    """
+    return str(int(value)) if float(value).is_integer() else repr(value)
+
+
+def render(app: Flask) -> str:
+    """
+    Render the aggregated values in the Prometheus text exposition format.
+
+    Input:  app (Flask) | the application
+    Output: the body of /metrics
+    """
+    counters: Dict[Tuple[str, Labels], float] = {}
+    histograms: Dict[Tuple[str, Labels], List[float]] = {}
+    for values in read_values(app):
+        for name, labels, value in values["counters"]:
+            key = (name, tuple(tuple(label) for label in labels))
+            counters[key] = counters.get(key, 0.0) + value
+        for name, labels, counts in values["histograms"]:
+            key = (name, tuple(tuple(label) for label in labels))
+            total = histograms.setdefault(key, [0.0] * len(counts))
+            for position, count in enumerate(counts):
+                total[position] += count
+
+    lines = []
+    for name, (kind, help_text, buckets) in METRICS.items():
+        lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} {kind}")
+        if kind == "counter":
+            for (sample, labels), value in sorted(counters.items()):
+                if sample == name:
+                    lines.append(f"{name}{format_labels(labels)} {format_value(value)}")
+            continue
+        for (sample, labels), counts in sorted(histograms.items()):
+            if sample != name:
+                continue
+            cumulative = 0.0
+            for bound, count in zip((*buckets, float("inf")), counts):
+                cumulative += count
+                le = "+Inf" if bound == float("inf") else format_value(bound)
+                lines.append(f"{name}_bucket{format_labels((*labels, ('le', le)))} {format_value(cumulative)}")
+            lines.append(f"{name}_sum{format_labels(labels)} {format_value(counts[-1])}")
+            lines.append(f"{name}_count{format_labels(labels)} {format_value(cumulative)}")
+    return "\n".join(lines) + "\n"
+
+
+def request_labels() -> Labels:
+    """
+    Return the labels of the current request: the endpoint name, never the raw path.
+    """
+    return (("endpoint", request.endpoint or "unmatched"), ("method", request.method))
+
+
+def init_metrics(app: Flask) -> None:
+    """
+    Record the latency, response size and SQL activity of every request.
+
+    Must be called before the other after_request hooks are registered, so
+    that it runs last and sees the final (compressed) response.
+
+    Configuration:
+        METRICS_DIR (str): directory shared by the processes (multiprocess mode).
+        METRICS_FLUSH_INTERVAL (float): seconds between two writes of a process file.
+    """
+    app.config.setdefault("METRICS_DIR", os.getenv("METRICS_DIR"))
+    app.config.setdefault("METRICS_FLUSH_INTERVAL", DEFAULT_FLUSH_INTERVAL)
+    if app.config["METRICS_DIR"]:
+        os.makedirs(app.config["METRICS_DIR"], exist_ok=True)
+
+    if not event.contains(Engine, "before_cursor_execute", start_statement_timer):
+        event.listen(Engine, "before_cursor_execute", start_statement_timer)
+        event.listen(Engine, "after_cursor_execute", stop_statement_timer)
+
+    @app.before_request
+    def start_request_timer() -> None:
+        global _flush_timer
+
+        if registry.pid != os.getpid():
+            # Values (and timer) inherited from the master are not this worker's
+            registry.reset()
+            registry.cache_baselines = {
+                name: stats() for name, stats in app.extensions.get("metrics_caches", {}).items()
+            }
+            _flush_timer = None
+        g.metrics_started = time.perf_counter()
+
+    @app.after_request
+    def record_request(response: Response) -> Response:
+        started = g.pop("metrics_started", None)
+        if started is None:
+            return response
+        labels = request_labels()
+        registry.inc("glotecht_http_requests_total", (*labels, ("status", str(response.status_code))))
+        # For streamed bodies this is the time to the first byte
+        registry.observe("glotecht_http_request_duration_seconds", labels, time.perf_counter() - started)
+        if response.content_length is not None:
+            registry.observe("glotecht_http_response_size_bytes", labels[:1], response.content_length)
+        flush(app)
+        return response
+
+
+def start_statement_timer(connection: Any, cursor: Any, statement: str, parameters: Any, context: Any, executemany: bool) -> None:
+    """
+    Remember when a SQL statement started.
+    """
+    connection.info["metrics_started"] = time.perf_counter()
+
+
+def stop_statement_timer(connection: Any, cursor: Any, statement: str, parameters: Any, context: Any, executemany: bool) -> None:
+    """
+    Record a SQL statement and its duration under the endpoint that ran it.
+    """
+    started = connection.info.pop("metrics_started", None)
+    if started is None:
+        return
+    endpoint = (request.endpoint or "unmatched") if has_request_context() else "none"
+    labels: Labels = (("endpoint", endpoint),)
+    registry.inc("glotecht_sql_statements_total", labels)
+    registry.observe("glotecht_sql_duration_seconds", labels, time.perf_counter() - started)
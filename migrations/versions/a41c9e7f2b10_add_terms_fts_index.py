@@ -0,0 +1,65 @@
+"""add 'terms_fts' full-text index kept in sync with terms
+
+Revision ID: a41c9e7f2b10
+Revises: d7d3080cbffd
+Create Date: 2026-10-17 09:02:11.314480
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = 'a41c9e7f2b10'
+down_revision = 'd7d3080cbffd'
+branch_labels = None
+depends_on = None
+
+# Keep in sync with search.FTS_COLUMNS
+FTS_COLUMNS = (
+    'english_term', 'french_term',
+    'variant_en', 'variant_fr',
+    'synonym_en', 'synonym_fr',
+    'near_synonym_en', 'near_synonym_fr',
+    'definition_en', 'definition_fr',
+)
+
+
+def upgrade():
+    columns = ', '.join(FTS_COLUMNS)
+    new_values = ', '.join(f'new.{column}' for column in FTS_COLUMNS)
+    old_values = ', '.join(f'old.{column}' for column in FTS_COLUMNS)
+
+    # External-content table: the text lives in 'terms', only the index is stored
+    op.execute(
+        f"CREATE VIRTUAL TABLE terms_fts USING fts5({columns}, "
+        "content='terms', content_rowid='tid', "
+        "tokenize='unicode61 remove_diacritics 2')"
+    )
+
+    # Triggers keep the index in sync with every write, ORM or raw SQL
+    op.execute(
+        f"CREATE TRIGGER terms_fts_ai AFTER INSERT ON terms BEGIN "
+        f"INSERT INTO terms_fts(rowid, {columns}) VALUES (new.tid, {new_values}); "
+        f"END"
+    )
+    op.execute(
+        f"CREATE TRIGGER terms_fts_ad AFTER DELETE ON terms BEGIN "
+        f"INSERT INTO terms_fts(terms_fts, rowid, {columns}) VALUES ('delete', old.tid, {old_values}); "
+        f"END"
+    )
+    op.execute(
+        f"CREATE TRIGGER terms_fts_au AFTER UPDATE ON terms BEGIN "
+        f"INSERT INTO terms_fts(terms_fts, rowid, {columns}) VALUES ('delete', old.tid, {old_values}); "
+        f"INSERT INTO terms_fts(rowid, {columns}) VALUES (new.tid, {new_values}); "
+        f"END"
+    )
+
+    # Index the rows that already exist
+    op.execute("INSERT INTO terms_fts(terms_fts) VALUES ('rebuild')")
+
+
+def downgrade():
+    op.execute("DROP TRIGGER IF EXISTS terms_fts_au")
+    op.execute("DROP TRIGGER IF EXISTS terms_fts_ad")
+    op.execute("DROP TRIGGER IF EXISTS terms_fts_ai")
+    op.execute("DROP TABLE IF EXISTS terms_fts")
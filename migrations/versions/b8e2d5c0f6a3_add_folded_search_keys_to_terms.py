@@ -0,0 +1,43 @@
+"""add folded 'english_term_norm'/'french_term_norm' search keys to terms
+
+Revision ID: b8e2d5c0f6a3
+Revises: a41c9e7f2b10
+Create Date: 2026-10-17 11:26:48.907215
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+from normalize import fold
+
+
+# revision identifiers, used by Alembic.
+revision = 'b8e2d5c0f6a3'
+down_revision = 'a41c9e7f2b10'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Plain ADD COLUMN: a batch "move and copy" would drop the terms_fts triggers
+    op.add_column('terms', sa.Column('english_term_norm', sa.String(length=255), nullable=True))
+    op.add_column('terms', sa.Column('french_term_norm', sa.String(length=255), nullable=True))
+
+    # Backfill the keys of the existing rows
+    connection = op.get_bind()
+    rows = connection.execute(sa.text("SELECT tid, english_term, french_term FROM terms")).fetchall()
+    if rows:
+        connection.execute(
+            sa.text("UPDATE terms SET english_term_norm = :en, french_term_norm = :fr WHERE tid = :tid"),
+            [{"tid": tid, "en": fold(en), "fr": fold(fr)} for tid, en, fr in rows],
+        )
+
+    op.create_index('ix_terms_english_term_norm', 'terms', ['english_term_norm'], unique=False)
+    op.create_index('ix_terms_french_term_norm', 'terms', ['french_term_norm'], unique=False)
+
+
+def downgrade():
+    op.drop_index('ix_terms_french_term_norm', table_name='terms')
+    op.drop_index('ix_terms_english_term_norm', table_name='terms')
+    op.drop_column('terms', 'french_term_norm')
+    op.drop_column('terms', 'english_term_norm')
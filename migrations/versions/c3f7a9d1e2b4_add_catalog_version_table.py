@@ -0,0 +1,29 @@
+"""add 'catalog_version' table
+
+Revision ID: c3f7a9d1e2b4
+Revises: b8e2d5c0f6a3
+Create Date: 2026-10-17 14:05:37.118902
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c3f7a9d1e2b4'
+down_revision = 'b8e2d5c0f6a3'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    catalog_version = op.create_table('catalog_version',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('version', sa.Integer(), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.bulk_insert(catalog_version, [{'id': 1, 'version': 1}])
+
+
+def downgrade():
+    op.drop_table('catalog_version')
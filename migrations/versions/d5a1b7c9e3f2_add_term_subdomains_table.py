@@ -0,0 +1,62 @@
+"""add 'term_subdomains' table of folded subdomains
+
+Revision ID: d5a1b7c9e3f2
+Revises: c3f7a9d1e2b4
+Create Date: 2026-10-17 16:48:02.551937
+
+"""
+import json
+
+from alembic import op
+import sqlalchemy as sa
+
+from normalize import fold
+
+
+# revision identifiers, used by Alembic.
+revision = 'd5a1b7c9e3f2'
+down_revision = 'c3f7a9d1e2b4'
+branch_labels = None
+depends_on = None
+
+
+def term_subdomain_rows(tid, subdomains_en, subdomains_fr):
+    # Frozen copy of models.term_subdomain_rows at this revision (one row per
+    # whole folded subdomain), so later model edits cannot change the backfill
+    rows = {}
+    for lang, subdomains in (("en", subdomains_en), ("fr", subdomains_fr)):
+        for subdomain in subdomains or []:
+            key = fold(subdomain) if isinstance(subdomain, str) else None
+            if key:
+                rows[(lang, key)] = {"tid": tid, "lang": lang, "subdomain_norm": key}
+    return list(rows.values())
+
+
+def upgrade():
+    term_subdomains = op.create_table('term_subdomains',
+    sa.Column('tid', sa.Integer(), nullable=False),
+    sa.Column('lang', sa.String(length=2), nullable=False),
+    sa.Column('subdomain_norm', sa.String(length=255), nullable=False),
+    sa.ForeignKeyConstraint(['tid'], ['terms.tid'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('tid', 'lang', 'subdomain_norm')
+    )
+    op.create_index('ix_term_subdomains_subdomain_norm', 'term_subdomains', ['subdomain_norm', 'tid'], unique=False)
+
+    # Backfill from the JSON columns of the existing terms
+    connection = op.get_bind()
+    rows = []
+    for tid, subdomains_en, subdomains_fr in connection.execute(
+        sa.text("SELECT tid, subdomains_en, subdomains_fr FROM terms")
+    ):
+        rows.extend(term_subdomain_rows(
+            tid,
+            json.loads(subdomains_en) if subdomains_en else None,
+            json.loads(subdomains_fr) if subdomains_fr else None,
+        ))
+    if rows:
+        op.bulk_insert(term_subdomains, rows)
+
+
+def downgrade():
+    op.drop_index('ix_term_subdomains_subdomain_norm', table_name='term_subdomains')
+    op.drop_table('term_subdomains')
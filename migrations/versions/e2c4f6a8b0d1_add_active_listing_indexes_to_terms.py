@@ -0,0 +1,34 @@
+"""add indexes for the active-term listing and the semantic labels
+
+Revision ID: e2c4f6a8b0d1
+Revises: d5a1b7c9e3f2
+Create Date: 2026-10-17 18:12:40.318254
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e2c4f6a8b0d1'
+down_revision = 'd5a1b7c9e3f2'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Every public query filters on is_active and orders by (english_term, tid):
+    # this index turns them into range searches, covers counts and keyset pages
+    # and spares the sort
+    op.create_index('ix_terms_is_active_english_term', 'terms', ['is_active', 'english_term', 'tid'], unique=False)
+    # Partial covering index of /api/terms/semantic-labels
+    op.create_index(
+        'ix_terms_semantic_labels', 'terms', ['semantic_label_en', 'semantic_label_fr'], unique=False,
+        sqlite_where=sa.text('semantic_label_en IS NOT NULL AND semantic_label_fr IS NOT NULL'),
+    )
+    op.execute("ANALYZE")
+
+
+def downgrade():
+    op.drop_index('ix_terms_semantic_labels', table_name='terms')
+    op.drop_index('ix_terms_is_active_english_term', table_name='terms')
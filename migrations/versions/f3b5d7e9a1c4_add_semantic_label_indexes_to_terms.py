@@ -0,0 +1,28 @@
+"""add indexes for the semantic label searches
+
+Revision ID: f3b5d7e9a1c4
+Revises: e2c4f6a8b0d1
+Create Date: 2026-10-17 21:06:52.174630
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'f3b5d7e9a1c4'
+down_revision = 'e2c4f6a8b0d1'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # type=class searches seek the matching labels in either language
+    op.create_index('ix_terms_semantic_label_en', 'terms', ['semantic_label_en'], unique=False)
+    op.create_index('ix_terms_semantic_label_fr', 'terms', ['semantic_label_fr'], unique=False)
+    op.execute("ANALYZE")
+
+
+def downgrade():
+    op.drop_index('ix_terms_semantic_label_fr', table_name='terms')
+    op.drop_index('ix_terms_semantic_label_en', table_name='terms')
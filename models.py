@@ -8,6 +8,9 @@ from typing import Any, Dict, List
 
 from app import db
 from flask_login import UserMixin
+from sqlalchemy import event
+
+from normalize import fold
 
 
 class User(db.Model, UserMixin):
@@ -127,6 +130,9 @@ class Term(db.Model):
 
         context_en (str): Context in English.
         context_fr (str): Context in French.
+
+        english_term_norm (str): Folded English term (no accents, lowercase), used as a search key.
+        french_term_norm (str): Folded French term (no accents, lowercase), used as a search key.
     """
 
     # Define the name of the table in the database
@@ -181,8 +187,21 @@ class Term(db.Model):
 
     is_active: bool = db.Column(db.Boolean, default=True, nullable=False)
 
+    english_term_norm: str = db.Column(db.String(255), index=True)
+    french_term_norm: str = db.Column(db.String(255), index=True)
+
     __table_args__ = (
         db.UniqueConstraint("english_term", "french_term", name="unique_terms"),
+        db.Index("ix_terms_is_active_english_term", "is_active", "english_term", "tid"),
+        db.Index(
+            "ix_terms_semantic_labels",
+            "semantic_label_en",
+            "semantic_label_fr",
+            sqlite_where=db.text("semantic_label_en IS NOT NULL AND semantic_label_fr IS NOT NULL"),
+        ),
+        # type=class searches seek the labels matching the query (see search.filter_term_ids)
+        db.Index("ix_terms_semantic_label_en", "semantic_label_en"),
+        db.Index("ix_terms_semantic_label_fr", "semantic_label_fr"),
     )
 
     def __repr__(self) -> str:
@@ -194,6 +213,16 @@ class Term(db.Model):
         """
         return f"Term ID: {self.tid} - English Term: {self.english_term} - French Term: {self.french_term}"
 
+    def refresh_search_keys(self) -> None:
+        """
+        Recompute the folded search keys from the English & French terms.
+
+        Input:  self (Term) | the Term instance
+        Output: Nothing
+        """
+        self.english_term_norm = fold(self.english_term)
+        self.french_term_norm = fold(self.french_term)
+
     def to_dict(self) -> Dict[str, Any]:
         """
         Converts models for easier JSON serialization.
@@ -251,3 +280,131 @@ class Term(db.Model):
             # separator
             "is_active": self.is_active,
         }
+
+
+class TermSubdomain(db.Model):
+    """
+    Define a class for the folded subdomains of a term, one row per subdomain
+    and language, so that subdomain searches are index lookups instead of
+    parsing Term.subdomains_en/subdomains_fr for every row.
+    The rows are maintained by the Term listeners below (see sync_term_subdomains).
+
+    Attributes:
+        tid (int): The ID of the term.
+        lang (str): The language of the subdomain ("en" or "fr").
+        subdomain_norm (str): The folded subdomain (no accents, lowercase).
+    """
+
+    # Define the name of the table in the database
+    __tablename__ = "term_subdomains"
+
+    tid: int = db.Column(db.Integer, db.ForeignKey("terms.tid", ondelete="CASCADE"), primary_key=True)
+    lang: str = db.Column(db.String(2), primary_key=True)
+    subdomain_norm: str = db.Column(db.String(255), primary_key=True)
+
+    __table_args__ = (
+        db.Index("ix_term_subdomains_subdomain_norm", "subdomain_norm", "tid"),
+    )
+
+    def __repr__(self) -> str:
+        """
+        Returns a string representation of a TermSubdomain instance.
+
+        Input:  self (TermSubdomain) | the TermSubdomain instance
+        Output: the string representation of the term subdomain.
+        """
+        return f"Term ID: {self.tid} - Lang: {self.lang} - Subdomain: {self.subdomain_norm}"
+
+
+class CatalogVersion(db.Model):
+    """
+    Define a single-row table holding the version of the glossary catalog.
+    The version is bumped in the same transaction as every change to the
+    terms (see catalog.py), so every worker can tell when its cached copy
+    of the catalog is stale.
+
+    Attributes:
+        id (int): The primary key, always 1.
+        version (int): The catalog version.
+    """
+
+    # Define the name of the table in the database
+    __tablename__ = "catalog_version"
+
+    id: int = db.Column(db.Integer, primary_key=True)
+    version: int = db.Column(db.Integer, nullable=False, default=0)
+
+    def __repr__(self) -> str:
+        """
+        Returns a string representation of a CatalogVersion instance.
+
+        Input:  self (CatalogVersion) | the CatalogVersion instance
+        Output: the string representation of the catalog version.
+        """
+        return f"Catalog Version: {self.version}"
+
+
+@event.listens_for(Term, "before_insert")
+@event.listens_for(Term, "before_update")
+def refresh_term_search_keys(mapper: Any, connection: Any, target: Term) -> None:
+    """
+    Keep the folded search keys in sync on every ORM write, admin edits included.
+    """
+    target.refresh_search_keys()
+
+
+def term_subdomain_rows(tid: int, subdomains_en: Any, subdomains_fr: Any) -> List[Dict[str, Any]]:
+    """
+    Build the term_subdomains rows of a term.
+
+    Input:  tid (int)               | the ID of the term
+            subdomains_en (list)    | the English subdomains (JSON list or None)
+            subdomains_fr (list)    | the French subdomains (JSON list or None)
+    Output: the rows, without duplicates
+    """
+    rows: Dict[Any, Dict[str, Any]] = {}
+    for lang, subdomains in (("en", subdomains_en), ("fr", subdomains_fr)):
+        for subdomain in subdomains or []:
+            key = fold(subdomain) if isinstance(subdomain, str) else None
+            if key:
+                rows[(lang, key)] = {"tid": tid, "lang": lang, "subdomain_norm": key}
+    return list(rows.values())
+
+
+def sync_term_subdomains(connection: Any, tid: int, subdomains_en: Any, subdomains_fr: Any) -> None:
+    """
+    Replace the term_subdomains rows of a term, inside the caller's transaction.
+
+    Writers that bypass the ORM must call this for every term they write.
+
+    Input:  connection          | a SQLAlchemy Connection
+            tid (int)           | the ID of the term
+            subdomains_en (list)| the English subdomains
+            subdomains_fr (list)| the French subdomains
+    Output: Nothing
+    """
+    table = TermSubdomain.__table__
+    connection.execute(table.delete().where(table.c.tid == tid))
+    rows = term_subdomain_rows(tid, subdomains_en, subdomains_fr)
+    if rows:
+        connection.execute(table.insert(), rows)
+
+
+@event.listens_for(Term, "after_insert")
+@event.listens_for(Term, "after_update")
+def refresh_term_subdomains(mapper: Any, connection: Any, target: Term) -> None:
+    """
+    Keep term_subdomains in sync when Term.subdomains_en/subdomains_fr are written.
+    """
+    state = db.inspect(target)
+    if state.attrs.subdomains_en.history.has_changes() or state.attrs.subdomains_fr.history.has_changes():
+        sync_term_subdomains(connection, target.tid, target.subdomains_en, target.subdomains_fr)
+
+
+@event.listens_for(Term, "after_delete")
+def delete_term_subdomains(mapper: Any, connection: Any, target: Term) -> None:
+    """
+    Remove the term_subdomains rows of a deleted term.
+    """
+    table = TermSubdomain.__table__
+    connection.execute(table.delete().where(table.c.tid == target.tid))
@@ -0,0 +1,47 @@
+"""
+This file contains the text folding used to build accent- and case-insensitive search keys.
+"""
+
+from __future__ import annotations
+
+import re
+import unicodedata
+from typing import Optional
+
+# Letters that NFKD leaves untouched but that users type in two letters
+LIGATURES = str.maketrans({
+    "œ": "oe",
+    "Œ": "oe",
+    "æ": "ae",
+    "Æ": "ae",
+    "ß": "ss",
+    "ø": "o",
+    "Ø": "o",
+    "ł": "l",
+    "Ł": "l",
+})
+
+# Inline markup used in the fiches, e.g. "ROLLUP<sub>2</sub>"
+TAG_PATTERN = re.compile(r"<[^>]*>")
+SPACE_PATTERN = re.compile(r"\s+")
+
+
+def fold(value: Optional[str]) -> Optional[str]:
+    """
+    Fold a string into a search key: no markup, no accents, lowercase,
+    ligatures expanded and whitespace collapsed.
+
+    "Nœud de réseau" and "noeud de reseau" both fold to "noeud de reseau".
+
+    Input:  value (str) | the text to fold
+    Output: the folded text, or None if value is None
+    """
+    if value is None:
+        return None
+
+    value = TAG_PATTERN.sub("", value).translate(LIGATURES)
+    value = "".join(
+        char for char in unicodedata.normalize("NFKD", value)
+        if not unicodedata.combining(char)
+    )
+    return SPACE_PATTERN.sub(" ", value.casefold()).strip()
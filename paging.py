@@ -0,0 +1,201 @@
+"""
+This file contains the keyset pagination and field projection helpers of the API.
+"""
+
+from __future__ import annotations
+
+import base64
+import binascii
+import json
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+from urllib.parse import urlencode
+
+from flask import Response, jsonify, request
+from sqlalchemy import select, tuple_
+
+from models import Term
+from storage import read_session
+
+# Columns that can be requested with "fields=" (the keys of Term.to_dict())
+PUBLIC_FIELDS: Tuple[str, ...] = tuple(
+    column.name for column in Term.__table__.columns if not column.name.endswith("_norm")
+)
+
+DEFAULT_LIMIT = 50
+MAX_LIMIT = 500
+
+
+class PagingError(ValueError):
+    """Raised when the limit, cursor or fields parameters are invalid."""
+
+
+def wants_page() -> bool:
+    """
+    Tell whether the request asks for a page rather than the full result.
+
+    Input:  Nothing
+    Output: True if limit, cursor or fields was given
+    """
+    return any(name in request.args for name in ("limit", "cursor", "fields"))
+
+
+def parse_limit(raw: Optional[str]) -> int:
+    """
+    Parse the "limit" parameter.
+
+    Input:  raw (str)   | the raw parameter, or None
+    Output: the page size, between 1 and MAX_LIMIT
+    """
+    if raw is None:
+        return DEFAULT_LIMIT
+    try:
+        limit = int(raw)
+    except ValueError:
+        raise PagingError(f"Invalid limit: {raw!r}")
+    if not 1 <= limit <= MAX_LIMIT:
+        raise PagingError(f"limit must be between 1 and {MAX_LIMIT}")
+    return limit
+
+
+def parse_fields(raw: Optional[str]) -> List[str]:
+    """
+    Parse the comma-separated "fields" parameter; "tid" is always included.
+
+    Input:  raw (str)   | the raw parameter, or None for every field
+    Output: the list of column names to select
+    """
+    if not raw:
+        return list(PUBLIC_FIELDS)
+
+    fields = ["tid"]
+    for field in (field.strip() for field in raw.split(",")):
+        if not field or field in fields:
+            continue
+        if field not in PUBLIC_FIELDS:
+            raise PagingError(f"Unknown field: {field!r}")
+        fields.append(field)
+    return fields
+
+
+def encode_cursor(values: Sequence[Any]) -> str:
+    """
+    Encode the position of the last returned row into an opaque cursor.
+
+    Input:  values (Sequence)   | the sort key of the last row
+    Output: the cursor string
+    """
+    raw = json.dumps(list(values), separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(raw: str, types: Sequence[type]) -> List[Any]:
+    """
+    Decode a cursor produced by encode_cursor().
+
+    Every value must have the type expected at its position (a bool is not
+    an int), so a forged cursor can never reach the SQL as a list or object.
+
+    Input:  raw (str)               | the cursor string
+            types (Sequence[type])  | the expected type of each value
+    Output: the sort key of the last row of the previous page
+    """
+    try:
+        padded = raw + "=" * (-len(raw) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+    except (ValueError, binascii.Error):
+        raise PagingError("Invalid cursor")
+    if not isinstance(values, list) or len(values) != len(types):
+        raise PagingError("Invalid cursor")
+    for value, expected in zip(values, types):
+        if not isinstance(value, expected) or isinstance(value, bool):
+            raise PagingError("Invalid cursor")
+    return values
+
+
+def select_fields(fields: Sequence[str]) -> Any:
+    """
+    Build a SELECT of the given columns of the active terms.
+
+    Input:  fields (Sequence[str])  | the column names
+    Output: a Select statement
+    """
+    return select(*(getattr(Term, field) for field in fields)).where(Term.is_active == True)
+
+
+def keyset_page(fields: Sequence[str], limit: int, cursor: Optional[str]) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+    """
+    Read one page of the active terms ordered by (english_term, tid).
+
+    The page starts right after the cursor position, so its cost does not
+    depend on how deep in the listing it is (no OFFSET).
+
+    Input:  fields (Sequence[str])  | the columns to return
+            limit (int)             | the page size
+            cursor (str)            | the cursor of the previous page, or None
+    Output: a tuple (rows, next cursor or None)
+    """
+    columns = list(dict.fromkeys(["english_term", "tid", *fields]))
+    statement = select_fields(columns).order_by(Term.english_term, Term.tid).limit(limit + 1)
+    if cursor:
+        english_term, tid = decode_cursor(cursor, (str, int))
+        statement = statement.where(tuple_(Term.english_term, Term.tid) > tuple_(english_term, tid))
+
+    rows = [row._asdict() for row in read_session().execute(statement)]
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor([rows[-1]["english_term"], rows[-1]["tid"]])
+
+    return [{field: row[field] for field in fields} for row in rows], next_cursor
+
+
+def ranked_page(tids: Sequence[int], fields: Sequence[str], limit: int, cursor: Optional[str]) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+    """
+    Read one page of an already ranked list of term IDs (search results).
+
+    The cursor holds the last returned ID, so only the rows of the page are
+    loaded, with only the requested columns.
+
+    Input:  tids (Sequence[int])    | the matching IDs, best match first
+            fields (Sequence[str])  | the columns to return
+            limit (int)             | the page size
+            cursor (str)            | the cursor of the previous page, or None
+    Output: a tuple (rows, next cursor or None)
+    """
+    start = 0
+    if cursor:
+        (last_tid,) = decode_cursor(cursor, (int,))
+        try:
+            start = list(tids).index(last_tid) + 1
+        except ValueError:
+            raise PagingError("Invalid cursor")
+
+    page = list(tids[start:start + limit])
+    next_cursor = encode_cursor([page[-1]]) if page and start + limit < len(tids) else None
+    if not page:
+        return [], None
+
+    rows = {
+        row.tid: row._asdict()
+        for row in read_session().execute(select_fields(fields).where(Term.tid.in_(page)))
+    }
+    return [rows[tid] for tid in page if tid in rows], next_cursor
+
+
+def page_response(rows: List[Dict[str, Any]], total: int, next_cursor: Optional[str]) -> Response:
+    """
+    Build the JSON response of a page, with the total count and the next cursor.
+
+    Input:  rows (List[Dict])       | the rows of the page
+            total (int)             | the number of matching rows
+            next_cursor (str)       | the cursor of the next page, or None
+    Output: the response; the body is the list of rows
+    """
+    response = jsonify(rows)
+    response.headers["X-Total-Count"] = str(total)
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+        args = request.args.to_dict()
+        args["cursor"] = next_cursor
+        response.headers["Link"] = f'<{request.path}?{urlencode(args)}>; rel="next"'
+    return response
@@ -0,0 +1,51 @@
+"""
+This file contains helpers to build cacheable responses from the catalog snapshot.
+"""
+
+from __future__ import annotations
+
+import hashlib
+from typing import Any, Callable, Tuple
+
+from flask import Response, current_app, request
+
+from catalog import CatalogSnapshot
+
+
+def encode_json(payload: Any) -> Tuple[bytes, str]:
+    """
+    Encode a payload the way jsonify() does and compute its strong ETag.
+
+    Input:  payload (Any)   | the JSON-serializable payload
+    Output: a tuple (body, etag)
+    """
+    body = current_app.json.response(payload).get_data()
+    return body, hashlib.sha256(body).hexdigest()[:32]
+
+
+def snapshot_json_response(
+    snapshot: CatalogSnapshot,
+    name: str,
+    build_payload: Callable[[CatalogSnapshot], Any],
+) -> Response:
+    """
+    Return a JSON response whose body is encoded once per catalog version.
+
+    The body and its ETag are cached on the snapshot, so a request only costs
+    a dictionary lookup, and a client sending a matching If-None-Match gets
+    an empty 304 response.
+
+    Input:  snapshot (CatalogSnapshot)  | the current snapshot
+            name (str)                  | the cache key of the body
+            build_payload (Callable)    | computes the payload from the snapshot
+    Output: a 200 response with the body, or a 304 response
+    """
+    body, etag = snapshot.derived(
+        f"json:{name}", lambda snapshot: encode_json(build_payload(snapshot))
+    )
+
+    response = Response(body, mimetype="application/json")
+    response.set_etag(etag)
+    # Let browsers keep the body but revalidate it on every use
+    response.cache_control.no_cache = True
+    return response.make_conditional(request)
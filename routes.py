@@ -1,13 +1,11 @@
 """
-This file defines the routes/endpoints for the API.
+This file defines the public routes/endpoints: the pages and the read-only API.
+The admin views and routes are defined in admin.py.
 """
 
 from __future__ import annotations
 
-from functools import wraps
-from io import StringIO
-import csv
-from typing import Any, Callable, Literal, Tuple, Union
+from typing import Any, Dict, List, Literal, Tuple, Union
 import re
 
 from flask import (
@@ -16,144 +14,53 @@ from flask import (
     jsonify,
     render_template,
     request,
-    redirect,
-    url_for,
-    flash,
+    stream_with_context,
 )
-from flask_admin import Admin, AdminIndexView, expose
-from flask_admin.contrib.sqla import ModelView
 from flask_cors import cross_origin
-from flask_sqlalchemy import SQLAlchemy
-from sqlalchemy.exc import IntegrityError
-from flask_login import current_user, login_required, login_user, logout_user
-from flask_bcrypt import Bcrypt
-from sqlalchemy import func
-from sqlalchemy import exists, select
-from sqlalchemy import text
-
-from models import Term, User
-
-
-def admin_required(f: Callable) -> Callable:
-    """Decorator to require admin access for a route."""
-
-    @wraps(f)
-    def decorated_function(*args: Any, **kwargs: Any) -> Any:
-        if not current_user.is_authenticated:
-            return redirect(url_for("login", next=request.url))
-        if not current_user.is_admin():
-            flash("Accès administrateur requis", "error")
-            return redirect(url_for("index"))
-        return f(*args, **kwargs)
-
-    return decorated_function
-
-
-class SecureAdminIndexView(AdminIndexView):
-    """Secure admin index that requires authentication."""
-
-    @expose("/")
-    @admin_required
-    def index(self):
-        """Render the admin index page with user context."""
-        # Get the current user's information
-        user_info = {"username": current_user.username, "email": current_user.email}
-
-        # Get counts for dashboard
-        users_count = User.query.count()
-        terms_count = Term.query.count()
-
-        return self.render(
-            "admin/index.html",
-            user_info=user_info,
-            users_count=users_count,
-            terms_count=terms_count,
-        )
-
-    @expose("/logout")
-    def logout(self):
-        """Custom logout route for admin panel."""
-        logout_user()
-        return redirect(url_for("index"))
-
-    @expose("/update-password")
-    @login_required
-    def update_password_view(self):
-        """Redirect to password update form."""
-        return redirect(url_for("update_password_form"))
-
-
-class SecureModelView(ModelView):
-    """Base secure model view that requires authentication."""
 
-    def is_accessible(self) -> bool:
-        return current_user.is_authenticated
+from annotate import MAX_ANNOTATE_BYTES, MAX_ANNOTATE_CHARS, get_automaton
+from catalog import CatalogSnapshot, get_snapshot
+from exports import (
+    csv_lines,
+    iter_active_terms,
+    json_array_chunks,
+    ndjson_lines,
+    send_published_export,
+    xml_chunks,
+)
+from facets import facets_payload, get_facet_index
+from lookup import MAX_BATCH_ITEMS, get_exact_index
+from models import Term
+from paging import (
+    PagingError,
+    keyset_page,
+    page_response,
+    parse_fields,
+    parse_limit,
+    ranked_page,
+    wants_page,
+)
+from responses import snapshot_json_response
+from search import find_term_ids
+from search_cache import init_search_cache, normalize_query
+from storage import read_session
+from suggest import DEFAULT_SUGGESTIONS, MAX_SUGGESTIONS, get_prefix_index
+from warmup import readiness
 
-    def inaccessible_callback(self, name: str, **kwargs: Any) -> Response:
-        return redirect(url_for("login", next=request.url))
 
+# Headers of a search response that are stored along with its body
+SEARCH_CACHED_HEADERS = ("X-Total-Count", "X-Next-Cursor", "Link", "X-Search-Fallback")
 
-class UserAdminView(SecureModelView):
-    """Admin interface for User model."""
 
-    column_list = ["id", "username", "email"]
-    column_searchable_list = ["username", "email"]
-    column_filters = ["username", "email"]
-    form_excluded_columns = ["password"]
-    can_create = True
-    can_edit = True
-    can_delete = True
-    page_size = 50
+def all_terms(snapshot: CatalogSnapshot) -> List[Dict[str, Any]]:
+    """Payload of the bulk endpoints: every active term, ordered by english_term."""
+    return list(snapshot.terms)
 
-    def on_model_change(self, form: Any, model: User, is_created: bool) -> None:
-        """Hash password when creating/editing users through admin."""
-        if is_created or form.password.data:
-            model.password = (
-                Bcrypt()
-                .generate_password_hash(form.password.data.encode("utf-8"))
-                .decode("utf-8")
-            )
 
+def register_routes(app: Flask) -> None:
+    """Register the public routes."""
 
-class TermAdminView(SecureModelView):
-    """Admin interface for Term model."""
-
-    column_list = [
-        "tid",
-        "english_term",
-        "french_term",
-        "subdomains_en",
-        "subdomains_fr",
-        "is_active",
-    ]
-    column_searchable_list = ["english_term", "french_term", "domain_en", "domain_fr"]
-    column_filters = [
-        "domain_en",
-        "domain_fr",
-        "semantic_label_en",
-        "semantic_label_fr",
-    ]
-    can_create = True
-    can_edit = True
-    can_delete = True
-    page_size = 50
-
-
-def register_routes(app: Flask, db: SQLAlchemy, bcrypt: Bcrypt) -> None:
-    """Register all routes and admin views."""
-
-    # Initialize Flask-Admin with secure index
-    admin = Admin(
-        app,
-        name="GloTechT",
-        template_mode="bootstrap4",
-        index_view=SecureAdminIndexView(name="Tableau de bord"),
-        # index_view=SecureAdminIndexView()
-    )
-
-    # Add secure model views
-    admin.add_view(UserAdminView(User, db.session, name="Administrateurs"))
-    admin.add_view(TermAdminView(Term, db.session, name="Termes"))
+    search_cache = init_search_cache(app)
 
     # Public routes
     @app.route("/")
@@ -190,98 +97,211 @@ def register_routes(app: Flask, db: SQLAlchemy, bcrypt: Bcrypt) -> None:
     @cross_origin()
     def search_terms() -> Tuple[Response, int]:
         """Public API endpoint for searching terms."""
-        query = request.args.get("q", "").strip()
         search_type = request.args.get("type", "term")
+        query = normalize_query(request.args.get("q", ""))
 
         if not query:
             return jsonify([]), 200
 
-        try:
-            base_query = Term.query.filter(Term.is_active == True)
-
-            if search_type == "term":
-                base_query = base_query.filter(
-                    db.or_(
-                        Term.english_term.ilike(f"%{query}%"),
-                        Term.french_term.ilike(f"%{query}%")
-                    )
+        def compute() -> Tuple[bytes, List[Tuple[str, str]]]:
+            tids = find_term_ids(query, search_type)
+            fallback = None
+            if not tids and search_type == "term":
+                # Nothing matched as typed: retry tolerating typos
+                tids = find_term_ids(query, "fuzzy")
+                fallback = "fuzzy"
+
+            if wants_page():
+                rows, next_cursor = ranked_page(
+                    tids,
+                    parse_fields(request.args.get("fields")),
+                    parse_limit(request.args.get("limit")),
+                    request.args.get("cursor"),
                 )
-            elif search_type == "class":
-                base_query = base_query.filter(
-                    db.or_(
-                        Term.semantic_label_en.ilike(f"%{query}%"),
-                        Term.semantic_label_fr.ilike(f"%{query}%")
-                    )
-                )
-            elif search_type == "synonym":
-                base_query = base_query.filter(
-                    db.or_(
-                        Term.synonym_en.ilike(f"%{query}%"),
-                        Term.synonym_fr.ilike(f"%{query}%"),
-                        Term.near_synonym_en.ilike(f"%{query}%"),
-                        Term.near_synonym_fr.ilike(f"%{query}%")
-                    )
-                )
-            elif search_type == "subdomain":
-                # For array fields in SQLite, use json_each with EXISTS and text() for explicit SQL
-                base_query = base_query.filter(
-                    db.or_(
-                        exists(select(1).select_from(func.json_each(Term.subdomains_en)).where(text("lower(value) LIKE lower(:query)"))),
-                        exists(select(1).select_from(func.json_each(Term.subdomains_fr)).where(text("lower(value) LIKE lower(:query)")))
-                    )
-                ).params(query=f"%{query}%") # Bind the query parameter once for both EXISTS clauses
-
-            results = [term.to_dict() for term in base_query.all()]
-            return jsonify(results), 200
+                response = page_response(rows, len(tids), next_cursor)
+            else:
+                by_tid = get_snapshot().by_tid
+                response = jsonify([by_tid[tid] for tid in tids if tid in by_tid])
+
+            if fallback:
+                response.headers["X-Search-Fallback"] = fallback
+            headers = [
+                (name, value) for name, value in response.headers.items()
+                if name in SEARCH_CACHED_HEADERS
+            ]
+            return response.get_data(), headers
+
+        try:
+            paging_args = tuple(request.args.get(name) for name in ("fields", "limit", "cursor"))
+            body, headers = search_cache.get_or_compute(
+                get_snapshot().version, (query, search_type, paging_args), compute
+            )
+            return Response(body, mimetype="application/json", headers=headers), 200
 
+        except PagingError as e:
+            return jsonify({"error": str(e)}), 400
         except Exception as e:
             app.logger.error(f"Search error: {str(e)}")
             return jsonify({"error": f"An error occurred during search: {str(e)}"}), 500
 
-    # Admin-only routes
-    @app.route("/login", methods=["GET", "POST"])
-    def login() -> Union[str, Response]:
-        """Admin login page."""
-        if current_user.is_authenticated:
-            return redirect(url_for("admin.index"))
+    @app.route("/api/terms/suggest", methods=["GET"])
+    @cross_origin()
+    def suggest_terms() -> Tuple[Response, int]:
+        """
+        Autocomplete: the terms, variants and synonyms starting with "prefix",
+        served from a per-worker prefix index rebuilt on catalog change.
+        """
+        prefix = request.args.get("prefix", "").strip()
+        lang = request.args.get("lang")
+        if lang not in (None, "en", "fr"):
+            return jsonify({"error": "lang must be 'en' or 'fr'"}), 400
+
+        try:
+            limit = min(int(request.args.get("limit", DEFAULT_SUGGESTIONS)), MAX_SUGGESTIONS)
+        except ValueError:
+            return jsonify({"error": "Invalid limit"}), 400
+        if limit < 1:
+            return jsonify({"error": "limit must be at least 1"}), 400
 
-        if request.method == "GET":
-            return render_template("login.html")
+        index = get_prefix_index(get_snapshot())
+        return jsonify(index.suggest(prefix, limit, lang)), 200
 
-        email = request.form.get("email")
-        password = request.form.get("password")
+    @app.route("/api/terms/batch", methods=["POST"])
+    @cross_origin()
+    def batch_lookup_terms() -> Tuple[Response, int]:
+        """
+        Resolve many term IDs and/or exact term strings in one request.
 
-        if not email or not password:
-            flash("Email et mot de passe requis", "error")
-            return render_template("login.html"), 400
+        Body: {"tids": [int, ...], "terms": [str, ...], "fields": "a,b"}.
+        Strings match English or French terms, variants and synonyms,
+        ignoring accents and case. Unknown tids map to null, unmatched
+        strings to an empty list, and both are listed in "not_found".
+        """
+        payload = request.get_json(silent=True)
+        if not isinstance(payload, dict):
+            return jsonify({"error": "Expected a JSON object with 'tids' and/or 'terms'"}), 400
+
+        tids = payload.get("tids") or []
+        terms = payload.get("terms") or []
+        if (
+            not isinstance(tids, list)
+            or not isinstance(terms, list)
+            # bool is a subclass of int, but true is not a term ID
+            or not all(isinstance(tid, int) and not isinstance(tid, bool) for tid in tids)
+            or not all(isinstance(term, str) for term in terms)
+        ):
+            return jsonify({"error": "'tids' must be a list of integers and 'terms' a list of strings"}), 400
+        if len(tids) + len(terms) > MAX_BATCH_ITEMS:
+            return jsonify({"error": f"At most {MAX_BATCH_ITEMS} items per batch"}), 400
+        if not isinstance(payload.get("fields"), (str, type(None))):
+            return jsonify({"error": "'fields' must be a comma-separated string"}), 400
 
         try:
-            user = User.query.filter_by(email=email).first()
-            if not user:
-                flash("Email ou mot de passe incorrect", "error")
-                return render_template("login.html"), 401
-
-            password_bytes = password.encode("utf-8")
-            if bcrypt.check_password_hash(user.password, password_bytes):
-                login_user(user)
-                next_page = request.args.get("next")
-                if next_page and not next_page.startswith("/"):
-                    next_page = None
-                return redirect(next_page or url_for("admin.index"))
-
-            flash("Email ou mot de passe incorrect", "error")
-            return render_template("login.html"), 401
+            fields = parse_fields(payload.get("fields"))
+        except PagingError as e:
+            return jsonify({"error": str(e)}), 400
+
+        snapshot = get_snapshot()
+        index = get_exact_index(snapshot)
+
+        def project(tid: int) -> Dict[str, Any]:
+            term = snapshot.by_tid[tid]
+            return {field: term[field] for field in fields}
+
+        not_found = []
+        tid_results = {}
+        for tid in tids:
+            tid_results[str(tid)] = project(tid) if tid in snapshot.by_tid else None
+            if tid not in snapshot.by_tid:
+                not_found.append(str(tid))
+
+        term_results = {}
+        for term in terms:
+            term_results[term] = [project(tid) for tid in index.find(term)]
+            if not term_results[term]:
+                not_found.append(term)
+
+        return jsonify({"tids": tid_results, "terms": term_results, "not_found": not_found}), 200
 
+    @app.route("/api/annotate", methods=["POST"])
+    @cross_origin()
+    def annotate_document() -> Tuple[Response, int]:
+        """
+        Find every glossary term occurring in an English or French document.
+
+        Body: {"text": "..."} or a text/plain document. Returns the
+        occurrences with their character offsets and the matching terms.
+        """
+        # Refuse oversized bodies before buffering them
+        chunked = "chunked" in request.headers.get("Transfer-Encoding", "").lower()
+        if request.content_length is None and chunked:
+            return jsonify({"error": "A Content-Length header is required"}), 411
+        if (request.content_length or 0) > MAX_ANNOTATE_BYTES:
+            return jsonify({"error": f"Documents are limited to {MAX_ANNOTATE_CHARS} characters"}), 413
+
+        if request.mimetype == "text/plain":
+            document = request.get_data(as_text=True)
+        else:
+            payload = request.get_json(silent=True)
+            document = payload.get("text") if isinstance(payload, dict) else None
+
+        if not isinstance(document, str):
+            return jsonify({"error": "Expected a JSON object with 'text' or a text/plain body"}), 400
+        if len(document) > MAX_ANNOTATE_CHARS:
+            return jsonify({"error": f"Documents are limited to {MAX_ANNOTATE_CHARS} characters"}), 413
+
+        try:
+            snapshot = get_snapshot()
+            annotations = get_automaton(snapshot).annotate(document, snapshot)
+            return jsonify({"annotations": annotations}), 200
         except Exception as e:
-            app.logger.error(f"Login error: {str(e)}")
-            flash("Une erreur s'est produite", "error")
-            return render_template("login.html"), 500
+            app.logger.error(f"Annotation error: {str(e)}")
+            return jsonify({"error": f"An error occurred during annotation: {str(e)}"}), 500
 
-    @app.route("/logout")
-    def logout() -> Response:
-        """Admin logout."""
-        logout_user()
-        return redirect(url_for("index"))
+    @app.route("/api/ready", methods=["GET"])
+    def get_readiness() -> Tuple[Response, int]:
+        """
+        Readiness probe for load balancers: 503 until the caches of this
+        process are warm, then 200, with the warm-up status as the body.
+        """
+        status = readiness(app)
+        return jsonify(status), 200 if status["ready"] else 503
+
+    @app.route("/api/terms/facets", methods=["GET"])
+    @cross_origin()
+    def get_term_facets() -> Union[Response, Tuple[Response, int]]:
+        """
+        Count the matching terms per subdomain, domain and semantic label.
+        Accepts the same q/type parameters as /api/terms/search; without q,
+        the counts cover every active term and are cached per catalog version.
+        """
+        query = request.args.get("q", "").strip()
+        search_type = request.args.get("type", "term")
+
+        try:
+            snapshot = get_snapshot()
+            index = get_facet_index(snapshot)
+            if not query:
+                return snapshot_json_response(
+                    snapshot,
+                    "facets",
+                    lambda snapshot: facets_payload(index.count(), len(snapshot.terms)),
+                )
+
+            tids = find_term_ids(query, search_type)
+            fallback = None
+            if not tids and search_type == "term":
+                # Nothing matched as typed: retry tolerating typos
+                tids = find_term_ids(query, "fuzzy")
+                fallback = "fuzzy"
+            response = jsonify(facets_payload(index.count(tids), len(tids)))
+            if fallback:
+                response.headers["X-Search-Fallback"] = fallback
+            return response, 200
+
+        except Exception as e:
+            app.logger.error(f"Facets error: {str(e)}")
+            return jsonify({"error": f"An error occurred while counting facets: {str(e)}"}), 500
 
     @app.route("/api")
     def root() -> Tuple[Response, Literal[200]]:
@@ -302,93 +322,66 @@ def register_routes(app: Flask, db: SQLAlchemy, bcrypt: Bcrypt) -> None:
         )
 
     @app.route("/api/terms", methods=["GET"])
-    def get_terms() -> Tuple[Response, Literal[200]]:
+    def get_terms() -> Response:
         """
         Get all terms from the glossary database.
         Public endpoint - no authentication required.
+        The encoded body is cached per catalog version and served with an ETag.
+        With limit/cursor/fields, returns one keyset page of the requested columns.
+        With Accept: application/x-ndjson (or format=ndjson) or stream=1, the
+        terms are streamed from the database as they are serialized.
         """
-        terms = Term.query.filter(Term.is_active == True).all()
-        return jsonify([term.to_dict() for term in terms]), 200
+        if wants_ndjson():
+            return Response(
+                stream_with_context(ndjson_lines(iter_active_terms())),
+                mimetype="application/x-ndjson",
+            )
+        if request.args.get("stream") == "1":
+            return Response(
+                stream_with_context(json_array_chunks(iter_active_terms())),
+                mimetype="application/json",
+            )
+        if wants_page():
+            return get_terms_page()
+        return snapshot_json_response(get_snapshot(), "terms", all_terms)
+
+    def wants_ndjson() -> bool:
+        """Tell whether the client asked for newline-delimited JSON."""
+        if request.args.get("format") == "ndjson":
+            return True
+        best = request.accept_mimetypes.best_match(["application/json", "application/x-ndjson"])
+        return best == "application/x-ndjson"
+
+    def get_terms_page() -> Response:
+        """One page of /api/terms or /api/terms/list, ordered by (english_term, tid)."""
+        try:
+            rows, next_cursor = keyset_page(
+                parse_fields(request.args.get("fields")),
+                parse_limit(request.args.get("limit")),
+                request.args.get("cursor"),
+            )
+        except PagingError as e:
+            return jsonify({"error": str(e)}), 400
+        return page_response(rows, len(get_snapshot().terms), next_cursor)
 
     @app.route("/api/terms/xml", methods=["GET"])
     def get_terms_xml() -> Response:
-        """Get all terms in XML format."""
-        terms = Term.query.filter(Term.is_active == True).all()
-        
-        # Create XML structure
-        xml_data = ['<?xml version="1.0" encoding="UTF-8"?>']
-        xml_data.append('<terms>')
-        
-        for term in terms:
-            xml_data.append('  <term>')
-            term_dict = term.to_dict()
-            for key, value in term_dict.items():
-                if value:  # Only include non-None values
-                    # Escape special characters and wrap in CDATA if needed
-                    if isinstance(value, str) and any(char in value for char in '<>&'):
-                        value = f'<![CDATA[{value}]]>'
-                    xml_data.append(f'    <{key}>{value}</{key}>')
-            xml_data.append('  </term>')
-        
-        xml_data.append('</terms>')
-        
-        # Join all lines and create response
-        xml_content = '\n'.join(xml_data)
-        response = Response(xml_content, mimetype='application/xml')
+        """
+        Get all terms in XML format.
+        Served from the published export when there is one for the current
+        catalog version, otherwise streamed one term at a time.
+        """
+        published = send_published_export(get_snapshot().version, "xml")
+        if published is not None:
+            return published
+
+        response = Response(
+            stream_with_context(xml_chunks(iter_active_terms())),
+            mimetype="application/xml",
+        )
         response.headers['Content-Disposition'] = 'attachment; filename=glotecht_terms.xml'
-        
         return response
 
-    @app.route("/update_password/<int:user_id>", methods=["POST"])
-    def update_password(user_id: int) -> Response:
-        """Update user password with proper hashing."""
-        try:
-            if current_user.id != user_id:
-                return jsonify({"error": "Unauthorized"}), 403
-
-            old_password = request.form.get("old_password")
-            new_password = request.form.get("new_password")
-
-            if not old_password or not new_password:
-                flash("Les deux mots de passe sont requis", "error")
-                return render_template("update_password.html"), 400
-
-            user = User.query.get(user_id)
-            if not user:
-                flash("Utilisateur non trouvé", "error")
-                return render_template("update_password.html"), 404
-
-            # Verify old password
-            if not bcrypt.check_password_hash(
-                user.password, old_password.encode("utf-8")
-            ):
-                flash("Le mot de passe actuel est incorrect", "error")
-                return render_template("update_password.html"), 401
-
-            password_bytes = new_password.encode("utf-8")
-            hashed_password = bcrypt.generate_password_hash(password_bytes).decode(
-                "utf-8"
-            )
-            user.password = hashed_password
-
-            db.session.commit()
-            flash("Mot de passe mis à jour avec succès", "success")
-            return redirect(url_for("admin.index"))
-
-        except Exception as e:
-            db.session.rollback()
-            app.logger.error(f"Password update error: {str(e)}")
-            flash("Une erreur s'est produite", "error")
-            return render_template("update_password.html"), 500
-
-    @app.route("/update_password_form")
-    def update_password_form() -> str:
-        """Display the password update form."""
-        if not current_user.is_authenticated:
-            flash("Veuillez vous connecter pour modifier votre mot de passe", "error")
-            return redirect(url_for("login"))
-        return render_template("update_password.html")
-
     @app.errorhandler(404)
     def page_not_found(e):
         """404 - Not Found page."""
@@ -397,10 +390,13 @@ def register_routes(app: Flask, db: SQLAlchemy, bcrypt: Bcrypt) -> None:
     @app.route("/api/terms/list", methods=["GET"])
     def get_terms_list():
         try:
+            if wants_page():
+                return get_terms_page()
+
             # Query all terms and return all details, ordered by english_term
-            terms = Term.query.filter(Term.is_active == True).order_by(Term.english_term).all()
-            terms_list = [term.to_dict() for term in terms]
-            return jsonify(terms_list), 200
+            # The snapshot is already ordered by english_term, so /api/terms
+            # and /api/terms/list share the same cached body
+            return snapshot_json_response(get_snapshot(), "terms", all_terms)
         except Exception as e:
             app.logger.error(f"Error retrieving terms list: {str(e)}")
             return jsonify({"error": "Failed to retrieve terms list"}), 500
@@ -409,7 +405,7 @@ def register_routes(app: Flask, db: SQLAlchemy, bcrypt: Bcrypt) -> None:
     def get_semantic_labels():
         try:
             # Query only the semantic labels, ordered by English label
-            labels = db.session.query(
+            labels = read_session().query(
                 Term.semantic_label_en,
                 Term.semantic_label_fr
             ).filter(
@@ -442,30 +438,38 @@ def register_routes(app: Flask, db: SQLAlchemy, bcrypt: Bcrypt) -> None:
 
     @app.route("/api/terms/csv")
     def get_terms_csv() -> Response:
-        """Get all terms in CSV format."""
-        terms = Term.query.filter(Term.is_active == True).all()
-        
-        # Convert to list of dictionaries
-        terms_list = [term.to_dict() for term in terms]
-        
-        if not terms_list:
-            return Response("No terms found", mimetype='text/csv')
-        
-        # Get headers from the first term
-        headers = list(terms_list[0].keys())
-        
-        # Create CSV in memory
-        output = StringIO()
-        writer = csv.DictWriter(output, fieldnames=headers)
-        
-        # Write headers and data
-        writer.writeheader()
-        writer.writerows(terms_list)
-        
-        # Create response
-        response = Response(output.getvalue(), mimetype='text/csv')
+        """
+        Get all terms in CSV format.
+        Served from the published export when there is one for the current
+        catalog version, otherwise streamed one term at a time.
+        """
+        published = send_published_export(get_snapshot().version, "csv")
+        if published is not None:
+            return published
+
+        response = Response(
+            stream_with_context(csv_lines(iter_active_terms())),
+            mimetype='text/csv',
+        )
         response.headers['Content-Disposition'] = 'attachment; filename=glotecht_terms.csv'
-        
+        return response
+
+    @app.route("/api/terms/json")
+    def get_terms_json() -> Response:
+        """
+        Get all terms as a JSON file download.
+        Served from the published export when there is one for the current
+        catalog version, otherwise streamed one term at a time.
+        """
+        published = send_published_export(get_snapshot().version, "json")
+        if published is not None:
+            return published
+
+        response = Response(
+            stream_with_context(json_array_chunks(iter_active_terms())),
+            mimetype='application/json',
+        )
+        response.headers['Content-Disposition'] = 'attachment; filename=glotecht_terms.json'
         return response
 
     @app.route("/api/terms/<int:tid>", methods=["GET"])
@@ -480,11 +484,11 @@ def register_routes(app: Flask, db: SQLAlchemy, bcrypt: Bcrypt) -> None:
         """
         try:
             # Fetch the Term with the given term ID
-            term = Term.query.filter_by(tid=tid, is_active=True).first()
+            term = get_snapshot().by_tid.get(tid)
             if not term:
                 return jsonify({"error": f"Term with ID {tid} not found."}), 404
 
-            return jsonify(term.to_dict()), 200
+            return jsonify(term), 200
 
         except Exception as e:
             return jsonify({"error": f"An unexpected error occurred: {str(e)}"}), 500
\ No newline at end of file
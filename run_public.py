@@ -0,0 +1,18 @@
+"""
+This file runs the public application: the pages and the read-only API,
+without the admin interface (gunicorn -c gunicorn_config.py run_public:flask_app).
+"""
+
+from __future__ import annotations
+
+from flask import Flask
+
+from app import create_app
+
+# Create an instance of the public Flask application
+flask_app: Flask = create_app(profile="public")
+
+
+if __name__ == "__main__":
+    # Run the application in debug mode
+    flask_app.run(host="0.0.0.0", debug=False, port=5000)
@@ -0,0 +1,272 @@
+"""
+This file contains the full-text search helpers for the glossary.
+"""
+
+from __future__ import annotations
+
+import re
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from sqlalchemy import ColumnElement, and_, case, column, false, or_, select, text, union
+
+from catalog import CatalogSnapshot, get_snapshot
+from fuzzy import get_trigram_index
+from models import Term, TermSubdomain
+from normalize import fold
+from storage import read_session
+
+# Columns of the "terms_fts" virtual table, in declaration order, with the
+# weight given to each of them by bm25() (a hit on the term itself ranks
+# above a hit on a synonym, which ranks above a hit in a definition).
+FTS_COLUMNS: Tuple[Tuple[str, float], ...] = (
+    ("english_term", 10.0),
+    ("french_term", 10.0),
+    ("variant_en", 6.0),
+    ("variant_fr", 6.0),
+    ("synonym_en", 4.0),
+    ("synonym_fr", 4.0),
+    ("near_synonym_en", 3.0),
+    ("near_synonym_fr", 3.0),
+    ("definition_en", 1.0),
+    ("definition_fr", 1.0),
+)
+
+# Columns searched for each value of the "type" parameter of /api/terms/search
+FTS_SCOPES: Dict[str, Tuple[str, ...]] = {
+    "term": ("english_term", "french_term", "variant_en", "variant_fr"),
+    "synonym": ("synonym_en", "synonym_fr", "near_synonym_en", "near_synonym_fr"),
+    "fulltext": tuple(column for column, _ in FTS_COLUMNS),
+}
+
+# Words as seen by the unicode61 tokenizer
+TOKEN_PATTERN = re.compile(r"\w+", re.UNICODE)
+
+
+def build_match_expression(query: str, columns: Optional[Sequence[str]] = None) -> str:
+    """
+    Build an FTS5 MATCH expression from a free-text user query.
+
+    Every word of the query becomes a quoted prefix token, so that the user
+    input can never be interpreted as FTS5 syntax and so that partial words
+    typed in the search box already match.
+
+    Input:  query (str)                 | the raw user query
+            columns (Sequence[str])     | restrict the match to these columns
+    Output: the MATCH expression, or an empty string if the query has no words
+    """
+    tokens = TOKEN_PATTERN.findall(query)
+    if not tokens:
+        return ""
+
+    expression = " ".join(f'"{token}"*' for token in tokens)
+    if columns:
+        expression = f"{{{' '.join(columns)}}} : ({expression})"
+    return expression
+
+
+def match_search_keys(query: str, limit: Optional[int] = None) -> List[int]:
+    """
+    Look the query up in the folded English & French term keys.
+
+    Both lookups are index seeks: the exact match is an equality on the key and
+    the prefix match a range on it ("reseau" <= key < "reseau\U0010ffff"),
+    so neither depends on LIKE or lower() and accents are ignored.
+
+    Input:  query (str) | the raw user query
+            limit (int) | maximum number of IDs to return
+    Output: the term IDs, exact matches first, then prefix matches
+    """
+    key = fold(query)
+    if not key:
+        return []
+
+    upper = key + "\U0010ffff"
+    exact = or_(Term.english_term_norm == key, Term.french_term_norm == key)
+    statement = (
+        select(Term.tid)
+        .where(
+            Term.is_active == True,
+            or_(
+                and_(Term.english_term_norm >= key, Term.english_term_norm < upper),
+                and_(Term.french_term_norm >= key, Term.french_term_norm < upper),
+            ),
+        )
+        .order_by(case((exact, 0), else_=1), Term.english_term_norm, Term.tid)
+        .limit(limit)
+    )
+    return list(read_session().execute(statement).scalars())
+
+
+def search_term_ids(query: str, scope: str = "term", limit: Optional[int] = None) -> List[int]:
+    """
+    Search the glossary and return the IDs of the matching active terms.
+
+    For the "term" scope, exact and prefix matches on the folded keys come
+    first, followed by the other full-text hits.
+
+    Input:  query (str)     | the raw user query
+            scope (str)     | one of the keys of FTS_SCOPES
+            limit (int)     | maximum number of IDs to return
+    Output: the term IDs, best match first
+    """
+    if scope == "term":
+        tids = match_search_keys(query, limit)
+        if limit is not None and len(tids) >= limit:
+            return tids
+        seen = set(tids)
+        tids.extend(tid for tid in search_fts_ids(query, scope, limit) if tid not in seen)
+        return tids[:limit] if limit is not None else tids
+
+    return search_fts_ids(query, scope, limit)
+
+
+def search_fts_ids(query: str, scope: str = "term", limit: Optional[int] = None) -> List[int]:
+    """
+    Search the full-text index and return the IDs of the matching active terms.
+
+    Input:  query (str)     | the raw user query
+            scope (str)     | one of the keys of FTS_SCOPES
+            limit (int)     | maximum number of IDs to return
+    Output: the term IDs, best BM25 match first
+    """
+    expression = build_match_expression(query, FTS_SCOPES[scope])
+    if not expression:
+        return []
+
+    weights = ", ".join(str(weight) for _, weight in FTS_COLUMNS)
+    sql = (
+        "SELECT terms.tid FROM terms_fts "
+        "JOIN terms ON terms.tid = terms_fts.rowid "
+        "WHERE terms_fts MATCH :expression AND terms.is_active = 1 "
+        f"ORDER BY bm25(terms_fts, {weights}), terms.tid"
+    )
+    params: Dict[str, object] = {"expression": expression}
+    if limit is not None:
+        sql += " LIMIT :limit"
+        params["limit"] = limit
+
+    return [row[0] for row in read_session().execute(text(sql), params)]
+
+
+def term_search_condition(query: str, scope: str = "term") -> ColumnElement[bool]:
+    """
+    Build a WHERE condition matching the terms found by a search, active or not.
+
+    The condition combines the prefix ranges on the folded keys with a
+    sub-select on the full-text index, so it can be counted, sorted and
+    paged by the caller (the admin list) without loading the IDs.
+
+    Input:  query (str) | the raw user query
+            scope (str) | one of the keys of FTS_SCOPES
+    Output: the condition on Term (false() if the query has no words)
+    """
+    conditions = []
+    key = fold(query)
+    if key and scope == "term":
+        upper = key + "\U0010ffff"
+        conditions.append(and_(Term.english_term_norm >= key, Term.english_term_norm < upper))
+        conditions.append(and_(Term.french_term_norm >= key, Term.french_term_norm < upper))
+
+    expression = build_match_expression(query, FTS_SCOPES[scope])
+    if expression:
+        matches = text("SELECT rowid FROM terms_fts WHERE terms_fts MATCH :expression")
+        conditions.append(
+            Term.tid.in_(matches.bindparams(expression=expression).columns(column("rowid")))
+        )
+
+    return or_(*conditions) if conditions else false()
+
+
+def subdomain_keys(snapshot: CatalogSnapshot) -> Tuple[str, ...]:
+    """
+    Return the distinct folded subdomains of the active terms, as stored in term_subdomains.
+
+    Input:  snapshot (CatalogSnapshot)  | the current snapshot
+    Output: the folded subdomains, sorted
+    """
+    keys = set()
+    for term in snapshot.terms:
+        for subdomain in (*(term["subdomains_en"] or []), *(term["subdomains_fr"] or [])):
+            key = fold(subdomain) if isinstance(subdomain, str) else None
+            if key:
+                keys.add(key)
+    return tuple(sorted(keys))
+
+
+def semantic_labels(snapshot: CatalogSnapshot) -> Tuple[Tuple[str, ...], Tuple[str, ...]]:
+    """
+    Return the distinct English and French semantic labels of the active terms.
+
+    Input:  snapshot (CatalogSnapshot)  | the current snapshot
+    Output: a tuple (English labels, French labels), each sorted
+    """
+    labels_en = {term["semantic_label_en"] for term in snapshot.terms if term["semantic_label_en"]}
+    labels_fr = {term["semantic_label_fr"] for term in snapshot.terms if term["semantic_label_fr"]}
+    return tuple(sorted(labels_en)), tuple(sorted(labels_fr))
+
+
+def filter_term_ids(query: str, search_type: str) -> List[int]:
+    """
+    Search the columns that are not in the full-text index.
+
+    Input:  query (str)         | the raw user query
+            search_type (str)   | "class" (case-insensitive substring), "subdomain"
+                                  (accent-insensitive substring),
+                                  or anything else for every term
+    Output: the IDs of the matching active terms, ordered by english_term
+    """
+    base_query = read_session().query(Term).filter(Term.is_active == True)
+
+    if search_type == "class":
+        # Case-insensitive substring match on the few distinct labels, then
+        # index seeks on the matching ones (a sub-select, so that the planner
+        # does not walk every active term instead)
+        labels_en, labels_fr = get_snapshot().derived("semantic_labels", semantic_labels)
+        key = query.lower()
+        base_query = base_query.filter(
+            Term.tid.in_(
+                union(
+                    select(Term.tid).where(
+                        Term.semantic_label_en.in_([label for label in labels_en if key in label.lower()])
+                    ),
+                    select(Term.tid).where(
+                        Term.semantic_label_fr.in_([label for label in labels_fr if key in label.lower()])
+                    ),
+                )
+            )
+        )
+    elif search_type == "subdomain":
+        # Substring match on the few distinct subdomains, then an index seek
+        # on term_subdomains for the matching ones ("data" finds "Big Data")
+        key = fold(query)
+        matches = [
+            subdomain for subdomain in get_snapshot().derived("subdomain_keys", subdomain_keys)
+            if key in subdomain
+        ]
+        base_query = base_query.filter(
+            Term.tid.in_(
+                select(TermSubdomain.tid).where(TermSubdomain.subdomain_norm.in_(matches))
+            )
+        )
+
+    base_query = base_query.with_entities(Term.tid).order_by(Term.english_term, Term.tid)
+    return [row.tid for row in base_query.all()]
+
+
+def find_term_ids(query: str, search_type: str = "term") -> List[int]:
+    """
+    Run a search of /api/terms/search and return the matching term IDs.
+
+    Terms, synonyms and definitions go through the FTS5 index, ranked by
+    BM25; "fuzzy" goes through the trigram index; the other search types
+    filter the terms table.
+
+    Input:  query (str)         | the raw user query
+            search_type (str)   | the "type" parameter of the search
+    Output: the IDs of the matching active terms, best match first
+    """
+    if search_type == "fuzzy":
+        return get_trigram_index(get_snapshot()).search(query)
+    if search_type in FTS_SCOPES:
+        return search_term_ids(query, search_type)
+    return filter_term_ids(query, search_type)
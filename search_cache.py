@@ -0,0 +1,159 @@
+"""
+This file contains the cache of the /api/terms/search responses.
+
+Entries are kept for at most SEARCH_CACHE_TTL seconds, the least recently
+used ones are evicted beyond SEARCH_CACHE_SIZE, and all of them are dropped
+when the catalog version changes. Identical searches arriving while one is
+being computed wait for its result instead of computing it again.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+from flask import Flask
+
+# Number of search responses kept in memory (0 disables the cache)
+DEFAULT_CACHE_SIZE = 1024
+
+# Seconds an entry is served, even if the catalog did not change
+DEFAULT_TTL = 300.0
+
+
+def normalize_query(query: str) -> str:
+    """
+    Normalize a search query so that equivalent spellings share a cache entry.
+
+    Every search type ignores case, and the searches are run on the
+    normalized query too, so a cached response is always the one its key
+    would compute.
+
+    Input:  query (str) | the raw user query
+    Output: the query in NFC form, lowercased, with single spaces
+    """
+    return " ".join(unicodedata.normalize("NFC", query).split()).lower()
+
+
+class InFlight:
+    """
+    A computation that identical lookups wait for.
+
+    Attributes:
+        done (threading.Event): set once the value or the error is known.
+        value (Any): the computed value.
+        error (BaseException): the exception raised by the computation, if any.
+    """
+
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.value: Any = None
+        self.error: Optional[BaseException] = None
+
+
+class SearchResultCache:
+    """
+    A bounded LRU cache with a TTL, cleared when the catalog version changes.
+
+    Lookups that miss while the same key is being computed by another thread
+    wait for that computation (they are counted as hits, since they do not
+    compute anything).
+    """
+
+    def __init__(self, size: int, ttl: float) -> None:
+        self.size = size
+        self.ttl = ttl
+        self.version: Optional[int] = None
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self._entries: OrderedDict[Hashable, Tuple[float, Any]] = OrderedDict()
+        self._in_flight: Dict[Tuple[int, Hashable], InFlight] = {}
+        self._lock = threading.Lock()
+
+    def get_or_compute(self, version: int, key: Hashable, compute: Callable[[], Any]) -> Any:
+        """
+        Return the cached value of a key, or compute it once for all the waiting threads.
+
+        Input:  version (int)       | the catalog version the value is computed at
+                key (Hashable)      | the key of the value
+                compute (Callable)  | computes the value; its exceptions are not cached
+        Output: the value
+        """
+        if self.size <= 0:
+            return compute()
+
+        with self._lock:
+            if version != self.version:
+                self.version = version
+                self._entries.clear()
+            entry = self._entries.get(key)
+            if entry is not None:
+                if entry[0] > time.monotonic():
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return entry[1]
+                del self._entries[key]
+
+            flight = self._in_flight.get((version, key))
+            leader = flight is None
+            if leader:
+                flight = self._in_flight[(version, key)] = InFlight()
+                self.misses += 1
+            else:
+                self.hits += 1
+                self.coalesced += 1
+
+        if not leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.value
+
+        try:
+            flight.value = compute()
+        except BaseException as e:
+            flight.error = e
+            raise
+        else:
+            with self._lock:
+                # A value computed at an older version would be stale
+                if self.version == version:
+                    self._entries[key] = (time.monotonic() + self.ttl, flight.value)
+                    self._entries.move_to_end(key)
+                    while len(self._entries) > self.size:
+                        self._entries.popitem(last=False)
+            return flight.value
+        finally:
+            with self._lock:
+                self._in_flight.pop((version, key), None)
+            flight.done.set()
+
+    def stats(self) -> Dict[str, int]:
+        """Return the hit, miss and coalesced counters and the number of entries."""
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "coalesced": self.coalesced,
+                "entries": len(self._entries),
+            }
+
+
+def init_search_cache(app: Flask) -> SearchResultCache:
+    """
+    Create the search response cache of the application.
+
+    Configuration:
+        SEARCH_CACHE_SIZE (int): number of responses kept (0 disables the cache).
+        SEARCH_CACHE_TTL (float): seconds an entry is served.
+    """
+    cache = SearchResultCache(
+        int(app.config.get("SEARCH_CACHE_SIZE", DEFAULT_CACHE_SIZE)),
+        float(app.config.get("SEARCH_CACHE_TTL", DEFAULT_TTL)),
+    )
+    app.extensions["search_cache"] = cache
+    return cache
@@ -0,0 +1,85 @@
+"""
+This file logs the SQL statements slower than SLOW_QUERY_MS, with their
+bound parameters and the SQLite query plan.
+"""
+
+from __future__ import annotations
+
+import os
+import time
+from typing import Any, List, Optional
+
+from flask import Flask, current_app, has_app_context, has_request_context, request
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+# Default threshold in milliseconds; 0 disables the log
+DEFAULT_SLOW_QUERY_MS = 250.0
+
+# Statements whose plan can be explained
+EXPLAINABLE_PREFIXES = ("select", "with")
+
+
+def explain_query_plan(dbapi_connection: Any, statement: str, parameters: Any) -> List[str]:
+    """
+    Return the EXPLAIN QUERY PLAN lines of a statement, indented by depth.
+
+    Input:  dbapi_connection    | the sqlite3 connection that ran the statement
+            statement (str)     | the SQL
+            parameters          | its bound parameters
+    Output: the plan, one line per step ("SEARCH terms USING INDEX ...")
+    """
+    rows = dbapi_connection.execute(f"EXPLAIN QUERY PLAN {statement}", parameters or ()).fetchall()
+    depths = {0: -1}
+    lines = []
+    for node, parent, _, detail in rows:
+        depths[node] = depths.get(parent, -1) + 1
+        lines.append(f"{'  ' * depths[node]}{detail}")
+    return lines
+
+
+def start_timer(connection: Any, cursor: Any, statement: str, parameters: Any, context: Any, executemany: bool) -> None:
+    """
+    Remember when a SQL statement started.
+    """
+    connection.info["slow_query_started"] = time.perf_counter()
+
+
+def log_slow_statement(connection: Any, cursor: Any, statement: str, parameters: Any, context: Any, executemany: bool) -> None:
+    """
+    Log a statement slower than the threshold, with its query plan.
+    """
+    started = connection.info.pop("slow_query_started", None)
+    if started is None or not has_app_context():
+        return
+    threshold = current_app.config.get("SLOW_QUERY_MS") or 0
+    elapsed = (time.perf_counter() - started) * 1000
+    if threshold <= 0 or elapsed < threshold:
+        return
+
+    plan: Optional[List[str]] = None
+    if not executemany and statement.lstrip().lower().startswith(EXPLAINABLE_PREFIXES):
+        try:
+            plan = explain_query_plan(cursor.connection, statement, parameters)
+        except Exception as e:
+            plan = [f"(plan unavailable: {str(e)})"]
+
+    endpoint = request.endpoint if has_request_context() else None
+    current_app.logger.warning(
+        f"Slow query ({elapsed:.1f} ms, endpoint {endpoint}): {' '.join(statement.split())}"
+        f"\nParameters: {'<executemany>' if executemany else parameters!r}"
+        + ("\nQuery plan:\n" + "\n".join(plan) if plan else "")
+    )
+
+
+def init_slow_query_log(app: Flask) -> None:
+    """
+    Log the statements slower than SLOW_QUERY_MS milliseconds (0 disables it).
+
+    Configuration:
+        SLOW_QUERY_MS (float): the threshold, also read from the environment.
+    """
+    app.config.setdefault("SLOW_QUERY_MS", float(os.getenv("SLOW_QUERY_MS", DEFAULT_SLOW_QUERY_MS)))
+    if not event.contains(Engine, "before_cursor_execute", start_timer):
+        event.listen(Engine, "before_cursor_execute", start_timer)
+        event.listen(Engine, "after_cursor_execute", log_slow_statement)
@@ -0,0 +1,279 @@
+"""
+This file configures the SQLite storage: the pragmas applied on each
+connection, the read-only engine used by the public routes and the
+published read snapshots of the database.
+"""
+
+from __future__ import annotations
+
+import os
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from flask import Flask, current_app, g
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import QueuePool
+
+# Pragmas applied to every connection, whatever its mode
+SQLITE_PRAGMAS: Dict[str, Any] = {
+    "mmap_size": 268435456,  # 256 MiB, shared between workers through the page cache
+    "cache_size": -16384,  # 16 MiB per connection
+    "busy_timeout": 5000,  # milliseconds a writer waits for the lock
+    "temp_store": "MEMORY",
+}
+
+# Pragmas only applied to the read-write connections
+SQLITE_WRITE_PRAGMAS: Dict[str, Any] = {
+    "journal_mode": "WAL",  # readers no longer wait for the writer
+    "synchronous": "NORMAL",  # durable at each checkpoint, safe with WAL
+}
+
+# How the public routes read the database (SQLITE_READ_MODE):
+#   "primary"   | through the application engine
+#   "readonly"  | through a second engine opened with mode=ro
+#   "immutable" | from the last copy published by publish_read_snapshot()
+READ_MODES = ("primary", "readonly", "immutable")
+DEFAULT_READ_MODE = "readonly"
+
+# Number of published read snapshots kept in instance/snapshots
+SNAPSHOTS_KEPT = 2
+
+# Idle connections kept open by the read engine (more are opened when needed)
+READ_POOL_SIZE = 5
+
+_read_engine: Optional[Engine] = None
+_read_target: Optional[str] = None
+_read_engine_lock = threading.Lock()
+
+
+def database_path(app: Flask) -> str:
+    """
+    Return the path of the SQLite database, DATABASE_PATH overriding instance/glossary.db.
+    """
+    return os.path.abspath(
+        os.getenv("DATABASE_PATH") or os.path.join(app.root_path, "instance", "glossary.db")
+    )
+
+
+def apply_pragmas(dbapi_connection: sqlite3.Connection, write: bool) -> None:
+    """
+    Apply the storage pragmas to a new DB-API connection.
+
+    Input:  dbapi_connection (sqlite3.Connection)   | the connection just opened
+            write (bool)                            | True for a read-write connection
+    Output: Nothing
+    """
+    pragmas = {**SQLITE_PRAGMAS, **SQLITE_WRITE_PRAGMAS} if write else SQLITE_PRAGMAS
+    cursor = dbapi_connection.cursor()
+    try:
+        for name, value in pragmas.items():
+            cursor.execute(f"PRAGMA {name} = {value}")
+    finally:
+        cursor.close()
+
+
+def init_storage(app: Flask, db: Any) -> None:
+    """
+    Apply the pragmas to the application engine and set up the read engine.
+
+    Must be called after db.init_app(app).
+
+    Input:  app (Flask)         | the application
+            db (SQLAlchemy)     | the Flask-SQLAlchemy extension
+    Output: Nothing
+    """
+    app.config.setdefault("SQLITE_READ_MODE", os.getenv("SQLITE_READ_MODE", DEFAULT_READ_MODE))
+    if app.config["SQLITE_READ_MODE"] not in READ_MODES:
+        raise ValueError(f"SQLITE_READ_MODE must be one of {', '.join(READ_MODES)}")
+
+    with app.app_context():
+        engine = db.engine
+
+    @event.listens_for(engine, "connect")
+    def set_write_pragmas(dbapi_connection: sqlite3.Connection, connection_record: Any) -> None:
+        apply_pragmas(dbapi_connection, write=True)
+
+    @app.teardown_appcontext
+    def close_read_session(exception: Optional[BaseException]) -> None:
+        session = g.pop("read_session", None)
+        if session is not None:
+            session.close()
+
+
+def snapshots_root() -> str:
+    """
+    Return the directory holding the published read snapshots.
+    """
+    return os.path.join(current_app.instance_path, "snapshots")
+
+
+def current_snapshot_path() -> str:
+    """
+    Return the link pointing to the read snapshot in use.
+    """
+    return os.path.join(snapshots_root(), "current.db")
+
+
+def create_read_engine(target: str, immutable: bool) -> Engine:
+    """
+    Create an engine reading a database file without ever writing to it.
+
+    Input:  target (str)        | the database file
+            immutable (bool)    | True if the file never changes (no locking at all)
+    Output: the engine
+    """
+    # as_uri() percent-encodes the path, so "?" or "#" in it cannot end it early
+    uri = f"{Path(target).absolute().as_uri()}?{'immutable=1' if immutable else 'mode=ro'}"
+
+    def connect() -> sqlite3.Connection:
+        return sqlite3.connect(uri, uri=True, check_same_thread=False)
+
+    # "sqlite://" alone would select SingletonThreadPool (meant for :memory:),
+    # which closes the connections of other threads beyond its size; overflow
+    # connections are unlimited so that any number of gthread threads can read
+    engine = create_engine(
+        "sqlite://", creator=connect, poolclass=QueuePool, pool_size=READ_POOL_SIZE, max_overflow=-1
+    )
+
+    @event.listens_for(engine, "connect")
+    def set_read_pragmas(dbapi_connection: sqlite3.Connection, connection_record: Any) -> None:
+        apply_pragmas(dbapi_connection, write=False)
+
+    return engine
+
+
+def get_read_engine() -> Optional[Engine]:
+    """
+    Return the engine of the public routes, or None in "primary" mode.
+
+    In "immutable" mode, the target of the current snapshot link is checked
+    on each call: when a newer snapshot was published, the engine is
+    replaced and the connections to the previous file are closed.
+
+    Input:  Nothing
+    Output: the read engine
+    """
+    global _read_engine, _read_target
+
+    mode = current_app.config["SQLITE_READ_MODE"]
+    if mode == "primary":
+        return None
+
+    if mode == "immutable":
+        link = current_snapshot_path()
+        if not os.path.exists(link):
+            # Nothing published yet: read the live database
+            target = database_path(current_app)
+            mode = "readonly"
+        else:
+            target = os.path.realpath(link)
+    else:
+        target = database_path(current_app)
+
+    if _read_engine is not None and _read_target == target:
+        return _read_engine
+
+    with _read_engine_lock:
+        if _read_engine is None or _read_target != target:
+            previous = _read_engine
+            _read_engine = create_read_engine(target, immutable=mode == "immutable")
+            _read_target = target
+            if previous is not None:
+                previous.dispose()
+        return _read_engine
+
+
+def read_session() -> Session:
+    """
+    Return the session of the public routes for the current request.
+
+    It reads through the read engine, so public requests never take the
+    write lock and keep reading while an admin edit is being committed.
+
+    Input:  Nothing
+    Output: a Session (db.session in "primary" mode)
+    """
+    from app import db
+
+    engine = get_read_engine()
+    if engine is None:
+        return db.session
+
+    session = g.get("read_session")
+    if session is None:
+        session = g.read_session = Session(bind=engine)
+    return session
+
+
+def dispose_read_engine(close: bool = True) -> None:
+    """
+    Drop the read engine, e.g. in a forked worker.
+
+    Input:  close (bool)    | False to leave the connections of a parent process open
+    Output: Nothing
+    """
+    global _read_engine, _read_target
+
+    with _read_engine_lock:
+        if _read_engine is not None:
+            _read_engine.dispose(close=close)
+        _read_engine = None
+        _read_target = None
+
+
+def publish_read_snapshot() -> Optional[str]:
+    """
+    Copy the database to instance/snapshots and point the current link to it.
+
+    The copy is made with the SQLite backup API, so it is consistent even
+    while the database is being written, and the link is swapped with an
+    atomic rename. Only used in "immutable" mode.
+
+    Input:  Nothing
+    Output: the path of the published snapshot, or None in the other modes
+    """
+    if current_app.config["SQLITE_READ_MODE"] != "immutable":
+        return None
+
+    root = snapshots_root()
+    os.makedirs(root, exist_ok=True)
+
+    source = sqlite3.connect(f"file:{database_path(current_app)}?mode=ro", uri=True)
+    try:
+        version = source.execute("SELECT version FROM catalog_version WHERE id = 1").fetchone()
+        path = os.path.join(root, f"glossary-{version[0] if version else 0}.db")
+        staging = f"{path}.tmp"
+        destination = sqlite3.connect(staging)
+        try:
+            source.backup(destination)
+            # A snapshot is read with immutable=1, which ignores any WAL file
+            destination.execute("PRAGMA journal_mode = DELETE")
+        finally:
+            destination.close()
+    finally:
+        source.close()
+    os.replace(staging, path)
+
+    link = current_snapshot_path()
+    staging_link = f"{link}.tmp"
+    if os.path.lexists(staging_link):
+        os.remove(staging_link)
+    os.symlink(os.path.basename(path), staging_link)
+    os.replace(staging_link, link)
+
+    # Open connections keep reading the file they opened, so removing
+    # an old snapshot does not break the workers still using it
+    snapshots = sorted(
+        (entry for entry in os.scandir(root) if entry.name.startswith("glossary-") and entry.name.endswith(".db")),
+        key=lambda entry: entry.stat().st_mtime,
+        reverse=True,
+    )
+    for entry in snapshots[SNAPSHOTS_KEPT:]:
+        os.remove(entry.path)
+
+    return path
+
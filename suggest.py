@@ -0,0 +1,94 @@
+"""
+This file contains the in-memory prefix index behind /api/terms/suggest.
+"""
+
+from __future__ import annotations
+
+from bisect import bisect_left
+from typing import Any, Dict, List, Optional, Tuple
+
+from catalog import CatalogSnapshot
+from normalize import fold
+
+# Term columns offered as suggestions, with their language
+SUGGEST_FIELDS: Tuple[Tuple[str, str], ...] = (
+    ("english_term", "en"),
+    ("french_term", "fr"),
+    ("variant_en", "en"),
+    ("variant_fr", "fr"),
+    ("synonym_en", "en"),
+    ("synonym_fr", "fr"),
+)
+
+DEFAULT_SUGGESTIONS = 10
+MAX_SUGGESTIONS = 50
+
+
+class PrefixIndex:
+    """
+    Sorted arrays of folded keys searched with bisect.
+
+    Every label is indexed under its folded form and under each of its
+    inner word starts, so "network" also suggests "neural network"; matches
+    at the start of a label come before matches on an inner word.
+
+    Attributes:
+        label_keys (List[Tuple[str, str, int, str]]): (key, label, tid, lang), sorted.
+        word_keys (List[Tuple[str, str, int, str]]): the same, for inner word starts.
+    """
+
+    def __init__(self, snapshot: CatalogSnapshot) -> None:
+        label_keys = []
+        word_keys = []
+        for term in snapshot.terms:
+            for field, lang in SUGGEST_FIELDS:
+                label = term.get(field)
+                key = fold(label) if label else None
+                if not key:
+                    continue
+                label_keys.append((key, label, term["tid"], lang))
+                for position, char in enumerate(key):
+                    if char == " " and position + 1 < len(key):
+                        word_keys.append((key[position + 1:], label, term["tid"], lang))
+
+        self.label_keys = sorted(label_keys)
+        self.word_keys = sorted(word_keys)
+
+    def suggest(self, prefix: str, limit: int = DEFAULT_SUGGESTIONS, lang: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        Return the labels starting with the prefix, then those with an inner
+        word starting with it, each group in alphabetical order.
+
+        The scan stops as soon as enough suggestions are found, so the cost
+        is one bisect plus the number of suggestions returned.
+
+        Input:  prefix (str)    | what the user typed so far
+                limit (int)     | the maximum number of suggestions
+                lang (str)      | "en" or "fr" to restrict the language
+        Output: a list of {"tid", "label", "lang"}
+        """
+        key = fold(prefix)
+        if not key:
+            return []
+
+        suggestions: List[Dict[str, Any]] = []
+        seen = set()
+        for keys in (self.label_keys, self.word_keys):
+            position = bisect_left(keys, (key,))
+            while position < len(keys) and keys[position][0].startswith(key):
+                _, label, tid, label_lang = keys[position]
+                position += 1
+                if (lang is not None and label_lang != lang) or (tid, label) in seen:
+                    continue
+                seen.add((tid, label))
+                suggestions.append({"tid": tid, "label": label, "lang": label_lang})
+                if len(suggestions) == limit:
+                    return suggestions
+        return suggestions
+
+
+def get_prefix_index(snapshot: CatalogSnapshot) -> PrefixIndex:
+    """
+    Return the prefix index of a snapshot, building it once per catalog version.
+    """
+    return snapshot.derived("suggest", PrefixIndex)
@@ -0,0 +1,92 @@
+"""
+This file warms up the per-process caches (catalog snapshot, search indexes,
+encoded response bodies) so the first requests do not pay for them.
+"""
+
+from __future__ import annotations
+
+import time
+from typing import Any, Dict, Tuple
+
+from flask import Flask
+
+# Responses built during the warm-up, so their bodies (and compressed
+# variants) are cached before the first real request
+WARMUP_PATHS: Tuple[str, ...] = (
+    "/api/terms",
+    "/api/terms/facets",
+)
+
+
+def warm_up(app: Flask) -> Dict[str, Any]:
+    """
+    Build the catalog snapshot, its derived indexes and the cached bodies.
+
+    Called by gunicorn in the master before forking when preload_app is on,
+    so the workers share these structures copy-on-write, or in each worker
+    otherwise. The database connections opened here are closed afterwards,
+    since a connection must not be shared across a fork.
+
+    Input:  app (Flask) | the application
+    Output: the warm-up status, also stored in app.extensions["warmup"]
+    """
+    from annotate import get_automaton
+    from app import db
+    from catalog import get_snapshot
+    from facets import get_facet_index
+    from fuzzy import get_trigram_index
+    from lookup import get_exact_index
+    from storage import dispose_read_engine
+    from suggest import get_prefix_index
+
+    started = time.perf_counter()
+    with app.test_request_context():
+        snapshot = get_snapshot()
+        for build in (get_facet_index, get_prefix_index, get_trigram_index, get_exact_index, get_automaton):
+            build(snapshot)
+
+    client = app.test_client()
+    for path in WARMUP_PATHS:
+        response = client.get(path, headers={"Accept-Encoding": "gzip"})
+        if response.status_code != 200:
+            app.logger.error(f"Warm-up request to {path} failed with status {response.status_code}")
+
+    with app.app_context():
+        db.engine.dispose()
+    dispose_read_engine()
+
+    status = {
+        "ready": True,
+        "catalog_version": snapshot.version,
+        "terms": len(snapshot.terms),
+        "seconds": round(time.perf_counter() - started, 3),
+    }
+    app.extensions["warmup"] = status
+    app.logger.info(f"Warm-up done in {status['seconds']} s: version {snapshot.version}, {len(snapshot.terms)} terms")
+    return status
+
+
+def reset_connections(app: Flask) -> None:
+    """
+    Drop the database connections inherited from the parent process.
+
+    Called by gunicorn right after forking a worker; the pools are replaced
+    without closing the parent's connections (close=False), and each worker
+    opens its own on first use.
+
+    Input:  app (Flask) | the application
+    Output: Nothing
+    """
+    from app import db
+    from storage import dispose_read_engine
+
+    with app.app_context():
+        db.engine.dispose(close=False)
+    dispose_read_engine(close=False)
+
+
+def readiness(app: Flask) -> Dict[str, Any]:
+    """
+    Return the warm-up status of the current process.
+    """
+    return app.extensions.get("warmup", {"ready": False})